@@ -0,0 +1,158 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.domain.interfaces.IAnalysisCache import IAnalysisCache
+
+class AnalysisCache(IAnalysisCache):
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 86400.0,
+        sqlite_path: Optional[str] = None,
+        sqlite_max_entries: int = 100000,
+    ):
+        """
+        Initializes a two-tier analysis cache.
+
+        The first tier is an in-process LRU with a TTL. The optional second tier is
+        a SQLite database that survives restarts. Both tiers are bounded and evict
+        the least recently used entries once full. Counting the rows on disk scans
+        the whole table, so the disk tier is only trimmed every few writes, and may
+        hold up to a tenth (at most 1000) more entries than `sqlite_max_entries`
+        in between.
+
+        Args:
+            max_entries (int): Maximum number of entries kept in memory.
+            ttl_seconds (float): Time in seconds an entry stays valid.
+            sqlite_path (Optional[str]): Path of the SQLite database. If None, only the memory tier is used.
+            sqlite_max_entries (int): Maximum number of entries kept on disk.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_max_entries = sqlite_max_entries
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._disk_writes = 0
+        self._disk_eviction_interval = max(1, min(1000, sqlite_max_entries // 10))
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "key TEXT PRIMARY KEY, category TEXT NOT NULL, details TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS analysis_cache_accessed_at ON analysis_cache (accessed_at)"
+            )
+            self._evict_from_disk()
+
+    def make_key(self, processed_text: str, fingerprint: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(processed_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[tuple]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            value = self._get_from_disk(key, now)
+            if value is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: tuple) -> None:
+        now = time.time()
+        with self._lock:
+            self._set_in_memory(key, value, now)
+            if self._db is not None:
+                category, details = value
+                self._db.execute(
+                    "INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?, ?)",
+                    (key, category, details, now, now),
+                )
+                self._disk_writes += 1
+                if self._disk_writes % self._disk_eviction_interval == 0:
+                    self._evict_from_disk()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The hits, misses, disk hits, evictions and current memory size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "size": len(self._memory),
+            }
+
+    def close(self) -> None:
+        """
+        Closes the SQLite connection, if any.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _set_in_memory(self, key: str, value: tuple, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _get_from_disk(self, key: str, now: float) -> Optional[tuple]:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT category, details, created_at FROM analysis_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        category, details, created_at = row
+        if now - created_at > self.ttl_seconds:
+            self._db.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+            return None
+        self._db.execute("UPDATE analysis_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        value = (category, details)
+        self._set_in_memory(key, value, created_at)
+        return value
+
+    def _evict_from_disk(self) -> None:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()
+        overflow = count - self.sqlite_max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM analysis_cache WHERE key IN "
+                "(SELECT key FROM analysis_cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += overflow
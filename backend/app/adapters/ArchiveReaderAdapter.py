@@ -0,0 +1,199 @@
+import io
+import mailbox
+import os
+import shutil
+import tempfile
+import zipfile
+from email.header import decode_header, make_header
+from email.message import Message
+from typing import BinaryIO, List, Optional, Tuple, Union
+from app.core.charset import decode_text
+from app.domain.entities.document import Document, FileType, MAX_FILE_SIZE
+from app.domain.interfaces.IArchiveReaderAdapter import IArchiveReaderAdapter
+
+class _ZipMember:
+    """
+    A ZIP member read on demand.
+
+    The member is only decompressed when a reader reads it, through a stream
+    opened with `ZipFile.open`, so expanding an archive holds no member content
+    in memory. The stream stops at the size declared in the archive, which was
+    checked against the limits when the archive was expanded, and is released
+    once it is read to the end.
+
+    Only rewinding is supported: random access would decompress the member again
+    from the start on every backward seek, so readers that need it (PDF) read the
+    member into memory first.
+
+    `content_key` identifies the member by its name, CRC and size from the central
+    directory, so identical members can be told apart without decompressing them.
+    """
+
+    def __init__(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+        self._archive = archive
+        self._info = info
+        self._stream = None
+        self.content_key = f"zip\0{info.filename}\0{info.CRC:08x}\0{info.file_size}"
+
+    def read(self, size: int = -1) -> bytes:
+        if self._stream is None:
+            self._stream = self._archive.open(self._info)
+        data = self._stream.read(size)
+        if size is None or size < 0 or not data:
+            self.close()
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Membros de ZIP só podem ser relidos do início.")
+        self.close()
+        return 0
+
+    def seekable(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+class ArchiveReaderAdapter(IArchiveReaderAdapter):
+
+    ARCHIVE_EXTENSIONS = ("zip", "mbox")
+
+    def __init__(self, max_items: int = 1000, max_total_size: int = 200 * 1024 * 1024):
+        """
+        Initializes the archive reader.
+
+        Args:
+            max_items (int): Maximum number of emails of an archive. Defaults to 1000.
+            max_total_size (int): Maximum total uncompressed size, in bytes, of the
+                members of a ZIP archive. Defaults to 200 MB.
+        """
+        self.max_items = max_items
+        self.max_total_size = max_total_size
+
+    def is_archive(self, filename: str) -> bool:
+        return filename.split(".")[-1].lower() in self.ARCHIVE_EXTENSIONS
+
+    def expand(self, filename: str, content: Union[bytes, BinaryIO]) -> List[Tuple[str, Union[Document, Exception]]]:
+        ext = filename.split(".")[-1].lower()
+        if ext == "zip":
+            return self._expand_zip(content)
+        if ext == "mbox":
+            return self._expand_mbox(filename, content)
+        raise ValueError(f"Formato de arquivo não suportado: {ext}")
+
+    def _expand_zip(self, content: Union[bytes, BinaryIO]) -> List[Tuple[str, Union[Document, Exception]]]:
+        """
+        Expands a ZIP archive into one document per TXT or PDF member.
+
+        Directories and members with other extensions are ignored. The limits are checked
+        against the central directory while it is listed, before anything is decompressed:
+        the size of each member, the number of members and their total size. The members
+        are only decompressed when their documents are read (see `_ZipMember`), so the
+        archive stays open for as long as its documents are in use.
+
+        Args:
+            content (Union[bytes, BinaryIO]): The raw bytes of the ZIP archive, or a seekable binary file.
+
+        Returns:
+            List[Tuple[str, Union[Document, Exception]]]: The member names and their documents or errors.
+
+        Raises:
+            ValueError: If the content is not a valid ZIP archive, or if it has too many
+                members or too many uncompressed bytes.
+        """
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content)
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Erro ao ler ZIP: {e}")
+
+        entries = []
+        total_size = 0
+        for info in archive.infolist():
+            ext = info.filename.split(".")[-1].lower()
+            if info.is_dir() or ext not in (FileType.TXT, FileType.PDF):
+                continue
+            if len(entries) >= self.max_items:
+                raise ValueError(f"O arquivo não pode ter mais que {self.max_items} itens.")
+            if info.file_size <= MAX_FILE_SIZE:
+                total_size += info.file_size
+                if total_size > self.max_total_size:
+                    raise ValueError(f"O conteúdo descompactado do arquivo não pode passar de {self.max_total_size // (1024 * 1024)} MB.")
+            try:
+                document = Document(
+                    filename=os.path.basename(info.filename),
+                    size=info.file_size,
+                    content=_ZipMember(archive, info),
+                )
+                entries.append((info.filename, document))
+            except Exception as e:
+                entries.append((info.filename, e))
+        return entries
+
+    def _expand_mbox(self, filename: str, content: Union[bytes, BinaryIO]) -> List[Tuple[str, Union[Document, Exception]]]:
+        """
+        Expands an mbox file into one text document per message.
+
+        The text of each document is the message subject followed by its plain text body.
+
+        Args:
+            filename (str): The name of the mbox file, used to name the entries.
+            content (Union[bytes, BinaryIO]): The raw bytes of the mbox file, or a seekable binary file.
+
+        Returns:
+            List[Tuple[str, Union[Document, Exception]]]: The entry names and their documents or errors.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".mbox", delete=False) as tmp:
+            if isinstance(content, (bytes, bytearray)):
+                tmp.write(content)
+            else:
+                content.seek(0)
+                shutil.copyfileobj(content, tmp)
+            path = tmp.name
+        try:
+            box = mailbox.mbox(path, create=False)
+            try:
+                entries = []
+                for index, message in enumerate(box):
+                    if index >= self.max_items:
+                        raise ValueError(f"O arquivo não pode ter mais que {self.max_items} itens.")
+                    name = f"{filename}#{index}"
+                    try:
+                        entries.append((name, Document(text=self.message_text(message))))
+                    except Exception as e:
+                        entries.append((name, e))
+                return entries
+            finally:
+                box.close()
+        finally:
+            os.unlink(path)
+
+    def message_text(self, message: Message) -> Optional[str]:
+        """
+        Returns the subject and the plain text body of an email message.
+
+        Args:
+            message (Message): The email message.
+
+        Returns:
+            Optional[str]: The text of the message, or None if it has no text.
+        """
+        parts = message.walk() if message.is_multipart() else [message]
+        body = []
+        for part in parts:
+            if part.get_content_type() != "text/plain" or part.get_filename():
+                continue
+            payload = part.get_payload(decode=True) or b""
+            charset = part.get_content_charset()
+            try:
+                body.append(payload.decode(charset, errors="replace") if charset else decode_text(payload))
+            except LookupError:
+                body.append(decode_text(payload))
+
+        text = "\n".join(body).strip()
+        subject = str(make_header(decode_header(message.get("Subject", "")))).strip()
+        if subject and text:
+            text = f"{subject}\n\n{text}"
+        return text or None
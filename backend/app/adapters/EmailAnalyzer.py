@@ -1,75 +1,222 @@
+import hashlib
+import json
 import httpx
+from typing import AsyncIterator, Callable, Optional
 from app.domain.interfaces.IEmailAnalyzer import IEmailAnalyzer
+from app.domain.interfaces.ITextClassifier import ITextClassifier
 from app.core.config import settings
-from app.api.decorators.exception import ServiceError
+from app.core.http_client import create_http_client
+from app.core.resilience import CircuitOpenError, UpstreamGuard, create_upstream_guard
+from app.core.logger import logger
+from app.core.metrics import MODEL_CALLS, UPSTREAM_TOKENS, stage
+from app.core.model_router import ModelRoute, ModelRouter, create_model_router
+from app.core.prompt_registry import PromptRegistry, create_prompt_registry
+from app.core.token_budget import TokenBudget, create_token_budget
+from app.api.decorators.exception import ServiceError, ServiceUnavailableError
 
 class EmailAnalyzer(IEmailAnalyzer):
-    def __init__(self):
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None, local_classifier: Optional[ITextClassifier] = None, upstream_guard: Optional[UpstreamGuard] = None, token_budget: Optional[TokenBudget] = None, prompt_registry: Optional[PromptRegistry] = None, model_router: Optional[ModelRouter] = None):
         """
         Initializes an instance of the EmailAnalyzer class.
 
-        It sets the API URL classifier, the API URL suggestion, the API token and the timeout for the HTTPX client.
+        It sets the model routes, the API token and the HTTPX client.
+
+        Args:
+            http_client (Optional[httpx.AsyncClient]): The shared, pooled client created in the
+                application lifespan. If not provided, the analyzer creates and owns its own client.
+            local_classifier (Optional[ITextClassifier]): Local model tried before the upstream
+                classification. Only predictions at or above `settings.LOCAL_CLASSIFIER_THRESHOLD`
+                are used; the others escalate to the LLM.
+            upstream_guard (Optional[UpstreamGuard]): The shared rate limiter, concurrency cap,
+                retry policy and circuit breaker of the upstream calls. If not provided, the
+                analyzer creates its own from the settings.
+            token_budget (Optional[TokenBudget]): Trims long emails before they are sent in a
+                prompt. If not provided, the budget of `settings.PROMPT_EMAIL_MAX_TOKENS` is used.
+            prompt_registry (Optional[PromptRegistry]): The hot-reloaded prompts and categories.
+                If not provided, the analyzer loads `settings.PROMPTS_PATH`.
+            model_router (Optional[ModelRouter]): The model, endpoint, timeout and fallback of the
+                classification and suggestion calls. If not provided, the routes of the settings are used.
         """
-        self.api_url = settings.API_URL
+        self.model_router = model_router or create_model_router()
         self.api_token = settings.API_TOKEN
-        self.timeout = httpx.Timeout(60.0)
+        self._owns_client = http_client is None
+        self.http_client = http_client or create_http_client()
+        self.local_classifier = local_classifier
+        self.upstream_guard = upstream_guard or create_upstream_guard()
+        self.token_budget = token_budget or create_token_budget()
+        self.prompt_registry = prompt_registry or create_prompt_registry()
+        self.confidence_threshold = settings.LOCAL_CLASSIFIER_THRESHOLD
         self.headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json"
         }
 
-    async def analyse_email(self, email_content: str) -> tuple:
+    @property
+    def fingerprint(self) -> str:
+        parts = (
+            self.model_router.fingerprint,
+            settings.ANALYSIS_MODE,
+            getattr(self.local_classifier, "version", ""),
+            str(self.confidence_threshold),
+            str(self.token_budget.max_tokens),
+            str(settings.CLASSIFY_MAX_TOKENS),
+            self.prompt_registry.current().version,
+            str(settings.CANNED_REPLIES_ENABLED),
+        )
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    async def analyse_email(self, email_content: str, category: Optional[str] = None) -> tuple:
         try:
-            category = await self._classify_email_content(email_content)
+            category = category or self._local_category(email_content)
+            if category is None and settings.ANALYSIS_MODE == "combined":
+                result = await self._classify_and_suggest(email_content)
+                if result is not None:
+                    return result
+            category = category or await self._classify_email_content(email_content)
             details = await self._sugestion_of_response(category,email_content)
             return category, details
 
+        except ServiceUnavailableError:
+            raise
         except Exception as e:
             raise ServiceError(f"Erro ao processar email")
             
-    async def _post_api(self,payload:dict,url:str) -> dict:
+    async def stream_analysis(self, email_content: str, category: Optional[str] = None) -> AsyncIterator[dict]:
+        try:
+            category = category or self._local_category(email_content) or await self._classify_email_content(email_content)
+        except ServiceUnavailableError:
+            raise
+        except Exception as e:
+            raise ServiceError(f"Erro ao processar email")
+        yield {"event": "category", "data": category}
+        async for token in self._stream_sugestion_of_response(category, email_content):
+            yield {"event": "token", "data": token}
+
+    def _local_category(self, email_content: str) -> Optional[str]:
+        """
+        Classifies the email with the local model, if it is confident enough.
+
+        Args:
+            email_content (str): The preprocessed content of the email
+
+        Returns:
+            Optional[str]: The category, or None if there is no local model or its
+            probability is below the confidence threshold.
+        """
+        if self.local_classifier is None:
+            return None
+        category, probability = self.local_classifier.predict(email_content)
+        if probability >= self.confidence_threshold and category in self.prompt_registry.current().categories:
+            logger.debug("Classificação local: %s (%.3f)", category, probability)
+            return category
+        return None
+
+    async def _post_api(self,payload:dict,route:ModelRoute,stage_name:str = "upstream") -> dict:
         """
-        Makes a POST request to the given url with the given payload and 
-        returns the JSON response.
+        Makes a POST request to the endpoint of the given route with the given payload
+        and returns the JSON response.
 
         Args:
-            payload (dict): The payload to send in the request body
-            url (str): The URL to send the request to
+            payload (dict): The payload to send in the request body, without the model
+            route (ModelRoute): The model, URL and timeout of the request
+            stage_name (str): The stage timed in the metrics (e.g. "classify" or "suggest")
 
         Returns:
             dict: The JSON response from the server
 
+        The request goes through the upstream guard, which rate limits it, caps the
+        requests in flight, retries connection errors and 429/5xx responses (honoring
+        Retry-After) and fails fast while the circuit is open.
+
         Raises:
-            ServiceError: If any error occurs while making the request
+            ServiceUnavailableError: If the circuit is open or the upstream is still
+                throttling after the last retry
+            ServiceError: If any other error occurs while making the request
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, headers=self.headers, json=payload)
+            with stage(stage_name):
+                response = await self.upstream_guard.send(
+                    lambda: self.http_client.post(
+                        route.url, headers=self.headers, json={**payload, "model": route.model}, timeout=route.timeout
+                    )
+                )
             response.raise_for_status()
             result = response.json()
+            usage = result.get("usage") or {}
+            for kind in ("prompt_tokens", "completion_tokens"):
+                if isinstance(usage.get(kind), int):
+                    UPSTREAM_TOKENS.inc(usage[kind], kind=kind.split("_")[0])
             return result
+        except ServiceUnavailableError:
+            raise
         except Exception as e:
             raise ServiceError(f"Erro ao processar email")
-        
-    async def _classify_email_content(self, email_content: str) -> str:
+
+    async def _complete(self, route_name: str, payload: dict, stage_name: str, accept: Optional[Callable[[dict], bool]] = None) -> dict:
         """
-        Classify the given email content into 'Produtivo' or 'Improdutivo' categories.
+        Runs a completion on a route, falling back along its chain of routes.
 
-        The classification is done using the DeepSeek-V3-0324 model from the Hugging Face
-        Transformers library. The input to the model is a string with the following format:
+        The next route is tried when a route fails (an error response, or timeouts and
+        throttling after the retries of the upstream guard) or when `accept` rejects
+        its completion. The completion of the last route is always returned. An open
+        circuit is not retried on the fallbacks, since they share the upstream guard.
 
-        "Classifique o seguinte email como 'Produtivo' ou 'Improdutivo' com base nas definições abaixo:
+        Args:
+            route_name (str): The first route, "classify" or "suggest"
+            payload (dict): The payload to send in the request body, without the model
+            stage_name (str): The stage timed in the metrics
+            accept (Optional[Callable[[dict], bool]]): Whether a completion is usable
 
-        - Produtivo: Emails que requerem uma ação ou resposta específica (ex.: solicitações de suporte técnico, atualização sobre casos em aberto, dúvidas sobre o sistema).
-        - Improdutivo: Emails que não necessitam de uma ação imediata (ex.: mensagens de felicitações, agradecimentos).
+        Returns:
+            dict: The JSON response of the first route that succeeded
 
-        CONTEÚDO DO EMAIL:
-        {email_content}
+        Raises:
+            ServiceUnavailableError: If the circuit is open, or the last route is still throttled
+            ServiceError: If the last route fails
+        """
+        chain = self.model_router.chain(route_name)
+        for position, route in enumerate(chain):
+            last = position == len(chain) - 1
+            try:
+                completion = await self._post_api(payload, route, stage_name)
+            except CircuitOpenError:
+                raise
+            except (ServiceError, ServiceUnavailableError):
+                MODEL_CALLS.inc(route=route_name, model=route.model, outcome="error")
+                if last:
+                    raise
+                logger.warning("Falha no modelo %s (rota %s). Tentando %s.", route.model, route_name, chain[position + 1].model)
+                continue
+            if last or accept is None or accept(completion):
+                MODEL_CALLS.inc(route=route_name, model=route.model, outcome="ok")
+                return completion
+            MODEL_CALLS.inc(route=route_name, model=route.model, outcome="rejected")
+            logger.warning("Resposta do modelo %s fora do formato esperado (rota %s). Tentando %s.", route.model, route_name, chain[position + 1].model)
+
+    async def aclose(self) -> None:
+        """
+        Closes the HTTPX client if it was created by this analyzer.
 
-        Apenas retorne 'Produtivo' ou 'Improdutivo'."
+        Shared clients are owned by the application lifespan and are left open.
+        """
+        if self._owns_client:
+            await self.http_client.aclose()
+        
+    async def _classify_email_content(self, email_content: str) -> str:
+        """
+        Classify the given email content into one of the categories of the prompt registry
+        (by default 'Produtivo' or 'Improdutivo').
+
+        The classification is done by the model of the "classify" route, usually a
+        small and fast one. The input to the model is the "classification" template of
+        the prompts file, filled with the category definitions and the email content.
 
-        The model is configured to generate a response with a maximum of 200 tokens,
-        using a temperature of 0.3 and a top_p of 0.8.
+        Emails longer than the token budget are trimmed to their head and tail. The
+        answer is a single category, so the completion is capped at
+        `settings.CLASSIFY_MAX_TOKENS`, with a temperature of 0.3 and a top_p of 0.8.
+        Quotes, punctuation and case around the category are ignored; an answer that is
+        still not a category escalates to the fallback route.
 
         Args:
             email_content (str): The content of the email to be classified
@@ -77,29 +224,45 @@ class EmailAnalyzer(IEmailAnalyzer):
         Returns:
             str: The classification of the email content ('Produtivo' or 'Improdutivo')
         """
-        input_for_classification = f"""
-            Classifique o seguinte email como 'Produtivo' ou 'Improdutivo' com base nas definições abaixo:
-
-            - Produtivo: Emails que requerem uma ação ou resposta específica (ex.: solicitações de suporte técnico, atualização sobre casos em aberto, dúvidas sobre o sistema).
-            - Improdutivo: Emails que não necessitam de uma ação imediata (ex.: mensagens de felicitações, agradecimentos).
-
-            CONTEÚDO DO EMAIL:
-            {email_content}
-
-            Apenas retorne 'Produtivo' ou 'Improdutivo'.
-            """
+        input_for_classification = self.prompt_registry.current().render(
+            "classification", email_content=self._fit(email_content)
+        )
         payload = {
-            "model": "deepseek-ai/DeepSeek-V3-0324",
             "messages": [
                 {"role": "system", "content": input_for_classification},
             ],
-            "max_tokens": 200, 
+            "max_tokens": settings.CLASSIFY_MAX_TOKENS,
             "temperature": 0.3,
             "top_p": 0.8
         }
-        classification = await self._post_api(payload, self.api_url)
-      
-        return classification['choices'][0]['message']['content']
+        classification = await self._complete(
+            "classify", payload, "classify",
+            accept=lambda completion: self._match_category(self._content(completion)) is not None,
+        )
+        content = self._content(classification)
+        return self._match_category(content) or content.strip()
+
+    def _match_category(self, content: Optional[str]) -> Optional[str]:
+        """
+        Finds the category answered by the model, ignoring case, quotes and punctuation.
+
+        Args:
+            content (Optional[str]): The content of the completion
+
+        Returns:
+            Optional[str]: The category, or None if the answer is not one of the categories
+        """
+        answer = (content or "").strip().strip("'\"`*.!:").strip().casefold()
+        for category in self.prompt_registry.current().categories:
+            if category.casefold() == answer:
+                return category
+        return None
+
+    def _content(self, completion: dict) -> Optional[str]:
+        try:
+            return completion['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            return None
 
     async def _sugestion_of_response(self,category:str,email_content:str)-> str:
 
@@ -107,8 +270,9 @@ class EmailAnalyzer(IEmailAnalyzer):
         Makes a POST request to the AI model to generate a suggested response 
         given the category and content of the email.
 
-        The request is made to the `api_url` endpoint, with the 
-        `deepseek-ai/DeepSeek-V3-0324` model and the following parameters:
+        Categories with a canned reply in the prompts file get it without any
+        request. The others are sent to the model of the "suggest" route, with the
+        following parameters:
 
         - `messages`: A list of two messages, one with the system prompt and 
           one with the user prompt.
@@ -132,80 +296,187 @@ class EmailAnalyzer(IEmailAnalyzer):
         Raises:
             ServiceError: If any error occurs while making the request
         """
-        system_prompt = """
-            Você é um assistente de Customer Success para uma grande empresa do setor financeiro.
-            Sua função é gerar respostas automáticas a emails de clientes, focando em profissionalismo, clareza e empatia.
-
-            DIRETRIZES GERAIS:
-            - **Concisão**: Respostas curtas, idealmente entre 1 e 3 frases. Vá direto ao ponto.
-            - **Linguagem**: Utilize português brasileiro formal, cordial e acolhedor.
-            - **Foco**: Priorize a resolução do problema do cliente ou a indicação clara do próximo passo.
-            - **Proatividade e Educação**: Sempre ofereça ajuda ou agradeça, conforme a situação.
-            - **Veracidade**: Nunca invente informações. Se os dados forem insuficientes, seja genérico e direcione para canais de suporte.
-            - **Evite Redundâncias**: Seja eficiente na comunicação, evitando frases desnecessárias.
-            - **Adesão às Instruções Específicas**: É CRUCIAL seguir as 'INSTRUÇÕES ESPECÍFICAS POR CATEGORIA' fornecidas no prompt do usuário, pois elas definem o tom e o detalhamento adequados para cada tipo de email.
-
-            """
-
-        user_prompt = f"""
-             Analise o email do cliente abaixo e gere uma resposta apropriada, seguindo as diretrizes gerais e as instruções específicas para a categoria identificada.
+        canned_reply = self._canned_reply(category)
+        if canned_reply is not None:
+            return canned_reply
+        payload = self._suggestion_payload(category, email_content)
+        suggestion = await self._complete("suggest", payload, "suggest")
+        content = suggestion['choices'][0]['message']['content']
+        return content
 
-            CATEGORIA DO EMAIL: {category}
+    def _canned_reply(self, category: str) -> Optional[str]:
+        """
+        Returns the fixed response of the category, if canned replies are enabled and it has one.
+        """
+        if not settings.CANNED_REPLIES_ENABLED:
+            return None
+        canned_reply = self.prompt_registry.current().canned_reply(category)
+        if canned_reply is not None:
+            MODEL_CALLS.inc(route="suggest", model="canned", outcome="canned")
+        return canned_reply
+
+    def _suggestion_payload(self, category: str, email_content: str) -> dict:
+        """
+        Builds the chat-completions payload used to generate the suggested response.
 
-            CONTEÚDO DO E-MAIL:
-            ```
-            {email_content[:1500]}
-            ```
-            INSTRUÇÕES ESPECÍFICAS POR CATEGORIA:
-            {self._get_category_instructions(category)}
+        Args:
+            category (str): The category of the email
+            email_content (str): The content of the email
 
-            Por favor, forneça apenas a resposta sugerida, sem introduções ou comentários adicionais.
+        Returns:
+            dict: The payload to send to the upstream API
         """
+        prompts = self.prompt_registry.current()
+        user_prompt = prompts.render(
+            "suggestion",
+            category=category,
+            email_content=self._fit(email_content),
+            instructions=prompts.instructions(category),
+        )
 
         payload = {
-            "model": "deepseek-ai/DeepSeek-V3-0324",
             "messages": [
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": prompts.system},
                 {"role": "user", "content": user_prompt}
             ],
             "max_tokens": 200, 
             "temperature": 0.3,
             "top_p": 0.8
         }
-    
-        suggestion = await self._post_api(payload, self.api_url)
-        content = suggestion['choices'][0]['message']['content']
-        return content
+        return payload
 
-    def _get_category_instructions(self, category: str) -> str:
+    async def _stream_sugestion_of_response(self, category: str, email_content: str) -> AsyncIterator[str]:
         """
-        Returns a string with instructions for the AI to generate a response based on the category of the email.
+        Streams the suggested response using the streaming mode of the chat-completions API.
 
-        The instructions are based on the category of the email and provide guidelines
-        for the AI to generate a response that is appropriate, concise and professional.
+        The upstream answers with server-sent events, one `data:` line per chunk, ending
+        with `data: [DONE]`. The content delta of each chunk is yielded as soon as it arrives.
+        If the consumer stops iterating (e.g. the client disconnected), the upstream
+        request is closed as well. The stream takes a slot of the upstream guard, but
+        it is not retried, since tokens may already have been sent to the client, and
+        it only uses the first model of the "suggest" route. A canned reply is
+        yielded at once, without a request.
 
         Args:
             category (str): The category of the email
+            email_content (str): The content of the email
+
+        Yields:
+            str: The pieces of the suggested response
+
+        Raises:
+            ServiceError: If any error occurs while making the request
+        """
+        canned_reply = self._canned_reply(category)
+        if canned_reply is not None:
+            yield canned_reply
+            return
+        route = self.model_router.chain("suggest")[0]
+        payload = {**self._suggestion_payload(category, email_content), "model": route.model, "stream": True}
+        try:
+            async with self.upstream_guard.slot():
+                async with self.http_client.stream("POST", route.url, headers=self.headers, json=payload, timeout=route.timeout) as response:
+                    self.upstream_guard.record_status(response.status_code)
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        choices = json.loads(data).get("choices") or [{}]
+                        delta = choices[0].get("delta", {}).get("content")
+                        if delta:
+                            yield delta
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            raise ServiceError(f"Erro ao processar email")
+
+    async def _classify_and_suggest(self, email_content: str) -> Optional[tuple]:
+        """
+        Classifies the email and generates the suggested response in a single upstream call.
+
+        The model of the "suggest" route is asked for a JSON object with the keys
+        `categoria` and `resposta`.
+        The category must be one of the registry categories and the response must be a non-empty string.
+
+        Args:
+            email_content (str): The content of the email
 
         Returns:
-            str: The instructions for the AI
-        """
-        instructions = {
-            "Produtivo": """
-            - O cliente necessita de uma ação ou informação específica.
-            - **Objetivo**: Fornecer uma solução direta, confirmar um status ou indicar o próximo passo claro.
-            - **Tom**: Proativo, seguro e eficiente. Demonstre compromisso com a resolução.
-            - **Ação**: Se necessário, solicite informações adicionais de forma precisa e justificada.
-            - **Exemplo**: "Prezado(a) [Nome do Cliente], recebemos sua solicitação e estamos analisando. Em breve entraremos em contato com a solução." ou "Para prosseguir com sua demanda, precisamos que nos envie [informação necessária]."
-            """,
-            
-            "Improdutivo": """
-            - O email não requer uma ação imediata ou é de cunho informal.
-            - **Objetivo**: Agradecer cordialmente e encerrar a comunicação de forma educada, sem prolongar o diálogo.
-            - **Tom**: Simpático, breve e gentil.
-            - **Ação**: Evite iniciar novas conversas ou solicitar informações desnecessárias.
-            - **Exemplo**: "Agradecemos o seu contato e a mensagem. Tenha um excelente dia!" ou "Obrigado(a) pela sua consideração. Estamos à disposição para futuras necessidades."
-            """
+            Optional[tuple]: The category and the suggested response, or None if the
+            completion could not be parsed, so the caller can fall back to two calls.
+
+        Raises:
+            ServiceError: If any error occurs while making the request
+        """
+        prompts = self.prompt_registry.current()
+        user_prompt = prompts.render("combined", email_content=self._fit(email_content))
+
+        payload = {
+            "messages": [
+                {"role": "system", "content": prompts.system},
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_tokens": 400,
+            "temperature": 0.3,
+            "top_p": 0.8,
+            "response_format": {"type": "json_object"}
         }
-        return instructions.get(category, "- Responda de forma profissional e educada, mantendo a concisão e o foco na cordialidade.")
-   
\ No newline at end of file
+
+        completion = await self._complete("suggest", payload, "classify_suggest")
+        try:
+            content = completion['choices'][0]['message']['content']
+            return self._parse_combined_response(content)
+        except (KeyError, IndexError, TypeError):
+            logger.warning("Resposta combinada sem conteúdo. Usando duas chamadas.")
+            return None
+
+    def _parse_combined_response(self, content: Optional[str]) -> Optional[tuple]:
+        """
+        Parses and validates the JSON returned by the combined completion.
+
+        Markdown code fences around the JSON are tolerated.
+
+        Args:
+            content (Optional[str]): The raw content of the completion, which may be null (e.g. on a refusal)
+
+        Returns:
+            Optional[tuple]: The category and the suggested response, or None if the
+            content is missing, is not valid JSON or does not match the expected schema.
+        """
+        if not isinstance(content, str):
+            logger.warning("Resposta combinada sem conteúdo. Usando duas chamadas.")
+            return None
+        text = content.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text[text.find("{"):]
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            logger.warning("Resposta combinada não é um JSON válido. Usando duas chamadas.")
+            return None
+
+        if not isinstance(data, dict):
+            return None
+        category = str(data.get("categoria", "")).strip()
+        details = data.get("resposta")
+        if category not in self.prompt_registry.current().categories or not isinstance(details, str) or not details.strip():
+            logger.warning("Resposta combinada fora do formato esperado. Usando duas chamadas.")
+            return None
+        return category, details.strip()
+
+    def _fit(self, email_content: str) -> str:
+        """
+        Trims the email to the token budget of the prompts.
+
+        Args:
+            email_content (str): The content of the email
+
+        Returns:
+            str: The email, or its head and tail if it exceeds the budget
+        """
+        fitted = self.token_budget.trim(email_content)
+        if fitted is not email_content:
+            logger.debug("Email reduzido de %d para %d caracteres no prompt.", len(email_content), len(fitted))
+        return fitted
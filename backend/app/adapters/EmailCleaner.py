@@ -0,0 +1,198 @@
+import io
+import re
+from typing import List, Optional, Tuple
+from app.domain.interfaces.IEmailCleaner import IEmailCleaner
+
+_FLAGS = re.IGNORECASE
+
+class EmailCleaner(IEmailCleaner):
+    """
+    Strips quoted history, forwarded headers, legal footers and signatures from emails.
+
+    The text is read line by line in a single pass, and each line is matched
+    against a fixed set of compiled patterns anchored at its start, so the cost
+    is linear in the size of the email. The only lookahead is a small buffer:
+    the lines after a closing ("Atenciosamente,") or a "-- " delimiter are held
+    until it is clear whether they are a short signature block, and a "De:" line
+    is held until the next line shows whether it starts a quoted reply header.
+    """
+
+    # Start of the quoted history: everything from here on is dropped.
+    _reply_header_pattern = re.compile(
+        r'^\s*(?:'
+        r'em\s.{0,200}\sescreveu:?'
+        r'|on\s.{0,200}\swrote:?'
+        r'|-{2,}\s*(?:original message|mensagem original)\s*-{2,}'
+        r'|_{5,}'
+        r')\s*$',
+        _FLAGS,
+    )
+    # Gmail wraps long reply headers: "Em seg., 1 de jan. de 2024 às 10:00, Fulano <" + "fulano@x.com> escreveu:".
+    _reply_header_start_pattern = re.compile(r'^\s*(?:em|on)\s.{0,200}\d', _FLAGS)
+    _reply_header_end_pattern = re.compile(r'(?:escreveu|wrote):?\s*$', _FLAGS)
+    # Legal footers and disclaimers: everything from here on is dropped.
+    _footer_pattern = re.compile(
+        r'^\s*(?:'
+        r'aviso(?:\s+legal)?\s*:|confidencialidade\s*:|disclaimer\s*:'
+        r'|(?:esta|essa)\s+(?:mensagem|comunica[cç][aã]o)\b.{0,120}\b(?:confidencia|destinat|sigilo)'
+        r'|este\s+e-?mail\b.{0,120}\b(?:confidencia|destinat|sigilo)'
+        r'|this\s+(?:e-?mail|message)\b.{0,120}\b(?:confidential|intended|privileged)'
+        r')',
+        _FLAGS,
+    )
+    _forward_pattern = re.compile(
+        r'^\s*-{2,}\s*(?:forwarded message|mensagem encaminhada)\s*-{2,}\s*$|^\s*(?:início da mensagem encaminhada|begin forwarded message):\s*$',
+        _FLAGS,
+    )
+    _header_field_pattern = re.compile(
+        r'^\s*\*?(?:de|from|para|to|cc|cco|bcc|assunto|subject|data|date|enviad[oa](?:\s+em)?|sent)\*?\s*:',
+        _FLAGS,
+    )
+    _from_field_pattern = re.compile(r'^\s*\*?(?:de|from)\*?\s*:', _FLAGS)
+    _quoted_line_pattern = re.compile(r'^\s*>')
+    _mobile_signature_pattern = re.compile(
+        r'^\s*(?:enviado\s+d[eo]\s+meu|sent\s+from\s+my|obter\s+o\s+outlook\s+para|get\s+outlook\s+for)\b',
+        _FLAGS,
+    )
+    # Words that also open a message ("Obrigado!", "Grato") only close it when followed by a comma.
+    _closing_pattern = re.compile(
+        r'^\s*(?:'
+        r'(?:atenciosamente|att|atte|at\.?te|abra[cç]os?|um\s+abra[cç]o|cordialmente|sauda[cç][oõ]es'
+        r'|best\s+regards|kind\s+regards|regards)\s*[,.!]*'
+        r'|(?:(?:muito\s+)?grat[oa]|(?:muito\s+)?obrigad[oa]|best|thanks|thank\s+you)\s*,'
+        r')\s*$',
+        _FLAGS,
+    )
+    # The standard signature delimiter, with its trailing space.
+    _signature_delimiter_pattern = re.compile(r'^-- \r?\n?$')
+    # Contact details that mark a line as part of a signature.
+    _contact_pattern = re.compile(r'\S@\S|https?://|www\.|\+?\d[\d ().-]{6,}\d')
+    _word_pattern = re.compile(r'[^\W\d_]+')
+    _connectors = frozenset(('de', 'da', 'do', 'das', 'dos', 'e', 'of', 'and', 'the', 'y', 'del'))
+
+    def __init__(self, signature_max_lines: int = 6, signature_line_max_chars: int = 60):
+        """
+        Args:
+            signature_max_lines (int): Maximum number of lines after a closing that are
+                still treated as a signature block (name, role, phone). Defaults to 6.
+            signature_line_max_chars (int): Maximum length of a signature line. Defaults to 60.
+        """
+        self.init_kwargs = {"signature_max_lines": signature_max_lines, "signature_line_max_chars": signature_line_max_chars}
+        self.signature_max_lines = signature_max_lines
+        self.signature_line_max_chars = signature_line_max_chars
+
+    def clean(self, text: str) -> Tuple[str, int]:
+        """
+        Removes quoted replies, forwarded headers, legal footers and signatures.
+
+        Quoted ("> ") lines, forwarded-message headers and "Enviado do meu iPhone"
+        lines are dropped. A reply header ("Em ... escreveu:", "-----Mensagem
+        original-----", an Outlook "De:/Enviado:" block) or a legal footer ends the
+        message: the rest is dropped. A closing after the body, or a "-- "
+        delimiter, opens a signature block: the lines after it are dropped if they
+        are at most `signature_max_lines` and all look like a signature (a name, a
+        role, a phone or an address). Otherwise they are given back to the message,
+        so a request written after "Obrigado," is never lost. If nothing would be
+        left, the text is returned unchanged.
+
+        Args:
+            text (str): The raw text of the email.
+
+        Returns:
+            Tuple[str, int]: The cleaned text and the number of bytes (UTF-8) removed.
+        """
+        kept: List[str] = []
+        signature: Optional[List[str]] = None
+        held_from: Optional[str] = None
+        previous = ""
+        in_forward_headers = False
+
+        for line in io.StringIO(text):
+            if held_from is not None:
+                candidate, held_from = held_from, None
+                if self._header_field_pattern.match(line):
+                    signature = None
+                    break
+                signature = self._keep(candidate, kept, signature)
+
+            if in_forward_headers:
+                if self._header_field_pattern.match(line) or not line.strip():
+                    continue
+                in_forward_headers = False
+
+            if self._reply_header_pattern.match(line) or self._footer_pattern.match(line):
+                signature = None
+                break
+            if self._reply_header_end_pattern.search(line) and self._reply_header_start_pattern.match(previous):
+                if signature is None and kept and kept[-1] is previous:
+                    kept.pop()
+                signature = None
+                break
+            if self._forward_pattern.match(line):
+                in_forward_headers = True
+                continue
+            if self._quoted_line_pattern.match(line) or self._mobile_signature_pattern.match(line):
+                continue
+            if self._from_field_pattern.match(line):
+                held_from = line
+                continue
+
+            previous = line
+            if signature is not None:
+                signature = self._keep(line, kept, signature)
+            elif self._signature_delimiter_pattern.match(line) and self._has_body(kept):
+                signature = [line]
+            else:
+                kept.append(line)
+                if self._closing_pattern.match(line) and self._has_body(kept[:-1]):
+                    signature = []
+        else:
+            if held_from is not None:
+                signature = self._keep(held_from, kept, signature)
+
+        cleaned = "".join(kept).strip()
+        if not cleaned:
+            return text, 0
+        return cleaned, len(text.encode("utf-8")) - len(cleaned.encode("utf-8"))
+
+    def _keep(self, line: str, kept: List[str], signature: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        Keeps a line, holding it in the signature block if one is open.
+
+        Once a held line does not look like a signature, or the held lines are too
+        many to be one, they are given back to the message and the block is closed.
+
+        Returns:
+            Optional[List[str]]: The signature block that is still open, if any.
+        """
+        if signature is None:
+            kept.append(line)
+            return None
+        signature.append(line)
+        if line.strip() and (
+            not self._is_signature_line(line)
+            or sum(1 for held in signature if held.strip() not in ("", "--")) > self.signature_max_lines
+        ):
+            kept.extend(signature)
+            return None
+        return signature
+
+    def _is_signature_line(self, line: str) -> bool:
+        """
+        Tells whether a line looks like part of a signature: a short line with contact
+        details, or with mostly capitalized words and no sentence punctuation, like a
+        name ("Maria Souza"), a role ("Gerente de Projetos") or a company.
+        """
+        line = line.strip()
+        if len(line) > self.signature_line_max_chars:
+            return False
+        if self._contact_pattern.search(line):
+            return True
+        if line.endswith(("?", "!", ":")):
+            return False
+        words = [word for word in self._word_pattern.findall(line) if word.lower() not in self._connectors]
+        return bool(words) and sum(1 for word in words if word[0].isupper()) * 2 > len(words)
+
+    @staticmethod
+    def _has_body(kept: List[str]) -> bool:
+        return any(line.strip() for line in kept)
@@ -0,0 +1,38 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.domain.entities.job import Job
+from app.domain.interfaces.IJobStore import IJobStore
+
+class InMemoryJobStore(IJobStore):
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 86400.0):
+        """
+        Initializes an in-process job store.
+
+        Jobs are lost on restart. Jobs older than the TTL are dropped, and once the
+        store is full the oldest jobs are evicted first.
+
+        Args:
+            max_entries (int): Maximum number of jobs kept.
+            ttl_seconds (float): Time in seconds a job is kept after its submission.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._jobs: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_entries:
+                self._jobs.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and time.time() - job.created_at > self.ttl_seconds:
+                del self._jobs[job_id]
+                return None
+            return job
@@ -0,0 +1,231 @@
+import hashlib
+import zlib
+import numpy as np
+from typing import List, Sequence, Tuple
+from app.domain.interfaces.ITextClassifier import ITextClassifier
+
+class LocalClassifier(ITextClassifier):
+    """
+    Binary linear classifier over hashed unigram and bigram TF-IDF features.
+
+    It is trained with logistic regression on preprocessed emails and its scores are
+    calibrated with Platt scaling on a held-out split, so `predict` returns a
+    probability that can be compared against a confidence threshold.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        weights: np.ndarray,
+        bias: float,
+        idf: np.ndarray,
+        platt_a: float = 1.0,
+        platt_b: float = 0.0,
+    ):
+        """
+        Initializes a trained classifier. Use `train` or `load` to build one.
+
+        Args:
+            labels (Sequence[str]): The negative and the positive category, in this order.
+            weights (np.ndarray): The weight of each hashed feature.
+            bias (float): The bias of the linear model.
+            idf (np.ndarray): The inverse document frequency of each hashed feature.
+            platt_a (float): Slope of the Platt calibration. Defaults to 1.0.
+            platt_b (float): Intercept of the Platt calibration. Defaults to 0.0.
+        """
+        if len(labels) != 2:
+            raise ValueError("O classificador local suporta exatamente duas categorias.")
+        self.labels = tuple(labels)
+        self.weights = weights
+        self.bias = float(bias)
+        self.idf = idf
+        self.platt_a = float(platt_a)
+        self.platt_b = float(platt_b)
+        self.n_features = len(weights)
+        self.version = hashlib.sha256(weights.tobytes() + idf.tobytes()).hexdigest()[:16]
+
+    def predict(self, processed_text: str) -> Tuple[str, float]:
+        indices, values = _vectorize(processed_text, self.n_features, self.idf)
+        score = float(values @ self.weights[indices]) + self.bias
+        probability = float(_sigmoid(self.platt_a * score + self.platt_b))
+        if probability >= 0.5:
+            return self.labels[1], probability
+        return self.labels[0], 1.0 - probability
+
+    def save(self, path: str) -> None:
+        """
+        Saves the classifier to a compressed `.npz` file.
+
+        Args:
+            path (str): The destination path.
+        """
+        np.savez_compressed(
+            path,
+            labels=np.array(self.labels),
+            weights=self.weights,
+            bias=self.bias,
+            idf=self.idf,
+            platt=np.array([self.platt_a, self.platt_b]),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LocalClassifier":
+        """
+        Loads a classifier saved with `save`.
+
+        Args:
+            path (str): The path of the `.npz` file.
+
+        Returns:
+            LocalClassifier: The loaded classifier.
+        """
+        with np.load(path) as data:
+            platt_a, platt_b = data["platt"]
+            return cls(
+                labels=[str(label) for label in data["labels"]],
+                weights=data["weights"],
+                bias=float(data["bias"]),
+                idf=data["idf"],
+                platt_a=platt_a,
+                platt_b=platt_b,
+            )
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        categories: Sequence[str],
+        labels: Sequence[str],
+        n_features: int = 2 ** 18,
+        epochs: int = 200,
+        learning_rate: float = 4.0,
+        l2: float = 1e-4,
+        holdout: float = 0.2,
+        seed: int = 42,
+    ) -> "LocalClassifier":
+        """
+        Trains a classifier on preprocessed emails.
+
+        A fraction of the corpus is held out to fit the Platt calibration, as long
+        as both categories are present in each split.
+
+        Args:
+            texts (Sequence[str]): The preprocessed emails.
+            categories (Sequence[str]): The category of each email.
+            labels (Sequence[str]): The negative and the positive category, in this order.
+            n_features (int): Number of hashed features. Defaults to 2 ** 18.
+            epochs (int): Number of full-batch gradient descent steps. Defaults to 200.
+            learning_rate (float): Gradient descent step size. Defaults to 4.0.
+            l2 (float): L2 regularization strength. Defaults to 1e-4.
+            holdout (float): Fraction of the corpus used for calibration. Defaults to 0.2.
+            seed (int): Seed of the train/calibration split. Defaults to 42.
+
+        Returns:
+            LocalClassifier: The trained classifier.
+
+        Raises:
+            ValueError: If the corpus is empty or has categories outside `labels`.
+        """
+        if not texts or len(texts) != len(categories):
+            raise ValueError("O corpus de treino deve ter textos e categorias em mesmo número.")
+        unknown = set(categories) - set(labels)
+        if unknown:
+            raise ValueError(f"Categorias desconhecidas no corpus: {sorted(unknown)}")
+
+        y = np.array([1.0 if category == labels[1] else 0.0 for category in categories])
+        order = np.random.default_rng(seed).permutation(len(texts))
+        n_holdout = int(len(texts) * holdout)
+        calibration, training = order[:n_holdout], order[n_holdout:]
+        if len(set(y[calibration])) < 2 or len(set(y[training])) < 2:
+            calibration, training = order, order
+
+        hashed = [_hash_features(texts[i], n_features) for i in range(len(texts))]
+        document_frequency = np.zeros(n_features)
+        for i in training:
+            document_frequency[np.unique(hashed[i])] += 1
+        idf = np.log((1 + len(training)) / (1 + document_frequency)) + 1
+
+        rows = [_weigh(hashed[i], idf) for i in range(len(texts))]
+        weights, bias = _fit_logistic(rows, y, training, n_features, epochs, learning_rate, l2)
+
+        scores = np.array([float(values @ weights[indices]) + bias for indices, values in rows])
+        platt_a, platt_b = _fit_platt(scores[calibration], y[calibration])
+        return cls(labels, weights, bias, idf, platt_a, platt_b)
+
+
+def _hash_features(text: str, n_features: int) -> np.ndarray:
+    tokens = text.split()
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return np.array([zlib.crc32(gram.encode("utf-8")) % n_features for gram in grams], dtype=np.int64)
+
+
+def _weigh(hashed: np.ndarray, idf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if len(hashed) == 0:
+        return hashed, np.zeros(0)
+    indices, counts = np.unique(hashed, return_counts=True)
+    values = (1 + np.log(counts)) * idf[indices]
+    return indices, values / np.linalg.norm(values)
+
+
+def _vectorize(text: str, n_features: int, idf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return _weigh(_hash_features(text, n_features), idf)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -35, 35)))
+
+
+def _fit_logistic(
+    rows: List[Tuple[np.ndarray, np.ndarray]],
+    y: np.ndarray,
+    training: np.ndarray,
+    n_features: int,
+    epochs: int,
+    learning_rate: float,
+    l2: float,
+) -> Tuple[np.ndarray, float]:
+    """
+    Fits the logistic regression with full-batch gradient descent.
+
+    The training rows are flattened into a sparse (row, feature, value) layout so
+    every epoch is a handful of vectorized numpy operations.
+    """
+    row_ids = np.concatenate([np.full(len(rows[i][0]), position) for position, i in enumerate(training)])
+    indices = np.concatenate([rows[i][0] for i in training]).astype(np.int64)
+    values = np.concatenate([rows[i][1] for i in training])
+    targets = y[training]
+    n = len(training)
+
+    weights = np.zeros(n_features)
+    bias = 0.0
+    for _ in range(epochs):
+        scores = np.bincount(row_ids, weights=values * weights[indices], minlength=n) + bias
+        errors = _sigmoid(scores) - targets
+        gradient = np.bincount(indices, weights=errors[row_ids] * values, minlength=n_features) / n
+        weights -= learning_rate * (gradient + l2 * weights)
+        bias -= learning_rate * errors.mean()
+    return weights, bias
+
+
+def _fit_platt(scores: np.ndarray, y: np.ndarray, iterations: int = 100) -> Tuple[float, float]:
+    """
+    Fits sigmoid(a * score + b) to the labels with Newton's method, using Platt's
+    smoothed targets to avoid overconfident probabilities on small corpora.
+    """
+    positives = y.sum()
+    negatives = len(y) - positives
+    targets = np.where(y == 1, (positives + 1) / (positives + 2), 1 / (negatives + 2))
+    a, b = 1.0, 0.0
+    for _ in range(iterations):
+        p = _sigmoid(a * scores + b)
+        w = np.maximum(p * (1 - p), 1e-12)
+        gradient = np.array([np.sum((p - targets) * scores), np.sum(p - targets)])
+        hessian = np.array([
+            [np.sum(w * scores * scores) + 1e-9, np.sum(w * scores)],
+            [np.sum(w * scores), np.sum(w) + 1e-9],
+        ])
+        step = np.linalg.solve(hessian, gradient)
+        a, b = a - step[0], b - step[1]
+        if np.abs(step).max() < 1e-8:
+            break
+    return float(a), float(b)
@@ -1,62 +1,224 @@
 from app.domain.interfaces.INLPAdapter import INLPAdapter
 import re
 import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Tuple
 import nltk
 from nltk.corpus import stopwords
-from nltk.stem import RSLPStemmer
+from nltk.stem import RSLPStemmer, SnowballStemmer
 from nltk.tokenize import word_tokenize
 from app.api.decorators.exception import ServiceError
+from app.core.logger import logger
+
+_ALLOWED_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789áàâãéèêíïóôõöúçñ')
+
+class _NormalizationTable(dict):
+    """
+    Translation table that replaces symbols, accents and whitespace in a single pass.
+
+    Allowed characters are mapped to their unaccented form, whitespace to a plain
+    space and anything else to a space, which is what the symbol regex followed by
+    the accent removal did. Entries are computed on first use and memoized, so the
+    table only grows with the characters actually seen.
+    """
+
+    def __missing__(self, code_point: int) -> str:
+        char = chr(code_point)
+        if char in _ALLOWED_CHARS:
+            value = ''.join(c for c in unicodedata.normalize('NFD', char) if unicodedata.category(c) != 'Mn')
+        else:
+            value = ' '
+        self[code_point] = value
+        return value
+
+# Contractions split by NLTK's word_tokenize. Once the text only has [a-z0-9] and
+# spaces, these are the only tokens it splits, so the regex tokenizer does the same.
+_CONTRACTIONS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+# Languages recognized besides Portuguese, with their NLTK stopwords and Snowball stemmer.
+_FOREIGN_LANGUAGES = {'en': 'english', 'es': 'spanish'}
+# Only the first tokens are looked at by the language detection.
+_DETECTION_SAMPLE_TOKENS = 200
+# Marker stopwords a foreign language needs, and how many times the Portuguese ones, to win.
+_DETECTION_MIN_MARKERS = 3
+_DETECTION_MARGIN = 2
 
 class NLPAdapter(INLPAdapter):
 
     _url_pattern = re.compile(r'http\S+|www\S+|https\S+')
-    _symbol_pattern = re.compile(r'[^a-z0-9áàâãéèêíïóôõöúçñ\s]')
     _number_pattern = re.compile(r'\b\d+\b')
     _space_pattern = re.compile(r'\s+')
+    _normalization_table = _NormalizationTable()
+
+    def __init__(self, tokenizer: str = "regex", stem_cache_size: int = 50000, language_detection: bool = True, foreign_text: str = "stem"):
+        """
+        Initializes the NLP adapter.
 
-    def __init__(self):
+        Args:
+            tokenizer (str): "regex" for the lightweight tokenizer, or "punkt" for NLTK's
+                word_tokenize. Both produce the same tokens on normalized text. Defaults to "regex".
+            stem_cache_size (int): Maximum number of memoized stems. Defaults to 50000.
+            language_detection (bool): Whether English and Spanish texts are recognized by
+                their stopwords and kept out of the Portuguese stopwords and stemmer. Defaults to True.
+            foreign_text (str): What is done with English and Spanish texts: "stem" removes the
+                stopwords and stems with the Snowball stemmer of the language, "raw" keeps the
+                normalized words as they are, for the LLM. Defaults to "stem".
+        """
+        if tokenizer not in ("regex", "punkt"):
+            raise ValueError(f"Tokenizador não suportado: {tokenizer}")
+        if foreign_text not in ("stem", "raw"):
+            raise ValueError(f"Tratamento de texto estrangeiro não suportado: {foreign_text}")
+        self.init_kwargs = {
+            "tokenizer": tokenizer,
+            "stem_cache_size": stem_cache_size,
+            "language_detection": language_detection,
+            "foreign_text": foreign_text,
+        }
+        self.tokenizer = tokenizer
+        self.foreign_text = foreign_text
         self.stop_words = set(stopwords.words('portuguese'))
         self.stemmer = RSLPStemmer()
+        self._stem = lru_cache(maxsize=stem_cache_size)(self.stemmer.stem)
+        self._languages: Dict[str, Tuple[FrozenSet[str], Callable[[str], str]]] = {}
+        self._markers: Dict[str, str] = {}
+        if language_detection:
+            self._load_languages(stem_cache_size)
+
+    def _load_languages(self, stem_cache_size: int) -> None:
+        """
+        Loads the stopwords and stemmers of the foreign languages and builds the
+        language markers: the normalized stopwords that belong to a single language
+        (e.g. "the", "nao", "usted"), so shared words like "de" or "a" do not count.
+
+        Languages whose stopwords are missing from the NLTK data are left out.
+        """
+        stop_words = {'pt': self._normalized_words(self.stop_words)}
+        for language, name in _FOREIGN_LANGUAGES.items():
+            try:
+                stop_words[language] = self._normalized_words(stopwords.words(name))
+            except LookupError:
+                logger.warning("Stopwords '%s' ausentes; textos nesse idioma serão tratados como português.", name)
+                continue
+            self._languages[language] = (
+                stop_words[language],
+                lru_cache(maxsize=stem_cache_size)(SnowballStemmer(name).stem),
+            )
+        if not self._languages:
+            return
+        for language, words in stop_words.items():
+            others = set().union(*(other for code, other in stop_words.items() if code != language))
+            for word in words - others:
+                self._markers[word] = language
+
+    def _normalized_words(self, words) -> FrozenSet[str]:
+        return frozenset(token for word in words for token in self._normalize(word).split())
+
+    def detect_language(self, normalized_text: str) -> str:
+        """
+        Detects the language of a normalized text by counting its marker stopwords.
+
+        Only the first tokens are looked at, with one dictionary lookup each. A
+        foreign language is only chosen with a few markers and clearly more of them
+        than Portuguese, so a Portuguese email quoting an English phrase stays in
+        Portuguese.
+
+        Args:
+            normalized_text (str): The output of `_normalize`.
 
-    def _remove_accents(self, text: str) -> str:
+        Returns:
+            str: "pt", "en" or "es".
+        """
+        if not self._markers:
+            return 'pt'
+        counts = dict.fromkeys(self._languages, 0)
+        counts['pt'] = 0
+        for token in normalized_text.split(maxsplit=_DETECTION_SAMPLE_TOKENS)[:_DETECTION_SAMPLE_TOKENS]:
+            language = self._markers.get(token)
+            if language is not None:
+                counts[language] += 1
+        language = max(self._languages, key=counts.__getitem__)
+        if counts[language] >= _DETECTION_MIN_MARKERS and counts[language] > _DETECTION_MARGIN * counts['pt']:
+            return language
+        return 'pt'
+
+    def _normalize(self, text: str) -> str:
         """
-        Remove accents from a given string.
+        Lowercases the text and removes URLs, symbols and accents.
 
-        This function uses the unicodedata.normalize() function with the 'NFD'
-        form to separate accents from the base letters. It then removes
-        characters that are classified as 'Mn' by the unicodedata.category()
-        function, which corresponds to non-spacing marks (i.e. the accents).
+        Symbols and accents are handled by a single `str.translate` pass instead of
+        a regex substitution followed by a character-by-character accent removal.
 
         Args:
-            text (str): The string from which to remove the accents.
+            text (str): The raw text.
 
         Returns:
-            str: The string without accents.
+            str: The text with only [a-z0-9] characters and spaces.
         """
-        return ''.join(
-            c for c in unicodedata.normalize('NFD', text)
-            if unicodedata.category(c) != 'Mn'
-        )
+        text = self._url_pattern.sub(' ', text.lower())
+        return text.translate(self._normalization_table)
+
+    def _tokenize(self, text: str) -> List[str]:
+        if self.tokenizer == "punkt":
+            text = self._number_pattern.sub(' ', text)
+            text = self._space_pattern.sub(' ', text).strip()
+            return word_tokenize(text, language='portuguese')
+
+        tokens = []
+        for token in text.split():
+            if token.isdigit():
+                continue
+            split = _CONTRACTIONS.get(token)
+            if split:
+                tokens.extend(split)
+            else:
+                tokens.append(token)
+        return tokens
 
     def preprocess(self, text: str) -> str:
         if not text or not isinstance(text, str):
             raise ValueError("Texto inválido para preprocessamento.")
 
-        text = text.lower()
-        text = self._url_pattern.sub(' ', text)
-        text = self._symbol_pattern.sub(' ', text)
-        text = self._remove_accents(text)
-        text = self._number_pattern.sub(' ', text)
-        text = self._space_pattern.sub(' ', text).strip()
+        text = self._normalize(text)
+        language = self.detect_language(text)
+        if language != 'pt':
+            return self._preprocess_foreign(text, language)
 
         try:
-            tokens = word_tokenize(text, language='portuguese')
+            tokens = self._tokenize(text)
             processed_tokens = [
-                self.stemmer.stem(word)
+                self._stem(word)
                 for word in tokens
                 if word not in self.stop_words and len(word) > 2
             ]
             return " ".join(processed_tokens)
 
         except Exception as e:
-            raise ServiceError(f"Erro no processamento NLP: {e}")
\ No newline at end of file
+            raise ServiceError(f"Erro no processamento NLP: {e}")
+
+    def _preprocess_foreign(self, text: str, language: str) -> str:
+        """
+        Preprocesses an English or Spanish text.
+
+        The tokens come from the regex tokenizer, since the Punkt models are only
+        loaded for Portuguese. With `foreign_text="raw"` the normalized words go to
+        the LLM as they are; otherwise the stopwords of the language are removed
+        and the Snowball stemmer of the language is applied.
+        """
+        try:
+            tokens = [token for token in text.split() if not token.isdigit()]
+            if self.foreign_text == "raw":
+                return " ".join(tokens)
+            stop_words, stem = self._languages[language]
+            return " ".join(stem(word) for word in tokens if word not in stop_words and len(word) > 2)
+        except Exception as e:
+            raise ServiceError(f"Erro no processamento NLP: {e}")
+
+    def preprocess_many(self, texts: List[str]) -> List[str]:
+        return [self.preprocess(text) for text in texts]
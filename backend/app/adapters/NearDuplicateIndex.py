@@ -0,0 +1,247 @@
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+from app.domain.interfaces.INearDuplicateIndex import INearDuplicateIndex
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN_WITH_DIGITS = re.compile(r'\S*\d\S*')
+
+class NearDuplicateIndex(INearDuplicateIndex):
+    """
+    MinHash LSH index of the analysed emails.
+
+    Each preprocessed email is reduced to the set of its word shingles, and then
+    to a MinHash signature: for each of `num_perm` hash functions, the minimum
+    hash of its shingles. The fraction of equal positions of two signatures
+    estimates the Jaccard similarity of the shingle sets, so templated emails that
+    only differ in a name or a ticket number stay close; tokens with digits (ticket
+    ids, protocols) are masked before shingling. The signature is split
+    into bands, and each band is hashed into a slot of a fixed-size table that
+    points to the last email seen with it; a lookup only compares the emails of
+    its own slots, so it costs the same at a thousand or a million entries.
+    Unrelated emails sharing a slot are told apart by the comparison of the whole
+    signatures, so the tables need no keys and take 8 bytes per slot.
+
+    Entries are evicted in least recently used order once `max_entries` is
+    reached, and expire after `ttl_seconds`. With `sqlite_path`, they are also
+    written to a SQLite database and loaded back on start, and the entries that
+    other processes (e.g. the other server workers) wrote to it are picked up
+    before each lookup.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        max_entries: int = 20000,
+        ttl_seconds: float = 86400.0,
+        sqlite_path: Optional[str] = None,
+        reuse_reply: bool = False,
+        shingle_size: int = 2,
+        min_shingles: int = 5,
+        seed: int = 1,
+    ):
+        """
+        Initializes the index.
+
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity to reuse an analysis. Defaults to 0.6.
+            num_perm (int): Number of hash functions of the signatures. Defaults to 64.
+            max_entries (int): Maximum number of emails kept in memory and on disk. Defaults to 20000.
+            ttl_seconds (float): Time in seconds an entry stays valid. Defaults to 86400.
+            sqlite_path (Optional[str]): Path of the SQLite database. If None, the index is only kept in memory.
+            reuse_reply (bool): Whether the suggested response is reused along with the category.
+                Responses may quote names and numbers of the other email. Defaults to False.
+            shingle_size (int): Number of consecutive words of each shingle. Defaults to 2.
+            min_shingles (int): Emails with fewer distinct shingles are not indexed, since a single
+                word changes most of their shingles. Defaults to 5.
+            seed (int): Seed of the hash functions. Persisted entries are only valid for the same seed.
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.reuse_reply = reuse_reply
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        self.bands, self.rows = _band_parameters(threshold, num_perm)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, num_perm, dtype=np.uint64)
+        self._band_multipliers = rng.randint(0, 1 << 63, self.rows, dtype=np.uint64) | np.uint64(1)
+        self._table_bits = max(10, (4 * max_entries - 1).bit_length())
+        self._tables = np.full((self.bands, 1 << self._table_bits), -1, dtype=np.int64)
+        self._band_index = np.arange(self.bands)
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._next_id = 0
+        self._synced_id = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS near_duplicates ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, signature BLOB NOT NULL, fingerprint TEXT NOT NULL, "
+                "category TEXT NOT NULL, details TEXT, created_at REAL NOT NULL)"
+            )
+            self._load_from_disk()
+
+    def find(self, processed_text: str, fingerprint: str) -> Optional[Tuple[str, Optional[str]]]:
+        signature = self._signature(processed_text)
+        if signature is None:
+            with self._lock:
+                self.skipped += 1
+            return None
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                self._load_from_disk()
+            best_id, best_similarity = None, self.threshold
+            for entry_id in set(self._tables[self._band_index, self._band_slots(signature)].tolist()):
+                entry = self._entries.get(entry_id)
+                if entry is None or entry[1] != fingerprint:
+                    continue
+                if now - entry[4] > self.ttl_seconds:
+                    self._remove(entry_id)
+                    continue
+                similarity = np.count_nonzero(np.frombuffer(entry[0], dtype=np.uint32) == signature) / self.num_perm
+                if similarity >= best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            if best_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            _, _, category, details, _ = self._entries[best_id]
+            return category, details if self.reuse_reply else None
+
+    def add(self, processed_text: str, fingerprint: str, value: tuple) -> None:
+        signature = self._signature(processed_text)
+        if signature is None:
+            return
+        category, details = value
+        details = details if self.reuse_reply else None
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                entry_id = self._db.execute(
+                    "INSERT INTO near_duplicates (signature, fingerprint, category, details, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (signature.tobytes(), fingerprint, category, details, now),
+                ).lastrowid
+                if entry_id % 1000 == 0:
+                    self._db.execute("DELETE FROM near_duplicates WHERE id <= ?", (entry_id - self.max_entries,))
+            else:
+                entry_id = self._next_id
+                self._next_id += 1
+            self._insert(entry_id, signature.tobytes(), fingerprint, category, details, now)
+
+    def stats(self) -> dict:
+        """
+        Returns the index counters.
+
+        Returns:
+            dict: The hits, misses, emails too short to index, evictions and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+    def close(self) -> None:
+        """
+        Closes the SQLite connection, if any.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _signature(self, processed_text: str) -> Optional[np.ndarray]:
+        """
+        Computes the MinHash signature of the shingles of the text.
+
+        Returns:
+            Optional[np.ndarray]: The `num_perm` minimum hashes, or None if the text has
+            fewer than `min_shingles` distinct shingles.
+        """
+        tokens = _TOKEN_WITH_DIGITS.sub("#", processed_text).split()
+        size = self.shingle_size
+        shingles = {" ".join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+        if len(shingles) < self.min_shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_slots(self, signature: np.ndarray) -> np.ndarray:
+        """
+        Hashes each band of the signature into a slot of its table (multiply-shift hashing).
+        """
+        bands = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        return ((bands * self._band_multipliers).sum(axis=1) >> np.uint64(64 - self._table_bits)).astype(np.int64)
+
+    def _insert(self, entry_id: int, signature: bytes, fingerprint: str, category: str, details: Optional[str], created_at: float) -> None:
+        self._entries[entry_id] = (signature, sys.intern(fingerprint), sys.intern(category), details, created_at)
+        self._tables[self._band_index, self._band_slots(np.frombuffer(signature, dtype=np.uint32))] = entry_id
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, entry_id: int) -> None:
+        signature = self._entries.pop(entry_id)[0]
+        slots = self._band_slots(np.frombuffer(signature, dtype=np.uint32))
+        owned = self._tables[self._band_index, slots] == entry_id
+        self._tables[self._band_index[owned], slots[owned]] = -1
+
+    def _load_from_disk(self) -> None:
+        """
+        Loads the entries written to the database since the last load, by this or another process.
+        """
+        rows = self._db.execute(
+            "SELECT id, signature, fingerprint, category, details, created_at FROM near_duplicates "
+            "WHERE id > ? AND created_at >= ? ORDER BY id DESC LIMIT ?",
+            (self._synced_id, time.time() - self.ttl_seconds, self.max_entries),
+        ).fetchall()
+        if not rows:
+            return
+        self._synced_id = rows[0][0]
+        for entry_id, signature, fingerprint, category, details, created_at in reversed(rows):
+            if entry_id not in self._entries and len(signature) == self.num_perm * 4:
+                self._insert(entry_id, signature, fingerprint, category, details, created_at)
+
+
+def _band_parameters(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Splits the signature into bands of equal size.
+
+    Two emails share a bucket with probability 1 - (1 - s^rows)^bands, an S-curve
+    of their similarity s that rises around (1 / bands)^(1 / rows). The split with
+    the highest rise point at or below the threshold is chosen, so emails above the
+    threshold are very likely to be compared, while most others are never looked at.
+
+    Returns:
+        Tuple[int, int]: The number of bands and of rows per band.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
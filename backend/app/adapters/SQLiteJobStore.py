@@ -0,0 +1,71 @@
+import sqlite3
+import threading
+import time
+from typing import Optional
+from app.domain.entities.job import Job, JobStatus
+from app.domain.interfaces.IJobStore import IJobStore
+
+class SQLiteJobStore(IJobStore):
+
+    _columns = ("id", "status", "webhook_url", "category", "details", "error", "error_type", "created_at", "updated_at")
+
+    def __init__(self, path: str, ttl_seconds: float = 86400.0, recover: bool = True):
+        """
+        Initializes a job store backed by a SQLite database, for single-node durability.
+
+        Results survive restarts. Jobs that were still queued or running when the
+        previous process stopped cannot be resumed, since their input is not stored,
+        so they are marked as failed on startup. Jobs older than the TTL are deleted.
+
+        Args:
+            path (str): Path of the SQLite database.
+            ttl_seconds (float): Time in seconds a job is kept after its submission.
+            recover (bool): Whether the startup recovery runs. Workers of a pre-fork server
+                share the database and skip it, since the master already ran it. Defaults to True.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, webhook_url TEXT, category TEXT, details TEXT, "
+            "error TEXT, error_type TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS analysis_jobs_created_at ON analysis_jobs (created_at)")
+        if recover:
+            self._recover()
+
+    def _recover(self) -> None:
+        self._db.execute(
+            "UPDATE analysis_jobs SET status = ?, error = ?, error_type = ?, updated_at = ? WHERE status IN (?, ?)",
+            (JobStatus.FAILED.value, "Tarefa interrompida pela reinicialização do servidor.", "ServiceError",
+             time.time(), JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+        )
+        self._db.execute("DELETE FROM analysis_jobs WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+
+    def save(self, job: Job) -> None:
+        values = job.to_dict()
+        values["webhook_url"] = job.webhook_url
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO analysis_jobs ({', '.join(self._columns)}) "
+                f"VALUES ({', '.join('?' for _ in self._columns)})",
+                tuple(values[column] for column in self._columns),
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(self._columns)} FROM analysis_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = Job(**dict(zip(self._columns, row)))
+        if time.time() - job.created_at > self.ttl_seconds:
+            return None
+        return job
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,65 +1,118 @@
 import io
+from typing import BinaryIO, Iterator, Optional, Union
 from PyPDF2 import PdfReader
+from app.core.charset import decode_text
+from app.core.config import settings
 from app.domain.entities.document import Document, FileType
 from app.domain.interfaces.ITextReaderAdapter import ITextReaderAdapter
 
 class TextReaderAdapter(ITextReaderAdapter):
+    def __init__(self, max_chars: Optional[int] = None):
+        """
+        Initializes the text reader.
+
+        Args:
+            max_chars (Optional[int]): Character budget of the extracted text. PDF pages
+                stop being read once it is reached, and only the first bytes of TXT files
+                that can hold it are read. 0 disables the budget. Defaults to
+                settings.EXTRACT_MAX_CHARS.
+        """
+        self.max_chars = settings.EXTRACT_MAX_CHARS if max_chars is None else max_chars
+        self.init_kwargs = {"max_chars": self.max_chars}
+
     def extract_text(self, document: Document) -> str:
         if document.text:  
             return document.text
 
         if document.filetype == FileType.TXT:
-            return self._extract_from_txt(document.content)
+            # A character takes at most 4 bytes (UTF-8 and UTF-32), plus the byte order mark.
+            limit = self.max_chars * 4 + 4 if self.max_chars else -1
+            content = self._read_bytes(document.content, limit)
+            return self._truncate(self._extract_from_txt(content, partial=len(content) == limit))
 
         if document.filetype == FileType.PDF:
             return self._extract_from_pdf(document.content)
     
         raise ValueError("Tipo de arquivo não suportado para extração de texto.")
 
-    def _extract_from_txt(self, content: bytes) -> str:
+    def _truncate(self, text: str) -> str:
+        return text[:self.max_chars] if self.max_chars else text
+
+    def _read_bytes(self, content: Union[bytes, BinaryIO], limit: int = -1) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content[:limit] if limit >= 0 else content)
+        content.seek(0)
+        return content.read(limit)
+
+    def _extract_from_txt(self, content: bytes, partial: bool = False) -> str:
         """
-        Extracts and decodes text content from a bytes object, attempting UTF-8 decoding first.
-        If UTF-8 decoding fails due to a UnicodeDecodeError, falls back to ISO-8859-1 decoding,
-        ignoring any errors encountered during decoding.
+        Extracts and decodes text content from a bytes object.
+
+        The encoding is detected by `decode_text`: a byte order mark (UTF-8, UTF-16
+        or UTF-32), UTF-16 without a BOM, strict UTF-8, and then cp1252, so accents
+        and curly quotes of Windows exports are kept instead of being dropped.
 
         Args:
             content (bytes): The raw bytes content to be decoded.
+            partial (bool): Whether the content is only the first bytes of the file. Defaults to False.
 
         Returns:
             str: The decoded and stripped text content.
         """
-        try:
-            return content.decode('utf-8').strip()
-        except UnicodeDecodeError:
-            return content.decode("iso-8859-1", errors="ignore")
+        return decode_text(content, partial=partial).strip()
+
+    def _iter_pdf_pages(self, content: Union[bytes, BinaryIO]) -> Iterator[str]:
+        """
+        Yields the text of each PDF page, reading the pages only as they are consumed.
+
+        Args:
+            content (Union[bytes, BinaryIO]): The raw bytes of the PDF, or a binary file. Seekable
+                files (e.g. the spooled upload) are read in place instead of copied.
+
+        Yields:
+            str: The text of each page that has extractable text.
+        """
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            content = io.BytesIO(content)
+        elif not content.seekable():
+            content = io.BytesIO(self._read_bytes(content))
+        else:
+            content.seek(0)
+        reader = PdfReader(content)
+        for page in reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                yield page_text
 
-    def _extract_from_pdf(self, content: bytes) -> str:
+    def _extract_from_pdf(self, content: Union[bytes, BinaryIO]) -> str:
         """
-        Extracts text content from a PDF file in bytes format.
+        Extracts text content from a PDF file.
 
-        The text is extracted from each page of the PDF and concatenated with newline characters.
-        If the PDF does not contain any extractable text, a ValueError is raised.
+        The pages are read lazily and joined with newline characters. Once the character
+        budget is reached the remaining pages are not parsed at all, so a large document
+        costs time proportional to the text actually used. If the PDF does not contain
+        any extractable text, a ValueError is raised.
 
         Args:
-            content (bytes): The raw bytes content of the PDF file.
+            content (Union[bytes, BinaryIO]): The raw bytes of the PDF file, or a seekable binary file.
 
         Returns:
-            str: The extracted text content from the PDF file.
+            str: The extracted text content from the PDF file, cut to the character budget.
 
         Raises:
             ValueError: If the PDF does not contain any extractable text or if an error occurs while reading the PDF.
         """
         try:
-            pdf_stream = io.BytesIO(content)
-            reader = PdfReader(pdf_stream)
-
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            if not text.strip():
+            parts = []
+            length = 0
+            for page_text in self._iter_pdf_pages(content):
+                parts.append(page_text)
+                length += len(page_text) + 1
+                if self.max_chars and length >= self.max_chars:
+                    break
+            text = "\n".join(parts).strip()
+            if not text:
                 raise ValueError("O PDF não contém texto extraível")
-            return text.strip()
+            return self._truncate(text)
         except Exception as e:
-            raise ValueError(f"Erro ao ler PDF: {e}")
\ No newline at end of file
+            raise ValueError(f"Erro ao ler PDF: {e}")
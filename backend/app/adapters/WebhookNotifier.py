@@ -0,0 +1,73 @@
+import asyncio
+import ipaddress
+import socket
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+import httpx
+from app.core.logger import logger
+from app.domain.interfaces.IWebhookNotifier import IWebhookNotifier
+
+class WebhookNotifier(IWebhookNotifier):
+
+    def __init__(self, http_client: httpx.AsyncClient, timeout: float = 10.0, attempts: int = 3, allowed_hosts: Optional[Iterable[str]] = None):
+        """
+        Initializes the webhook notifier.
+
+        Webhook URLs are given by the clients, so without an allowlist any host that
+        resolves only to public addresses is accepted, and loopback, private,
+        link-local and other reserved addresses are refused: otherwise a client could
+        make the server POST to internal services. The host is resolved again before
+        each notification, so a name that later points to an internal address is
+        refused as well.
+
+        Args:
+            http_client (httpx.AsyncClient): The shared HTTP client.
+            timeout (float): Timeout in seconds of each attempt. Defaults to 10.0.
+            attempts (int): Number of attempts before giving up, with a growing delay between them. Defaults to 3.
+            allowed_hosts (Optional[Iterable[str]]): The only hosts that may be notified; an entry
+                starting with "." also allows its subdomains. Allowed hosts may be internal.
+                Defaults to None (any public host).
+        """
+        self.http_client = http_client
+        self.timeout = timeout
+        self.attempts = attempts
+        self.allowed_hosts = {host.strip().lower() for host in allowed_hosts or () if host.strip()}
+
+    async def check_url(self, url: str) -> None:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        if parts.scheme not in ("http", "https") or not host:
+            raise ValueError("A URL de webhook deve começar com http:// ou https:// e ter um host.")
+        if self.allowed_hosts:
+            if not any(host == allowed or (allowed.startswith(".") and host.endswith(allowed)) for allowed in self.allowed_hosts):
+                raise ValueError(f"Host de webhook não permitido: {host}")
+            return
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            addresses = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except (OSError, ValueError):
+            raise ValueError(f"Não foi possível resolver o host do webhook: {host}")
+        for *_, sockaddr in addresses:
+            if not ipaddress.ip_address(sockaddr[0].split("%")[0]).is_global:
+                raise ValueError(f"O webhook não pode apontar para um endereço interno: {host}")
+
+    async def notify(self, url: str, payload: dict) -> bool:
+        try:
+            await self.check_url(url)
+        except ValueError as e:
+            logger.warning("Webhook %s não notificado: %s", url, e)
+            return False
+        for attempt in range(1, self.attempts + 1):
+            try:
+                response = await self.http_client.post(url, json=payload, timeout=self.timeout)
+                if response.status_code < 400:
+                    return True
+                if response.status_code < 500 and response.status_code != 429:
+                    logger.warning("Webhook %s recusou a notificação: %s", url, response.status_code)
+                    return False
+                logger.warning("Webhook %s respondeu %s (tentativa %s)", url, response.status_code, attempt)
+            except httpx.HTTPError as e:
+                logger.warning("Erro ao notificar webhook %s (tentativa %s): %s", url, attempt, e)
+            if attempt < self.attempts:
+                await asyncio.sleep(2 ** (attempt - 1))
+        return False
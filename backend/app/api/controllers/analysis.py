@@ -1,8 +1,10 @@
-from fastapi import APIRouter,Depends, UploadFile, File, Form
-from app.api.decorators.decorators import create
-from app.api.dependencies.dependencies import get_analysis_use_case
-from app.api.schemas.responses import AnalysisResponse
-from typing import Optional
+from fastapi import APIRouter,Depends, UploadFile, File, Form, Request
+from app.api.decorators.decorators import create, get
+from app.api.dependencies.dependencies import get_analysis_use_case, get_batch_analysis_use_case, get_analysis_jobs_use_case
+from app.api.schemas.responses import AnalysisResponse, BatchAnalysisResponse, JobResponse
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
+import json
 
 analysis_router = APIRouter(prefix="/analysis", tags=["Files"])
 
@@ -22,4 +24,120 @@ async def upload_file_endpoint(
     text: Optional[str] = Form(None),
     use_case = Depends(get_analysis_use_case)
 ):
-    pass
\ No newline at end of file
+    pass
+
+async def _format_events(events: AsyncIterator[dict], sse: bool) -> AsyncIterator[str]:
+    """
+    Serializes the analysis events as NDJSON lines or server-sent events.
+
+    Errors raised after the response has started are sent as an "error" event, since
+    the status code can no longer change. If the client disconnects, the events
+    iterator is closed, which also closes the upstream request.
+    """
+    try:
+        async for event in events:
+            yield _format_event(event, sse)
+    except Exception as e:
+        yield _format_event({"event": "error", "data": str(e), "error_type": e.__class__.__name__}, sse)
+    finally:
+        await events.aclose()
+
+def _format_event(event: dict, sse: bool) -> str:
+    if sse:
+        return f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+async def _execute_stream(use_case, request: Request, file, text):
+    events = await use_case.stream(file=file, text=text)
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    return StreamingResponse(
+        _format_events(events, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Content-Encoding": "identity"}
+    )
+
+@create(
+    router=analysis_router,
+    api_func=lambda use_case, request, file, text: _execute_stream(use_case, request, file, text),
+    rule="/stream",
+    description="Faz a análise em streaming: a categoria é enviada assim que disponível e a sugestão é enviada token a token (NDJSON ou SSE com 'Accept: text/event-stream')",
+    status_code=200
+)
+async def stream_endpoint(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    use_case = Depends(get_analysis_use_case)
+):
+    pass
+
+async def _execute_batch(use_case, request: Request):
+    """
+    Reads the batch from a JSON body or a multipart form and runs it.
+
+    A JSON body may be a list of texts or an object with a "texts" list. A multipart
+    form may have many "files" (TXT, PDF, ZIP or mbox) and many "texts" fields.
+    """
+    if request.headers.get("content-type", "").startswith("application/json"):
+        body = await request.json()
+        texts = body.get("texts") if isinstance(body, dict) else body
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ValueError("O corpo JSON deve ser uma lista de textos ou um objeto com a chave 'texts'.")
+        return await use_case.execute(texts=texts)
+
+    form = await request.form()
+    files = [file for file in form.getlist("files") if not isinstance(file, str)]
+    texts = [text for text in form.getlist("texts") if isinstance(text, str)]
+    return await use_case.execute(files=files, texts=texts)
+
+@create(
+    router=analysis_router,
+    api_func=lambda use_case, request: _execute_batch(use_case, request),
+    rule="/batch",
+    response_model=BatchAnalysisResponse,
+    description="Analisa vários textos ou arquivos (TXT, PDF, ZIP ou mbox) em uma única requisição",
+    status_code=200
+)
+async def batch_endpoint(
+    request: Request,
+    use_case = Depends(get_batch_analysis_use_case)
+):
+    pass
+
+async def _submit_job(use_case, file, text, webhook_url):
+    job = await use_case.submit(file=file, text=text, webhook_url=webhook_url)
+    return JobResponse(**job.to_dict())
+
+async def _get_job(use_case, job_id: str):
+    job = await use_case.get(job_id)
+    return JobResponse(**job.to_dict())
+
+@create(
+    router=analysis_router,
+    api_func=lambda use_case, file, text, webhook_url: _submit_job(use_case, file, text, webhook_url),
+    rule="/jobs",
+    response_model=JobResponse,
+    description="Enfileira a análise de um arquivo ou texto e retorna o id da tarefa; o resultado é consultado em /jobs/{job_id} ou enviado ao webhook_url",
+    status_code=202
+)
+async def submit_job_endpoint(
+    file: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    webhook_url: Optional[str] = Form(None),
+    use_case = Depends(get_analysis_jobs_use_case)
+):
+    pass
+
+@get(
+    router=analysis_router,
+    api_func=lambda use_case, job_id: _get_job(use_case, job_id),
+    rule="/jobs/{job_id}",
+    response_model=JobResponse,
+    description="Retorna o estado de uma tarefa de análise e, quando concluída, o resultado",
+    status_code=200
+)
+async def get_job_endpoint(
+    job_id: str,
+    use_case = Depends(get_analysis_jobs_use_case)
+):
+    pass
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, Request
+from app.api.decorators.decorators import get
+from app.api.decorators.exception import ServiceUnavailableError
+from app.api.dependencies.dependencies import get_executor, get_upstream_guard
+from app.api.schemas.responses import ExecutorStatsResponse, HealthResponse, UpstreamStatsResponse
+
+health_router = APIRouter(prefix="/health", tags=["Health"])
+
+async def _liveness():
+    return HealthResponse(status="ok")
+
+async def _readiness(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        raise ServiceUnavailableError("Aplicação ainda não está pronta.")
+    return HealthResponse(status="ready")
+
+async def _executor_stats(executor):
+    return ExecutorStatsResponse(**executor.stats())
+
+async def _upstream_stats(upstream_guard):
+    return UpstreamStatsResponse(**upstream_guard.stats())
+
+@get(
+    router=health_router,
+    api_func=lambda executor: _executor_stats(executor),
+    rule="/executor",
+    response_model=ExecutorStatsResponse,
+    description="Retorna o estado do pool de processamento (workers ocupados, fila e rejeições)",
+    status_code=200
+)
+async def executor_stats_endpoint(
+    executor = Depends(get_executor)
+):
+    pass
+
+@get(
+    router=health_router,
+    api_func=lambda: _liveness(),
+    rule="/live",
+    response_model=HealthResponse,
+    description="Indica se o processo está no ar",
+    status_code=200
+)
+async def liveness_endpoint():
+    pass
+
+@get(
+    router=health_router,
+    api_func=lambda request: _readiness(request),
+    rule="/ready",
+    response_model=HealthResponse,
+    description="Indica se a aplicação concluiu o aquecimento e pode receber tráfego (503 caso contrário)",
+    status_code=200
+)
+async def readiness_endpoint(
+    request: Request
+):
+    pass
+
+@get(
+    router=health_router,
+    api_func=lambda upstream_guard: _upstream_stats(upstream_guard),
+    rule="/upstream",
+    response_model=UpstreamStatsResponse,
+    description="Retorna os contadores das chamadas ao serviço de IA (circuito, requisições em andamento, retentativas e limitações)",
+    status_code=200
+)
+async def upstream_stats_endpoint(
+    upstream_guard = Depends(get_upstream_guard)
+):
+    pass
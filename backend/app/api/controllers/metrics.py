@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.api.decorators.decorators import get
+from app.core.metrics import metrics
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+async def _render_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@get(
+    router=metrics_router,
+    api_func=lambda: _render_metrics(),
+    rule="/metrics",
+    response_class=PlainTextResponse,
+    description="Métricas no formato de texto do Prometheus",
+    status_code=200
+)
+async def metrics_endpoint():
+    pass
@@ -12,13 +12,27 @@ class ErrorResponse(BaseModel):
 class ServiceError(Exception):
     pass
 
+class ServiceUnavailableError(ServiceError):
+    pass
+
+class NotFoundError(Exception):
+    pass
+
 EXCEPTION_STATUS_CODES = {
     ValueError: status.HTTP_400_BAD_REQUEST,
     ServiceError: status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ServiceUnavailableError: status.HTTP_503_SERVICE_UNAVAILABLE,
     PermissionError: status.HTTP_403_FORBIDDEN,
     KeyError: status.HTTP_404_NOT_FOUND,
+    NotFoundError: status.HTTP_404_NOT_FOUND,
 }
 
+def _status_code_for(error: Exception) -> int:
+    for error_type in type(error).__mro__:
+        if error_type in EXCEPTION_STATUS_CODES:
+            return EXCEPTION_STATUS_CODES[error_type]
+    return status.HTTP_422_UNPROCESSABLE_ENTITY
+
 def handle_exceptions(func: Callable) -> Callable:
     """
     Decorator to catch and handle exceptions in functions.
@@ -31,8 +45,8 @@ def handle_exceptions(func: Callable) -> Callable:
     an `ErrorResponse` object. If the exception is an instance of `HTTPException`,
     it is re-raised.
 
-    The exception type is used to determine the status code of the response, with
-    a default of 422 if the exception type is not found in `EXCEPTION_STATUS_CODES`.
+    The exception type (or its closest base class) is used to determine the status
+    code of the response, with a default of 422 if neither is found in `EXCEPTION_STATUS_CODES`.
     """
     @wraps(func)
     async def async_wrapper(*args, **kwargs) -> Any:
@@ -41,7 +55,7 @@ def handle_exceptions(func: Callable) -> Callable:
         except HTTPException:
             raise
         except Exception as e:
-            status_code = EXCEPTION_STATUS_CODES.get(type(e), status.HTTP_422_UNPROCESSABLE_ENTITY)
+            status_code = _status_code_for(e)
             
             error_response = ErrorResponse(
                 detail=str(e),
@@ -59,7 +73,7 @@ def handle_exceptions(func: Callable) -> Callable:
         except HTTPException:
             raise
         except Exception as e:
-            status_code = EXCEPTION_STATUS_CODES.get(type(e), status.HTTP_422_UNPROCESSABLE_ENTITY)
+            status_code = _status_code_for(e)
             
             error_response = ErrorResponse(
                 detail=str(e),
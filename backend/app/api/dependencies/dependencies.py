@@ -1,20 +1,75 @@
 from app.domain.useCases.analysis import AnalysisUseCase
-from app.adapters.TextReaderAdapter import TextReaderAdapter
 from app.domain.interfaces import ITextReaderAdapter
 from app.domain.interfaces import INLPAdapter
+from app.domain.interfaces import IEmailCleaner
 from app.adapters.NLPAdapter import NLPAdapter
 from app.domain.interfaces import IEmailAnalyzer
-from app.adapters.EmailAnalyzer import EmailAnalyzer
-from fastapi import Depends
+from app.domain.useCases.batch_analysis import BatchAnalysisUseCase
+from app.domain.useCases.analysis_jobs import AnalysisJobsUseCase
+from app.domain.interfaces import IJobStore
+from app.domain.interfaces import IWebhookNotifier
+from app.core.job_queue import JobQueue
+from app.domain.interfaces import IArchiveReaderAdapter
+from app.adapters.ArchiveReaderAdapter import ArchiveReaderAdapter
+from app.core.config import settings
+from app.core.executor import CpuExecutor
+from app.core.singleflight import SingleFlight
+from app.domain.interfaces import IAnalysisCache
+from app.domain.interfaces import INearDuplicateIndex
+from fastapi import Depends, Request
+from typing import Optional
 
-def get_nlp_adapter():
-    return NLPAdapter()
+def get_nlp_adapter(request: Request):
+    if request.app.state.nlp_adapter is None:
+        request.app.state.nlp_adapter = NLPAdapter(
+            tokenizer=settings.NLP_TOKENIZER,
+            stem_cache_size=settings.NLP_STEM_CACHE_SIZE,
+            language_detection=settings.NLP_LANGUAGE_DETECTION,
+            foreign_text=settings.NLP_FOREIGN_TEXT,
+        )
+    return request.app.state.nlp_adapter
 
-def get_email_analyzer():
-    return EmailAnalyzer()
+def get_email_analyzer(request: Request):
+    return request.app.state.email_analyzer
 
-def get_text_reader_adapter():
-    return TextReaderAdapter()
+def get_text_reader_adapter(request: Request):
+    return request.app.state.text_reader_adapter
 
-def get_analysis_use_case(text_reader_adapter: ITextReaderAdapter = Depends(get_text_reader_adapter), nlp_adapter: INLPAdapter = Depends(get_nlp_adapter), email_analyzer: IEmailAnalyzer = Depends(get_email_analyzer)):
-    return AnalysisUseCase(text_reader_adapter=text_reader_adapter, nlp_adapter=nlp_adapter, email_analyzer=email_analyzer)
+def get_email_cleaner(request: Request):
+    return request.app.state.email_cleaner
+
+def get_analysis_cache(request: Request):
+    return request.app.state.analysis_cache
+
+def get_near_duplicate_index(request: Request):
+    return request.app.state.near_duplicate_index
+
+def get_executor(request: Request):
+    return request.app.state.executor
+
+def get_single_flight(request: Request):
+    return request.app.state.single_flight
+
+def get_upstream_guard(request: Request):
+    return request.app.state.upstream_guard
+
+def get_analysis_use_case(text_reader_adapter: ITextReaderAdapter = Depends(get_text_reader_adapter), nlp_adapter: INLPAdapter = Depends(get_nlp_adapter), email_analyzer: IEmailAnalyzer = Depends(get_email_analyzer), analysis_cache: Optional[IAnalysisCache] = Depends(get_analysis_cache), executor: CpuExecutor = Depends(get_executor), single_flight: Optional[SingleFlight] = Depends(get_single_flight), email_cleaner: Optional[IEmailCleaner] = Depends(get_email_cleaner), near_duplicate_index: Optional[INearDuplicateIndex] = Depends(get_near_duplicate_index)):
+    return AnalysisUseCase(text_reader_adapter=text_reader_adapter, nlp_adapter=nlp_adapter, email_analyzer=email_analyzer, analysis_cache=analysis_cache, executor=executor, single_flight=single_flight, email_cleaner=email_cleaner, near_duplicate_index=near_duplicate_index)
+
+def get_archive_reader_adapter():
+    return ArchiveReaderAdapter(max_items=settings.BATCH_MAX_ITEMS, max_total_size=settings.ARCHIVE_MAX_UNCOMPRESSED_SIZE)
+
+def get_batch_analysis_use_case(analysis_use_case: AnalysisUseCase = Depends(get_analysis_use_case), archive_reader_adapter: IArchiveReaderAdapter = Depends(get_archive_reader_adapter)):
+    return BatchAnalysisUseCase(analysis_use_case=analysis_use_case, archive_reader_adapter=archive_reader_adapter, max_concurrency=settings.BATCH_MAX_CONCURRENCY, max_items=settings.BATCH_MAX_ITEMS)
+
+def get_job_store(request: Request):
+    return request.app.state.job_store
+
+def get_job_queue(request: Request):
+    return request.app.state.job_queue
+
+def get_webhook_notifier(request: Request):
+    return request.app.state.webhook_notifier
+
+def get_analysis_jobs_use_case(analysis_use_case: AnalysisUseCase = Depends(get_analysis_use_case), job_store: IJobStore = Depends(get_job_store), job_queue: JobQueue = Depends(get_job_queue), webhook_notifier: IWebhookNotifier = Depends(get_webhook_notifier)):
+    return AnalysisJobsUseCase(analysis_use_case=analysis_use_case, job_store=job_store, job_queue=job_queue, webhook_notifier=webhook_notifier)
@@ -0,0 +1,63 @@
+from typing import Dict, Optional
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class BodySizeLimitMiddleware:
+    """
+    Rejects request bodies larger than a limit while they are being received.
+
+    Requests whose Content-Length exceeds the limit are answered with 413 before
+    any byte of the body is read. Chunked or under-declared bodies are counted as
+    they arrive, and the request fails with 413 as soon as the count crosses the
+    limit, so an oversized upload is never fully spooled.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, path_limits: Optional[Dict[str, int]] = None):
+        """
+        Initializes the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            max_body_size (int): The default limit, in bytes.
+            path_limits (Optional[Dict[str, int]]): Limits for paths ending with the given
+                suffix (e.g. {"/batch": 100 MB}), overriding the default. Defaults to None.
+        """
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_limits = path_limits or {}
+
+    def _limit_for(self, path: str) -> int:
+        for suffix, limit in self.path_limits.items():
+            if path.rstrip("/").endswith(suffix):
+                return limit
+        return self.max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._limit_for(scope["path"])
+        detail = f"O corpo da requisição não pode ser maior que {limit // (1024 * 1024)} MB."
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"detail": detail},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,54 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import (
+    HTTP_DURATION,
+    HTTP_IN_FLIGHT,
+    HTTP_REQUESTS,
+    request_timings,
+    reset_request_timings,
+    start_request_timings,
+)
+
+class MetricsMiddleware:
+    """
+    Records the HTTP metrics and adds a Server-Timing header to every response.
+
+    The header lists the analysis stages timed while the response was being built
+    (see `app.core.metrics.stage`) plus the total time until the response started.
+    Stages that run after it (e.g. the tokens of a streaming response) only show
+    in the histograms. Requests are labeled with their route template, so ids in
+    paths do not create new series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        token = start_request_timings()
+        status_code = 500
+        HTTP_IN_FLIGHT.inc()
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings = [*request_timings(), ("total", (time.perf_counter() - start) * 1000)]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            reset_request_timings(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.inc(method=scope["method"], route=path, status=str(status_code))
+            HTTP_DURATION.observe(time.perf_counter() - start, method=scope["method"], route=path)
@@ -1,5 +1,54 @@
 from pydantic import BaseModel
+from typing import List, Optional
 
 class AnalysisResponse(BaseModel):
     category: str
-    details: str
\ No newline at end of file
+    details: str
+
+class BatchItemResult(BaseModel):
+    index: int
+    source: Optional[str] = None
+    category: Optional[str] = None
+    details: Optional[str] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+class BatchAnalysisResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    items: List[BatchItemResult]
+
+class ExecutorStatsResponse(BaseModel):
+    kind: str
+    max_workers: int
+    max_queue: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+
+class UpstreamStatsResponse(BaseModel):
+    circuit_state: str
+    circuit_opened: int
+    in_flight: int
+    max_concurrency: int
+    requests: int
+    retries: int
+    throttled: int
+    failures: int
+    rejected: int
+    rate_limited_seconds: float
+
+class HealthResponse(BaseModel):
+    status: str
+
+class JobResponse(BaseModel):
+    id: str
+    status: str
+    category: Optional[str] = None
+    details: Optional[str] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    created_at: float
+    updated_at: float
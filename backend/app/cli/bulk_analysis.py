@@ -0,0 +1,350 @@
+"""
+Analyses a mailbox offline, without going through the HTTP API.
+
+The input is read as a stream: an mbox file, a Maildir directory or a JSONL file
+with one email per line (the text in "text", or "title" and "body" like
+requests.jsonl, and an optional "id"). The cleaning and NLP preprocessing run in
+a process pool and the upstream calls run with bounded async concurrency, through
+the same AnalysisUseCase as the server, with the NLP adapter, local classifier,
+analysis cache and near-duplicate index built by the factories of app.core.state,
+so the cache entries are shared with the server.
+
+Results are appended to a JSONL file, one {"id", "category", "details"} object
+per email, and errors (including malformed JSONL lines) to <output>.errors.jsonl. The output is also the
+checkpoint: on restart, the ids already in it are skipped, so an interrupted run
+resumes where it stopped and failed emails are retried.
+
+Usage:
+    python -m app.cli.bulk_analysis inbox.mbox --output results.jsonl
+    python -m app.cli.bulk_analysis ~/Maildir --workers 4 --concurrency 32
+    python -m app.cli.bulk_analysis ../requests.jsonl --format jsonl
+"""
+import argparse
+import asyncio
+import email
+import json
+import mailbox
+import os
+import sys
+import time
+from email import policy
+from pathlib import Path
+from typing import Iterator, Optional, Set, Tuple, Union
+from app.adapters.ArchiveReaderAdapter import ArchiveReaderAdapter
+from app.adapters.EmailCleaner import EmailCleaner
+from app.adapters.TextReaderAdapter import TextReaderAdapter
+from app.core.config import settings
+from app.core.executor import CpuExecutor
+from app.core.nltk_loader import download_nltk_data
+from app.core.resilience import CircuitOpenError
+from app.core.singleflight import SingleFlight
+from app.core.state import create_analysis_cache, create_email_analyzer, create_near_duplicate_index, create_nlp_adapter
+from app.domain.entities.document import Document
+from app.domain.useCases.analysis import AnalysisUseCase
+
+FSYNC_EVERY = 100
+PROGRESS_SECONDS = 10.0
+
+
+def detect_format(path: Path) -> str:
+    if path.is_dir():
+        return "maildir"
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "mbox"
+
+
+def iter_records(path: Path, input_format: str) -> Iterator[Tuple[str, Union[str, None, ValueError]]]:
+    """
+    Reads the emails of the input one at a time.
+
+    Args:
+        path (Path): The mbox file, Maildir directory or JSONL file.
+        input_format (str): "mbox", "maildir" or "jsonl".
+
+    Yields:
+        Tuple[str, Union[str, None, ValueError]]: The id and the text of each email.
+        The text is None for messages without a plain text body, and the error for
+        JSONL lines that cannot be read, which are reported instead of stopping the run.
+    """
+    if input_format == "jsonl":
+        yield from _iter_jsonl(path)
+    elif input_format == "maildir":
+        yield from _iter_maildir(path)
+    else:
+        yield from _iter_mbox(path)
+
+
+def _iter_jsonl(path: Path) -> Iterator[Tuple[str, Union[str, None, ValueError]]]:
+    with open(path, encoding="utf-8", errors="replace") as records:
+        for number, line in enumerate(records, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield f"linha-{number}", ValueError(f"Linha JSON inválida: {e}")
+                continue
+            if not isinstance(record, dict):
+                yield f"linha-{number}", ValueError("Linha JSON inválida: esperado um objeto.")
+                continue
+            record_id = record.get("id") or record.get("request_id") or f"linha-{number}"
+            text = record.get("text")
+            if text is None and ("title" in record or "body" in record):
+                text = f"{record.get('title', '')}\n\n{record.get('body', '')}".strip()
+            yield str(record_id), text
+
+
+def _iter_mbox(path: Path) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Splits an mbox file at its "From " lines while reading it, so only the current
+    message is held in memory (`mailbox.mbox` indexes the whole file first).
+
+    Only a "From " line at the start of the file or after a blank line starts a
+    message, so body lines starting with "From " that were not escaped as ">From "
+    (mboxo files) stay in their message.
+    """
+    reader = ArchiveReaderAdapter()
+    index = 0
+    lines = None
+    after_blank = True
+    with open(path, "rb") as mbox:
+        for line in mbox:
+            if after_blank and line.startswith(b"From "):
+                if lines is not None:
+                    yield _message_record(reader, b"".join(lines), index)
+                    index += 1
+                lines = []
+            elif lines is not None:
+                lines.append(line)
+            after_blank = not line.strip()
+        if lines is not None:
+            yield _message_record(reader, b"".join(lines), index)
+
+
+def _iter_maildir(path: Path) -> Iterator[Tuple[str, Optional[str]]]:
+    reader = ArchiveReaderAdapter()
+    box = mailbox.Maildir(path, factory=None, create=False)
+    for key in sorted(box.iterkeys()):
+        with box.get_file(key) as message_file:
+            message = email.message_from_binary_file(message_file, policy=policy.compat32)
+        yield key, reader.message_text(message)
+
+
+def _message_record(reader: ArchiveReaderAdapter, raw: bytes, index: int) -> Tuple[str, Optional[str]]:
+    message = email.message_from_bytes(raw, policy=policy.compat32)
+    message_id = (message.get("Message-ID") or "").strip()
+    return message_id or f"mbox-{index}", reader.message_text(message)
+
+
+def load_checkpoint(output: Path) -> Set[str]:
+    """
+    Reads the ids already written to the output.
+
+    A line left incomplete by a crash is cut off, so the next results are not
+    appended to it.
+
+    Args:
+        output (Path): The output JSONL file.
+
+    Returns:
+        Set[str]: The ids of the emails already analysed.
+    """
+    done: Set[str] = set()
+    if not output.exists():
+        return done
+    valid_size = 0
+    with open(output, "rb") as results:
+        for line in results:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError, TypeError):
+                break
+            valid_size += len(line)
+    if valid_size < output.stat().st_size:
+        with open(output, "r+b") as results:
+            results.truncate(valid_size)
+    return done
+
+
+class ResultWriter:
+    """
+    Appends the results and errors as JSONL, syncing them to disk every FSYNC_EVERY lines.
+    """
+
+    def __init__(self, output: Path):
+        self.results = open(output, "a", encoding="utf-8")
+        self.errors = open(output.with_name(output.name + ".errors.jsonl"), "a", encoding="utf-8")
+        self._unsynced = 0
+
+    def write(self, record: dict) -> None:
+        target = self.errors if "error" in record else self.results
+        target.write(json.dumps(record, ensure_ascii=False) + "\n")
+        target.flush()
+        self._unsynced += 1
+        if self._unsynced >= FSYNC_EVERY:
+            self.sync()
+
+    def sync(self) -> None:
+        for target in (self.results, self.errors):
+            target.flush()
+            os.fsync(target.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        self.sync()
+        self.results.close()
+        self.errors.close()
+
+
+class Progress:
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.skipped = 0
+        self.succeeded = 0
+        self.failed = 0
+        self._reported_at = self.start
+
+    def count(self, record: dict) -> None:
+        if "error" in record:
+            self.failed += 1
+        else:
+            self.succeeded += 1
+        now = time.perf_counter()
+        if now - self._reported_at >= PROGRESS_SECONDS:
+            self._reported_at = now
+            print(self.summary(), file=sys.stderr)
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        done = self.succeeded + self.failed
+        return (
+            f"{done} emails em {elapsed:.1f} s ({done / elapsed if elapsed else 0:.1f} docs/s): "
+            f"{self.succeeded} analisados, {self.failed} com erro, {self.skipped} já no checkpoint"
+        )
+
+
+async def analyse_record(use_case: AnalysisUseCase, record_id: str, text: Union[str, None, ValueError]) -> dict:
+    """
+    Analyses one email.
+
+    An input error from `iter_records` is reported as the error of the email.
+
+    Returns:
+        dict: The id with the category and details, or with the error.
+
+    Raises:
+        CircuitOpenError: If the upstream circuit is open, which stops the run.
+    """
+    try:
+        if isinstance(text, Exception):
+            raise text
+        if not text or not text.strip():
+            raise ValueError("Email sem texto.")
+        result = await use_case.analyse_document(Document(text=text))
+        return {"id": record_id, "category": result.category, "details": result.details}
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        return {"id": record_id, "error": str(e), "error_type": e.__class__.__name__}
+
+
+async def run(args: argparse.Namespace) -> int:
+    path = Path(args.input)
+    output = Path(args.output)
+    done = load_checkpoint(output)
+
+    executor = CpuExecutor(kind="process", max_workers=args.workers, max_queue=args.concurrency)
+    email_analyzer = create_email_analyzer()
+    analysis_cache = create_analysis_cache()
+    near_duplicate_index = create_near_duplicate_index()
+    use_case = AnalysisUseCase(
+        text_reader_adapter=TextReaderAdapter(),
+        nlp_adapter=create_nlp_adapter(),
+        email_analyzer=email_analyzer,
+        analysis_cache=analysis_cache,
+        executor=executor,
+        single_flight=SingleFlight(),
+        email_cleaner=EmailCleaner() if settings.EMAIL_CLEANER_ENABLED else None,
+        inline_max_chars=0,
+        near_duplicate_index=near_duplicate_index,
+    )
+    writer = ResultWriter(output)
+    progress = Progress()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 2)
+    stopped = asyncio.Event()
+
+    async def worker() -> None:
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                if stopped.is_set():
+                    continue
+                try:
+                    record = await analyse_record(use_case, *item)
+                except CircuitOpenError as e:
+                    if not stopped.is_set():
+                        print(f"Execução interrompida: {e} Rode novamente para continuar do checkpoint.", file=sys.stderr)
+                        stopped.set()
+                    continue
+                writer.write(record)
+                progress.count(record)
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.concurrency)]
+    enqueued = 0
+    try:
+        for record_id, text in iter_records(path, args.format or detect_format(path)):
+            if stopped.is_set():
+                break
+            if record_id in done:
+                progress.skipped += 1
+                continue
+            done.add(record_id)
+            await queue.put((record_id, text))
+            enqueued += 1
+            if args.limit and enqueued >= args.limit:
+                break
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        writer.close()
+        executor.shutdown()
+        await email_analyzer.aclose()
+        if analysis_cache is not None:
+            analysis_cache.close()
+        if near_duplicate_index is not None:
+            near_duplicate_index.close()
+
+    print(progress.summary())
+    return 2 if stopped.is_set() else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Arquivo mbox, diretório Maildir ou arquivo JSONL")
+    parser.add_argument("--format", choices=["mbox", "maildir", "jsonl"], help="Formato da entrada (padrão: detectado pelo caminho)")
+    parser.add_argument("--output", default="bulk_results.jsonl", help="Arquivo JSONL de resultados e checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos do pré-processamento")
+    parser.add_argument("--concurrency", type=int, default=16, help="Emails em análise ao mesmo tempo")
+    parser.add_argument("--limit", type=int, default=0, help="Analisa no máximo este número de novos emails (0: sem limite)")
+    args = parser.parse_args(argv)
+
+    download_nltk_data(
+        data_dir=settings.NLTK_DATA_DIR,
+        offline=settings.NLTK_OFFLINE,
+        tokenizer=settings.NLP_TOKENIZER,
+        verify_ssl=settings.NLTK_VERIFY_SSL,
+    )
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Trains the local fast-path classifier from a labeled JSONL corpus.
+
+Each line must be a JSON object with the email text in "text" and its category
+in "category" (or "label"). The texts are cleaned with EmailCleaner and
+preprocessed with NLPAdapter, exactly as they are at analysis time; use
+--no-clean for servers running with EMAIL_CLEANER_ENABLED=false.
+
+Usage:
+    python -m app.cli.train_classifier corpus.jsonl --output classifier.npz
+"""
+import argparse
+import json
+import sys
+from app.adapters.LocalClassifier import LocalClassifier
+from app.adapters.EmailCleaner import EmailCleaner
+from app.adapters.NLPAdapter import NLPAdapter
+from app.core.nltk_loader import download_nltk_data
+
+
+def read_corpus(path: str) -> tuple:
+    """
+    Reads the texts and categories of a labeled JSONL corpus.
+
+    Args:
+        path (str): The path of the JSONL file.
+
+    Returns:
+        tuple: The list of texts and the list of categories.
+
+    Raises:
+        ValueError: If a line has no text or no category.
+    """
+    texts, categories = [], []
+    with open(path, encoding="utf-8") as corpus:
+        for number, line in enumerate(corpus, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.get("text")
+            category = record.get("category") or record.get("label")
+            if not text or not category:
+                raise ValueError(f"Linha {number} sem 'text' ou 'category'.")
+            texts.append(text)
+            categories.append(category)
+    return texts, categories
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Treina o classificador local a partir de um corpus JSONL rotulado.")
+    parser.add_argument("corpus", help="Arquivo JSONL com as chaves 'text' e 'category'")
+    parser.add_argument("--output", default="classifier.npz", help="Caminho do modelo treinado")
+    parser.add_argument("--labels", nargs=2, default=["Improdutivo", "Produtivo"], metavar=("NEGATIVA", "POSITIVA"))
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--no-clean", action="store_true", help="Não remove citações, rodapés e assinaturas antes do pré-processamento")
+    args = parser.parse_args(argv)
+
+    download_nltk_data()
+    nlp_adapter = NLPAdapter()
+    texts, categories = read_corpus(args.corpus)
+    if not args.no_clean:
+        email_cleaner = EmailCleaner()
+        texts = [email_cleaner.clean(text)[0] for text in texts]
+    processed = [nlp_adapter.preprocess(text) for text in texts]
+
+    classifier = LocalClassifier.train(processed, categories, labels=args.labels, epochs=args.epochs)
+    classifier.save(args.output)
+
+    correct = sum(classifier.predict(text)[0] == category for text, category in zip(processed, categories))
+    print(f"{len(texts)} emails, acurácia no corpus: {correct / len(texts):.2%}, modelo salvo em {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
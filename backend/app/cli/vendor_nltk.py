@@ -0,0 +1,81 @@
+"""
+Vendors the NLTK resources used by the NLP pipeline into a local data directory.
+
+Only the files read at runtime are copied (the Portuguese, English and Spanish
+stopword lists, the RSLP rules and, for the "punkt" tokenizer, the Portuguese
+Punkt tables), so the directory is a few dozen KB instead of the full NLTK
+packages. Resources are
+taken from the local NLTK data path when available and downloaded otherwise.
+Point NLTK_DATA_DIR at the output and set NLTK_OFFLINE=true to run without
+network access.
+
+Usage:
+    python -m app.cli.vendor_nltk --output nltk_data
+    python -m app.cli.vendor_nltk --output nltk_data --tokenizer regex --offline
+    python -m app.cli.vendor_nltk --output nltk_data --no-verify-ssl
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+import nltk
+from app.core.nltk_loader import NLTK_RESOURCE_FILES, download_nltk_data, required_resources
+
+
+def vendor(output: str, tokenizer: str = "punkt", offline: bool = False, verify_ssl: bool = True) -> int:
+    """
+    Copies the required NLTK files into `output`.
+
+    Args:
+        output (str): The target data directory.
+        tokenizer (str): The tokenizer of the NLPAdapter. Defaults to "punkt".
+        offline (bool): If True, only the local NLTK data path is used. Defaults to False.
+        verify_ssl (bool): Whether downloads verify the server certificate. Defaults to True.
+
+    Returns:
+        int: The total size of the copied files, in bytes.
+
+    Raises:
+        ServiceError: If a resource is missing and cannot be downloaded.
+    """
+    target = Path(output)
+    resources = required_resources(tokenizer)
+    total = 0
+    with tempfile.TemporaryDirectory() as download_dir:
+        try:
+            download_nltk_data(data_dir=download_dir, offline=offline, tokenizer=tokenizer, verify_ssl=verify_ssl)
+            for resource, path in resources.items():
+                source = Path(nltk.data.find(path))
+                destination = target / path
+                destination.mkdir(parents=True, exist_ok=True)
+                for name in NLTK_RESOURCE_FILES[resource]:
+                    shutil.copyfile(source / name, destination / name)
+                    total += (destination / name).stat().st_size
+        finally:
+            if download_dir in nltk.data.path:
+                nltk.data.path.remove(download_dir)
+    return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Copia os recursos NLTK usados pela aplicação para um diretório local.")
+    parser.add_argument("--output", default="nltk_data", help="Diretório de destino (use como NLTK_DATA_DIR)")
+    parser.add_argument("--tokenizer", choices=["regex", "punkt"], default="punkt",
+                        help="Tokenizador usado em produção; 'regex' dispensa os modelos Punkt")
+    parser.add_argument("--offline", action="store_true", help="Não baixa nada, apenas copia do NLTK data local")
+    parser.add_argument("--no-verify-ssl", dest="verify_ssl", action="store_false",
+                        help="Não verifica o certificado nos downloads (apenas atrás de proxy que intercepta TLS)")
+    args = parser.parse_args(argv)
+
+    try:
+        total = vendor(args.output, tokenizer=args.tokenizer, offline=args.offline, verify_ssl=args.verify_ssl)
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(f"Recursos NLTK copiados para {args.output} ({total / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import codecs
+
+# UTF-32 LE starts with the UTF-16 LE BOM, so it is checked first.
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+_SAMPLE_SIZE = 4096
+
+def decode_text(content: bytes, partial: bool = False) -> str:
+    """
+    Decodes the bytes of a text file, detecting its encoding.
+
+    The checks go from the cheapest and most certain to the most lenient:
+
+    1. A byte order mark selects UTF-8, UTF-16 or UTF-32, and is dropped.
+    2. Text with a NUL in most of its even or odd bytes is UTF-16 without a BOM.
+    3. Strict UTF-8, which also covers plain ASCII.
+    4. cp1252, the Windows superset of ISO-8859-1 used by Outlook and Notepad
+       exports: its 0x80-0x9F bytes are curly quotes, dashes and the euro sign,
+       which ISO-8859-1 would turn into control characters.
+    5. ISO-8859-1, which accepts any byte (cp1252 leaves five bytes undefined).
+
+    Args:
+        content (bytes): The raw bytes.
+        partial (bool): Whether the content is only the first bytes of the file. A
+            character cut at the end is then dropped, instead of failing the UTF-8
+            check or being replaced. Defaults to False.
+
+    Returns:
+        str: The decoded text.
+    """
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return _decode(content[len(bom):], encoding, "replace", partial)
+
+    utf16 = _utf16_without_bom(content[:_SAMPLE_SIZE])
+    if utf16:
+        return _decode(content, utf16, "replace", partial)
+
+    for encoding in ("utf-8", "cp1252"):
+        try:
+            return _decode(content, encoding, "strict", partial)
+        except UnicodeDecodeError:
+            pass
+    return content.decode("iso-8859-1")
+
+def _decode(content: bytes, encoding: str, errors: str, partial: bool) -> str:
+    if not partial:
+        return content.decode(encoding, errors=errors)
+    # Without final=True, the decoder keeps an incomplete trailing character instead of decoding it.
+    return codecs.getincrementaldecoder(encoding)(errors=errors).decode(content, final=False)
+
+def _utf16_without_bom(sample: bytes) -> str:
+    """
+    Recognizes UTF-16 text without a BOM by its NUL bytes: in Latin text, the high
+    byte of almost every code unit is zero.
+
+    Returns:
+        str: "utf-16-le" or "utf-16-be", or an empty string if the sample does not look like UTF-16.
+    """
+    if len(sample) < 4 or b"\x00" not in sample:
+        return ""
+    half = len(sample) // 2
+    even_nuls = sample[0::2].count(0)
+    odd_nuls = sample[1::2].count(0)
+    if odd_nuls > half * 0.7 and even_nuls < half * 0.1:
+        return "utf-16-le"
+    if even_nuls > half * 0.7 and odd_nuls < half * 0.1:
+        return "utf-16-be"
+    return ""
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     """
@@ -9,6 +9,96 @@ class Settings(BaseSettings):
         API_URL (Optional[str]): URL endpoint for the API. Defaults to "https://router.huggingface.co/nebius/v1/chat/completions".
         DEBUG (bool): Flag to enable or disable debug mode. Defaults to True.
         CORS_ORIGINS (str): Allowed origins for CORS. Defaults to "*".
+        HTTP_TIMEOUT (float): Timeout in seconds for upstream HTTP calls. Defaults to 60.0.
+        HTTP_MAX_CONNECTIONS (int): Maximum number of pooled upstream connections. Defaults to 100.
+        HTTP_MAX_KEEPALIVE_CONNECTIONS (int): Maximum number of idle keep-alive connections. Defaults to 20.
+        HTTP_KEEPALIVE_EXPIRY (float): Seconds an idle connection is kept open. Defaults to 30.0.
+        HTTP_MAX_CONNECTIONS_PER_HOST (int): Maximum number of in-flight requests per upstream host. Defaults to 20.
+        HTTP2 (bool): Flag to use HTTP/2 when the `h2` package is installed. Defaults to True.
+        ANALYSIS_MODE (str): "two_calls" to classify and suggest in separate upstream calls, or "combined"
+            to get both in a single JSON completion, falling back to two calls if parsing fails. Defaults to "two_calls".
+        CACHE_ENABLED (bool): Flag to enable the analysis result cache. Defaults to True.
+        CACHE_MAX_ENTRIES (int): Maximum number of analyses kept in memory. Defaults to 10000.
+        CACHE_TTL_SECONDS (float): Time in seconds a cached analysis stays valid. Defaults to 86400.
+        CACHE_SQLITE_PATH (Optional[str]): Path of the SQLite database for the on-disk tier. Defaults to None (disabled).
+        CACHE_SQLITE_MAX_ENTRIES (int): Maximum number of analyses kept on disk. Defaults to 100000.
+        NEAR_DUPLICATE_ENABLED (bool): Whether the category of a similar, previously analysed email is reused
+            (MinHash LSH over the shingles of the preprocessed text). The reuse is approximate, so it is opt-in. Defaults to False.
+        NEAR_DUPLICATE_THRESHOLD (float): Minimum estimated Jaccard similarity of the word bigrams to reuse
+            an analysis. Defaults to 0.6.
+        NEAR_DUPLICATE_PERMUTATIONS (int): Number of hash functions of the MinHash signatures. Defaults to 64.
+        NEAR_DUPLICATE_MAX_ENTRIES (int): Maximum number of emails kept in the index. Defaults to 20000.
+        NEAR_DUPLICATE_SQLITE_PATH (Optional[str]): Path of the SQLite database that persists the index. Defaults to None (memory only).
+        NEAR_DUPLICATE_REUSE_REPLY (bool): Whether the suggested response is reused too, instead of only the category.
+            Defaults to False.
+        SINGLE_FLIGHT_ENABLED (bool): Whether concurrent analyses of the same text share a single upstream call. Defaults to True.
+        BATCH_MAX_ITEMS (int): Maximum number of documents accepted by the batch endpoint. Defaults to 1000.
+        BATCH_MAX_CONCURRENCY (int): Maximum number of documents of a batch analysed at the same time. Defaults to 8.
+        ARCHIVE_MAX_UNCOMPRESSED_SIZE (int): Maximum total uncompressed size, in bytes, of the members of a ZIP archive
+            of a batch. Checked against the archive directory before anything is decompressed. Defaults to 200 MB.
+        LOCAL_CLASSIFIER_PATH (Optional[str]): Path of the local classifier trained with `app.cli.train_classifier`.
+            Defaults to None (every email is classified by the LLM).
+        LOCAL_CLASSIFIER_THRESHOLD (float): Minimum probability for the local classification to be used
+            instead of the LLM. Defaults to 0.9.
+        EXECUTOR_KIND (str): "thread" or "process" pool for text extraction and NLP preprocessing. Defaults to "thread".
+        EXECUTOR_MAX_WORKERS (Optional[int]): Number of workers of the pool. Defaults to None (number of CPUs).
+        EXECUTOR_MAX_QUEUE (int): Maximum number of calls waiting for a worker before answering 503. Defaults to 64.
+        EXECUTOR_INLINE_MAX_CHARS (int): Texts up to this length are preprocessed inline instead of in the pool. Defaults to 2000.
+        NLP_TOKENIZER (str): "regex" for the lightweight tokenizer or "punkt" for NLTK's word_tokenize. Defaults to "regex".
+        NLP_STEM_CACHE_SIZE (int): Maximum number of memoized stems. Defaults to 50000.
+        NLP_LANGUAGE_DETECTION (bool): Whether English and Spanish emails are detected and kept out of the Portuguese stopwords and stemmer. Defaults to True.
+        NLP_FOREIGN_TEXT (str): "stem" to remove the stopwords and stem English and Spanish emails with Snowball, or "raw" to send their normalized words to the LLM as they are. Defaults to "stem".
+        EMAIL_CLEANER_ENABLED (bool): Whether quoted replies, forwarded headers, legal footers and signatures are
+            removed before the NLP preprocessing. Defaults to True.
+        PROMPT_EMAIL_MAX_TOKENS (int): Estimated token budget of the email inside the prompts; longer emails keep
+            their head and tail. 0 disables it. Defaults to 1000.
+        CLASSIFY_MAX_TOKENS (int): Completion tokens of the classification call, which only answers the category. Defaults to 8.
+        PROMPTS_PATH (Optional[str]): JSON file with the prompts and categories. Defaults to None (app/core/prompts.json).
+        PROMPTS_RELOAD_INTERVAL (float): Minimum seconds between checks of the prompts file for changes. 0 disables
+            the reload. Defaults to 2.0.
+        CLASSIFY_MODEL (str): Model of the classification calls, usually small and fast.
+            Defaults to "meta-llama/Llama-3.1-8B-Instruct".
+        CLASSIFY_API_URL (Optional[str]): Endpoint of the classification model. Defaults to None (API_URL).
+        CLASSIFY_TIMEOUT (Optional[float]): Timeout of each classification attempt, in seconds. Defaults to 10.0.
+        CLASSIFY_FALLBACK (Optional[str]): Route ("classify" or "suggest") tried when the classification model fails
+            or answers something other than a category. Defaults to "suggest".
+        SUGGEST_MODEL (str): Model of the suggested responses and of the combined calls.
+            Defaults to "deepseek-ai/DeepSeek-V3-0324".
+        SUGGEST_API_URL (Optional[str]): Endpoint of the suggestion model. Defaults to None (API_URL).
+        SUGGEST_TIMEOUT (Optional[float]): Timeout of each suggestion attempt, in seconds. Defaults to None (HTTP_TIMEOUT).
+        SUGGEST_FALLBACK (Optional[str]): Route tried when the suggestion model fails. Defaults to None.
+        CANNED_REPLIES_ENABLED (bool): Whether categories with a `canned_reply` in the prompts file (e.g. "Improdutivo")
+            get it as the suggested response, without an upstream call. Defaults to True.
+        UPSTREAM_RATE_LIMIT (float): Maximum requests per second to the API (token bucket). 0 disables it. Defaults to 0.
+        UPSTREAM_RATE_BURST (int): Requests allowed at once above the rate. Defaults to 10.
+        UPSTREAM_RATE_STATE_PATH (Optional[str]): SQLite database that shares the rate limiter between the workers
+            of a host. Defaults to None (one limiter per process).
+        UPSTREAM_MAX_CONCURRENCY (int): Maximum requests in flight to the API. Defaults to 32.
+        UPSTREAM_MAX_RETRIES (int): Retries of connection errors and 429/5xx responses. Defaults to 3.
+        UPSTREAM_RETRY_BASE_DELAY (float): Base of the jittered exponential backoff, in seconds. Defaults to 0.5.
+        UPSTREAM_RETRY_MAX_DELAY (float): Maximum delay between attempts, including Retry-After, in seconds. Defaults to 20.0.
+        UPSTREAM_CIRCUIT_FAILURE_THRESHOLD (int): Consecutive failed calls, after their retries, that open the circuit breaker.
+            429 responses do not count as failures. Defaults to 5.
+        UPSTREAM_CIRCUIT_RESET_SECONDS (float): Seconds the circuit stays open before a probe request. Defaults to 30.0.
+        JOBS_CONCURRENCY (int): Number of workers running asynchronous analysis jobs. Defaults to 4.
+        JOBS_MAX_QUEUE (int): Maximum number of jobs waiting for a worker before answering 503. Defaults to 1000.
+        JOBS_STORE (str): "memory" or "sqlite" store of the job results. Defaults to "memory".
+        JOBS_SQLITE_PATH (str): Path of the SQLite job store. Defaults to "jobs.db".
+        JOBS_MAX_ENTRIES (int): Maximum number of jobs kept by the memory store. Defaults to 10000.
+        JOBS_TTL_SECONDS (float): Time in seconds a job result is kept. Defaults to 86400 (24 hours).
+        JOBS_WEBHOOK_TIMEOUT (float): Timeout in seconds of each webhook notification attempt. Defaults to 10.0.
+        JOBS_WEBHOOK_ALLOWED_HOSTS (Optional[str]): Comma-separated hosts that webhooks may notify; an entry starting with "."
+            also allows its subdomains. If unset, any host resolving only to public addresses is allowed. Defaults to None.
+        MAX_REQUEST_BODY_SIZE (int): Maximum size of a request body in bytes, enforced while it is received. Defaults to 11 MB
+            (one 10 MB file plus the multipart overhead).
+        MAX_BATCH_BODY_SIZE (int): Maximum size of a batch request body in bytes. Defaults to 100 MB.
+        EXTRACT_MAX_CHARS (int): Character budget of the text extracted from files; PDF pages past it are not read. 0 disables it. Defaults to 20000.
+        NLTK_DATA_DIR (Optional[str]): Directory searched first for NLTK data, e.g. the output of `python -m app.cli.vendor_nltk`. Defaults to None.
+        NLTK_OFFLINE (bool): If True, NLTK data is never downloaded and startup fails when a resource is missing. Defaults to False.
+        NLTK_VERIFY_SSL (bool): Whether NLTK downloads verify the server certificate. Only disable it behind
+            a proxy that intercepts TLS. Defaults to True.
+        METRICS_ENABLED (bool): Whether /metrics and the Server-Timing header are enabled. Defaults to True.
+        WARMUP_UPSTREAM (bool): Whether the startup warm-up opens a connection to the API before reporting readiness. Defaults to True.
     Config:
         env_file (str): Path to the environment file. Defaults to ".env".
         extra (str): Specifies handling of extra fields. Set to "allow".
@@ -19,6 +109,77 @@ class Settings(BaseSettings):
     API_URL: Optional[str] = "https://router.huggingface.co/nebius/v1/chat/completions"
     DEBUG: Optional[bool] = True
     CORS_ORIGINS: Optional[str] = "*"
+    HTTP_TIMEOUT: Optional[float] = 60.0
+    HTTP_MAX_CONNECTIONS: Optional[int] = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: Optional[int] = 20
+    HTTP_KEEPALIVE_EXPIRY: Optional[float] = 30.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: Optional[int] = 20
+    HTTP2: Optional[bool] = True
+    ANALYSIS_MODE: Optional[Literal["two_calls", "combined"]] = "two_calls"
+    CACHE_ENABLED: Optional[bool] = True
+    CACHE_MAX_ENTRIES: Optional[int] = 10000
+    CACHE_TTL_SECONDS: Optional[float] = 86400.0
+    CACHE_SQLITE_PATH: Optional[str] = None
+    CACHE_SQLITE_MAX_ENTRIES: Optional[int] = 100000
+    NEAR_DUPLICATE_ENABLED: Optional[bool] = False
+    NEAR_DUPLICATE_THRESHOLD: Optional[float] = 0.6
+    NEAR_DUPLICATE_PERMUTATIONS: Optional[int] = 64
+    NEAR_DUPLICATE_MAX_ENTRIES: Optional[int] = 20000
+    NEAR_DUPLICATE_SQLITE_PATH: Optional[str] = None
+    NEAR_DUPLICATE_REUSE_REPLY: Optional[bool] = False
+    SINGLE_FLIGHT_ENABLED: Optional[bool] = True
+    BATCH_MAX_ITEMS: Optional[int] = 1000
+    BATCH_MAX_CONCURRENCY: Optional[int] = 8
+    ARCHIVE_MAX_UNCOMPRESSED_SIZE: Optional[int] = 200 * 1024 * 1024
+    LOCAL_CLASSIFIER_PATH: Optional[str] = None
+    LOCAL_CLASSIFIER_THRESHOLD: Optional[float] = 0.9
+    EXECUTOR_KIND: Optional[Literal["thread", "process"]] = "thread"
+    EXECUTOR_MAX_WORKERS: Optional[int] = None
+    EXECUTOR_MAX_QUEUE: Optional[int] = 64
+    EXECUTOR_INLINE_MAX_CHARS: Optional[int] = 2000
+    NLP_TOKENIZER: Optional[Literal["regex", "punkt"]] = "regex"
+    NLP_STEM_CACHE_SIZE: Optional[int] = 50000
+    NLP_LANGUAGE_DETECTION: Optional[bool] = True
+    NLP_FOREIGN_TEXT: Optional[Literal["stem", "raw"]] = "stem"
+    EMAIL_CLEANER_ENABLED: Optional[bool] = True
+    PROMPT_EMAIL_MAX_TOKENS: Optional[int] = 1000
+    CLASSIFY_MAX_TOKENS: Optional[int] = 8
+    PROMPTS_PATH: Optional[str] = None
+    PROMPTS_RELOAD_INTERVAL: Optional[float] = 2.0
+    CLASSIFY_MODEL: Optional[str] = "meta-llama/Llama-3.1-8B-Instruct"
+    CLASSIFY_API_URL: Optional[str] = None
+    CLASSIFY_TIMEOUT: Optional[float] = 10.0
+    CLASSIFY_FALLBACK: Optional[str] = "suggest"
+    SUGGEST_MODEL: Optional[str] = "deepseek-ai/DeepSeek-V3-0324"
+    SUGGEST_API_URL: Optional[str] = None
+    SUGGEST_TIMEOUT: Optional[float] = None
+    SUGGEST_FALLBACK: Optional[str] = None
+    CANNED_REPLIES_ENABLED: Optional[bool] = True
+    UPSTREAM_RATE_LIMIT: Optional[float] = 0.0
+    UPSTREAM_RATE_BURST: Optional[int] = 10
+    UPSTREAM_RATE_STATE_PATH: Optional[str] = None
+    UPSTREAM_MAX_CONCURRENCY: Optional[int] = 32
+    UPSTREAM_MAX_RETRIES: Optional[int] = 3
+    UPSTREAM_RETRY_BASE_DELAY: Optional[float] = 0.5
+    UPSTREAM_RETRY_MAX_DELAY: Optional[float] = 20.0
+    UPSTREAM_CIRCUIT_FAILURE_THRESHOLD: Optional[int] = 5
+    UPSTREAM_CIRCUIT_RESET_SECONDS: Optional[float] = 30.0
+    JOBS_CONCURRENCY: Optional[int] = 4
+    JOBS_MAX_QUEUE: Optional[int] = 1000
+    JOBS_STORE: Literal["memory", "sqlite"] = "memory"
+    JOBS_SQLITE_PATH: Optional[str] = "jobs.db"
+    JOBS_MAX_ENTRIES: Optional[int] = 10000
+    JOBS_TTL_SECONDS: Optional[float] = 86400.0
+    JOBS_WEBHOOK_TIMEOUT: Optional[float] = 10.0
+    JOBS_WEBHOOK_ALLOWED_HOSTS: Optional[str] = None
+    MAX_REQUEST_BODY_SIZE: Optional[int] = 11 * 1024 * 1024
+    MAX_BATCH_BODY_SIZE: Optional[int] = 100 * 1024 * 1024
+    EXTRACT_MAX_CHARS: Optional[int] = 20000
+    NLTK_DATA_DIR: Optional[str] = None
+    NLTK_OFFLINE: Optional[bool] = False
+    NLTK_VERIFY_SSL: Optional[bool] = True
+    METRICS_ENABLED: Optional[bool] = True
+    WARMUP_UPSTREAM: Optional[bool] = True
 
     class Config:
         env_file = ".env"
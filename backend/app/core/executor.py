@@ -0,0 +1,139 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import nltk
+from app.api.decorators.exception import ServiceUnavailableError
+
+_worker_adapters: Dict[Tuple[type, tuple], Any] = {}
+
+
+def _init_worker(nltk_paths: List[str]) -> None:
+    """
+    Gives a spawned worker the NLTK data path of the parent, which may include a
+    directory added at startup (NLTK_DATA_DIR) that the worker would not know about.
+    """
+    nltk.data.path[:0] = [path for path in nltk_paths if path not in nltk.data.path]
+
+
+def _invoke_in_worker(adapter_cls: type, init_kwargs: tuple, method: str, args: tuple) -> Any:
+    """
+    Runs an adapter method inside a worker process.
+
+    Each worker builds one instance per adapter class and configuration (the
+    constructor arguments of the adapter in the parent) and reuses it, so heavy
+    constructors (stopwords, stemmer rules) run once per process instead of the
+    adapter being pickled on every call.
+    """
+    key = (adapter_cls, init_kwargs)
+    adapter = _worker_adapters.get(key)
+    if adapter is None:
+        adapter = adapter_cls(**dict(init_kwargs))
+        _worker_adapters[key] = adapter
+    return getattr(adapter, method)(*args)
+
+
+class CpuExecutor:
+    """
+    Runs the CPU-bound stages (text extraction, NLP preprocessing) off the event loop.
+
+    Work goes to a thread or process pool. At most `max_workers` calls run at once and
+    at most `max_queue` more wait for a worker; beyond that, calls are rejected with
+    ServiceUnavailableError (HTTP 503) instead of piling up behind a large PDF.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None, max_queue: int = 64):
+        """
+        Initializes the executor.
+
+        Worker processes are spawned rather than forked, so they never inherit
+        half-initialized state (e.g. NLTK lazy loaders) from the server threads.
+
+        Args:
+            kind (str): "thread" or "process". Defaults to "thread".
+            max_workers (Optional[int]): Number of workers. Defaults to the number of CPUs.
+            max_queue (int): Maximum number of calls waiting for a worker. Defaults to 64.
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Tipo de executor não suportado: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._pool: Executor = (
+            ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(list(nltk.data.path),),
+            )
+            if kind == "process"
+            else ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cpu")
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, adapter: Any, method: str, *args: Any) -> Any:
+        """
+        Runs `adapter.method(*args)` in the pool and waits for the result.
+
+        In process mode the adapter itself is not sent to the worker: the worker
+        uses its own instance of the same class, built with the constructor
+        arguments the adapter exposes in `init_kwargs` (none if it has no such
+        attribute), so both paths produce the same output.
+
+        Args:
+            adapter (Any): The adapter whose method is called.
+            method (str): The name of the method.
+            *args (Any): The arguments of the method.
+
+        Returns:
+            Any: The return value of the method.
+
+        Raises:
+            ServiceUnavailableError: If the queue is full.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceUnavailableError("Servidor sobrecarregado. Tente novamente em instantes.")
+            self._pending += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            if self.kind == "process":
+                init_kwargs = tuple(sorted(getattr(adapter, "init_kwargs", {}).items()))
+                return await loop.run_in_executor(self._pool, _invoke_in_worker, type(adapter), init_kwargs, method, args)
+            return await loop.run_in_executor(self._pool, getattr(adapter, method), *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the executor counters.
+
+        Returns:
+            dict: The pool kind and size, the calls running and waiting (queue depth),
+            and the number of completed and rejected calls.
+        """
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": min(self._pending, self.max_workers),
+                "queued": max(0, self._pending - self.max_workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Shuts down the pool, waiting for the running calls to finish.
+        """
+        self._pool.shutdown(wait=True, cancel_futures=True)
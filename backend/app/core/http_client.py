@@ -0,0 +1,111 @@
+import asyncio
+import httpx
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.logger import logger
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """
+    Wraps a response stream so the per-host slot is only released once the
+    response body has been fully consumed or closed.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport that caps the number of in-flight requests per host.
+
+    Requests above the cap wait for a free slot instead of opening new
+    connections, so a burst of analyses cannot exhaust the connection pool
+    of a single upstream.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore_for(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_per_host)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._semaphore_for(request.url.host)
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, semaphore)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(
+    timeout: Optional[float] = None,
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    max_connections_per_host: Optional[int] = None,
+    http2: Optional[bool] = None,
+) -> httpx.AsyncClient:
+    """
+    Creates the shared, pooled HTTPX client used for the upstream LLM calls.
+
+    Every argument defaults to its counterpart in `settings`. HTTP/2 is only
+    enabled when requested and the optional `h2` package is installed,
+    otherwise the client falls back to HTTP/1.1 with keep-alive pooling.
+
+    Returns:
+        httpx.AsyncClient: A client meant to live for the whole application lifespan.
+    """
+    use_http2 = settings.HTTP2 if http2 is None else http2
+    if use_http2 and not _http2_available():
+        logger.warning("HTTP/2 solicitado, mas o pacote 'h2' não está instalado. Usando HTTP/1.1.")
+        use_http2 = False
+
+    limits = httpx.Limits(
+        max_connections=max_connections or settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=max_keepalive_connections or settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=keepalive_expiry or settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    transport = HostLimitedTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=use_http2),
+        max_per_host=max_connections_per_host or settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(timeout or settings.HTTP_TIMEOUT),
+    )
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Awaitable, Callable, List
+from app.api.decorators.exception import ServiceUnavailableError
+from app.core.logger import logger
+
+class JobQueue:
+    """
+    A bounded queue drained by a fixed pool of asyncio workers.
+
+    Each entry is a zero-argument coroutine function. At most `concurrency` of them
+    run at once; submissions beyond `max_size` waiting entries are rejected with
+    ServiceUnavailableError (HTTP 503) so bursts are absorbed without growing without bound.
+    """
+
+    def __init__(self, concurrency: int = 4, max_size: int = 1000):
+        """
+        Initializes the queue. Workers only start with `start()`.
+
+        Args:
+            concurrency (int): Number of workers. Defaults to 4.
+            max_size (int): Maximum number of entries waiting for a worker. Defaults to 1000.
+        """
+        self.concurrency = concurrency
+        self.max_size = max_size
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """
+        Starts the workers in the running event loop.
+        """
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    def submit(self, job: Callable[[], Awaitable[None]]) -> None:
+        """
+        Enqueues a job without waiting for it.
+
+        Args:
+            job (Callable[[], Awaitable[None]]): The coroutine function to run.
+
+        Raises:
+            ServiceUnavailableError: If the queue is full.
+        """
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ServiceUnavailableError("Fila de análises cheia. Tente novamente em instantes.")
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await job()
+            except Exception as e:
+                logger.error("Erro não tratado em tarefa assíncrona: %s", e)
+            finally:
+                self._queue.task_done()
+
+    async def stop(self) -> None:
+        """
+        Cancels the workers. Jobs still waiting in the queue are dropped.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
@@ -0,0 +1,214 @@
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Stage durations of the current request, in milliseconds, rendered as the Server-Timing header.
+_request_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self._samples()]
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())
+            ]
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())
+            ]
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: the count of each bucket (non-cumulative, plus +Inf), the sum and the count.
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, totals = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0, 0]))
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, (total, count)) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    labels = _format_labels(self.labels, key, 'le="' + le + '"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {_format_value(count)}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Holds the application metrics and renders them in the Prometheus text format.
+
+    Collectors are callbacks run at scrape time, used to export the counters that
+    other components already keep (executor, cache, upstream guard) as gauges.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: Dict[str, Callable[[], None]] = {}
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def _register(self, metric: _Metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, name: str, collector: Callable[[], None]) -> None:
+        self._collectors[name] = collector
+
+    def render(self) -> str:
+        for collector in list(self._collectors.values()):
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = metrics.counter("http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status"))
+HTTP_DURATION = metrics.histogram("http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+HTTP_IN_FLIGHT = metrics.gauge("http_requests_in_flight", "HTTP requests being served.")
+STAGE_DURATION = metrics.histogram("analysis_stage_duration_seconds", "Latency of each analysis stage.", ("stage",))
+INPUT_SIZE = metrics.histogram("analysis_input_size", "Size of the analysis inputs (bytes for files, characters for texts).", ("kind",), SIZE_BUCKETS)
+CLEANED_BYTES = metrics.counter("email_cleaner_removed_bytes_total", "Bytes of quoted replies, footers and signatures removed before preprocessing.")
+UPSTREAM_RESPONSES = metrics.counter("upstream_responses_total", "Responses of the LLM upstream by status code (or error class).", ("status",))
+MODEL_CALLS = metrics.counter("upstream_model_calls_total", "Calls of each model route by outcome (ok, error, rejected or canned).", ("route", "model", "outcome"))
+UPSTREAM_TOKENS = metrics.counter("upstream_tokens_total", "Tokens reported in the usage of the completions.", ("kind",))
+COMPONENT_STATE = metrics.gauge("component_state", "Counters and gauges kept by the executor, cache, single-flight and upstream guard.", ("component", "name"))
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Times a stage of the analysis.
+
+    The duration is observed in the stage histogram and, during an HTTP request,
+    added to its Server-Timing header.
+
+    Args:
+        name (str): The stage name, e.g. "extract" or "classify".
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(elapsed, stage=name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed * 1000))
+
+def start_request_timings() -> contextvars.Token:
+    return _request_timings.set([])
+
+def reset_request_timings(token: contextvars.Token) -> None:
+    _request_timings.reset(token)
+
+def request_timings() -> List[Tuple[str, float]]:
+    return _request_timings.get() or []
+
+def register_stats(component: str, stats: Callable[[], dict]) -> None:
+    """
+    Exports the numeric values of a `stats()` dict as `component_state` gauges.
+
+    Args:
+        component (str): The component label, e.g. "executor".
+        stats (Callable[[], dict]): Returns the current counters of the component.
+    """
+    def collect() -> None:
+        for name, value in stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                COMPONENT_STATE.set(value, component=component, name=name)
+    metrics.add_collector(component, collect)
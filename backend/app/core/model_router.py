@@ -0,0 +1,109 @@
+import hashlib
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+class ModelRoute:
+    """
+    One upstream model: the chat-completions endpoint that serves it, how long a
+    request may take and which route to try next if it fails.
+    """
+
+    def __init__(self, name: str, model: str, url: str, timeout: float, fallback: Optional[str] = None):
+        """
+        Args:
+            name (str): The route name, e.g. "classify".
+            model (str): The model sent in the payload.
+            url (str): The chat-completions URL.
+            timeout (float): Timeout of each attempt, in seconds.
+            fallback (Optional[str]): The route tried when this one fails. Defaults to None.
+        """
+        self.name = name
+        self.model = model
+        self.url = url
+        self.timeout = timeout
+        self.fallback = fallback
+
+class ModelRouter:
+    """
+    Maps each kind of upstream call to a model, with a chain of fallbacks.
+
+    The classification goes to the "classify" route, usually a small and fast
+    model, and the suggested responses (and combined calls) to the "suggest"
+    route. When a route fails, or its answer is rejected by the caller, the
+    call is retried on its fallback route, so a cheap model can be tried first
+    and the larger one only pays for the emails it could not handle.
+    """
+
+    def __init__(self, routes: Dict[str, ModelRoute]):
+        """
+        Args:
+            routes (Dict[str, ModelRoute]): The routes by name.
+
+        Raises:
+            ValueError: If a route falls back to an unknown route.
+        """
+        for route in routes.values():
+            if route.fallback is not None and route.fallback not in routes:
+                raise ValueError(f"Rota de fallback desconhecida: '{route.fallback}' (rota '{route.name}').")
+        self.routes = routes
+
+    def chain(self, name: str) -> List[ModelRoute]:
+        """
+        Returns the route and its fallbacks, in the order they are tried.
+
+        A fallback pointing back to a route already in the chain ends it, so
+        mutual fallbacks do not loop.
+
+        Args:
+            name (str): The route name.
+
+        Returns:
+            List[ModelRoute]: The routes to try.
+        """
+        chain: List[ModelRoute] = []
+        route = self.routes[name]
+        while route is not None and route not in chain:
+            chain.append(route)
+            route = self.routes.get(route.fallback) if route.fallback else None
+        return chain
+
+    def urls(self) -> List[str]:
+        """
+        Returns the distinct endpoints of the routes, e.g. to open their connections in the warm-up.
+        """
+        return list(dict.fromkeys(route.url for route in self.routes.values()))
+
+    @property
+    def fingerprint(self) -> str:
+        parts = [
+            f"{route.name}={route.model}@{route.url}>{route.fallback or ''}"
+            for route in sorted(self.routes.values(), key=lambda route: route.name)
+        ]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+def create_model_router() -> ModelRouter:
+    """
+    Creates the router from the `CLASSIFY_*` and `SUGGEST_*` settings.
+
+    Routes without their own URL use `settings.API_URL`, and routes without their
+    own timeout use `settings.HTTP_TIMEOUT`.
+
+    Returns:
+        ModelRouter: The configured router.
+    """
+    return ModelRouter({
+        "classify": ModelRoute(
+            "classify",
+            model=settings.CLASSIFY_MODEL,
+            url=settings.CLASSIFY_API_URL or settings.API_URL,
+            timeout=settings.CLASSIFY_TIMEOUT or settings.HTTP_TIMEOUT,
+            fallback=settings.CLASSIFY_FALLBACK or None,
+        ),
+        "suggest": ModelRoute(
+            "suggest",
+            model=settings.SUGGEST_MODEL,
+            url=settings.SUGGEST_API_URL or settings.API_URL,
+            timeout=settings.SUGGEST_TIMEOUT or settings.HTTP_TIMEOUT,
+            fallback=settings.SUGGEST_FALLBACK or None,
+        ),
+    })
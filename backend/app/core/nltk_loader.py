@@ -1,43 +1,117 @@
 from app.api.decorators.exception import ServiceError
+from contextlib import contextmanager
+from typing import Dict, List, Optional
 import nltk
 import ssl
 
-def download_nltk_data():
+# Resource id -> path checked by nltk.data.find. Only the files under each path
+# listed in NLTK_RESOURCE_FILES are actually read at runtime.
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'rslp': 'stemmers/rslp',
+    'punkt_tab': 'tokenizers/punkt_tab/portuguese',
+}
+
+NLTK_RESOURCE_FILES = {
+    'stopwords': ['portuguese', 'english', 'spanish'],
+    'rslp': [f'step{step}.pt' for step in range(7)],
+    'punkt_tab': ['abbrev_types.txt', 'collocations.tab', 'ortho_context.tab', 'sent_starters.txt'],
+}
+
+def required_resources(tokenizer: str = "punkt") -> Dict[str, str]:
     """
-    Download the required NLTK data packages.
+    Returns the NLTK resources needed by the NLP pipeline.
 
-    This function is a wrapper around the NLTK library's download functionality.
-    It downloads the required packages and handles any exceptions that may occur
-    during the download process.
+    The regex tokenizer does not use the Punkt models, so they are only required
+    when the "punkt" tokenizer is selected.
 
-    The packages downloaded are:
-    - Punkt Tokenizer Models
-    - Stopwords
-    - RSLP Stemmer
-    - Punkt Tokenizer Models for Portuguese
+    Args:
+        tokenizer (str): The tokenizer of the NLPAdapter. Defaults to "punkt".
 
-    The function raises a ServiceError if any of the downloads fail.
+    Returns:
+        Dict[str, str]: The resource ids mapped to their NLTK data paths.
     """
-    try:
-        _create_unverified_https_context = ssl._create_unverified_context
-        ssl._create_default_https_context = _create_unverified_https_context
-    except AttributeError:
-        pass
-
-    resources = {
-        'punkt': 'tokenizers/punkt',
-        'stopwords': 'corpora/stopwords',
-        'rslp': 'stemmers/rslp',
-        'punkt_tab': 'tokenizers/punkt_tab/portuguese'
+    return {
+        resource: path
+        for resource, path in NLTK_RESOURCES.items()
+        if resource != 'punkt_tab' or tokenizer == "punkt"
     }
 
+def missing_resources(resources: Dict[str, str]) -> List[str]:
+    """
+    Returns the resources that cannot be found in the NLTK data path.
+
+    Args:
+        resources (Dict[str, str]): The resource ids mapped to their NLTK data paths.
+
+    Returns:
+        List[str]: The ids of the missing resources.
+    """
+    missing = []
     for resource, path in resources.items():
         try:
             nltk.data.find(path)
         except LookupError:
+            missing.append(resource)
+    return missing
+
+@contextmanager
+def _ssl_context(verify: bool):
+    """
+    Temporarily disables the HTTPS certificate verification used by nltk.download.
+
+    The default context is restored on exit, so the rest of the process (e.g. the
+    LLM client) keeps verifying certificates.
+    """
+    previous = ssl._create_default_https_context
+    if not verify:
+        ssl._create_default_https_context = ssl._create_unverified_context
+    try:
+        yield
+    finally:
+        ssl._create_default_https_context = previous
+
+def download_nltk_data(data_dir: Optional[str] = None, offline: bool = False, tokenizer: str = "punkt", verify_ssl: bool = True):
+    """
+    Download the required NLTK data packages.
+
+    This function is a wrapper around the NLTK library's download functionality.
+    It looks for the required packages and downloads the missing ones.
+
+    The packages required are:
+    - Stopwords
+    - RSLP Stemmer
+    - Punkt Tokenizer Models for Portuguese (only for the "punkt" tokenizer)
+
+    Args:
+        data_dir (Optional[str]): A directory searched before the default NLTK data
+            path, e.g. the one created by `python -m app.cli.vendor_nltk`. Missing
+            packages are downloaded into it. Defaults to None.
+        offline (bool): If True, nothing is downloaded and missing packages are
+            reported at once. Defaults to False.
+        tokenizer (str): The tokenizer of the NLPAdapter. Defaults to "punkt".
+        verify_ssl (bool): Whether downloads verify the server certificate. Defaults to True.
+
+    Raises:
+        ServiceError: If a package is missing in offline mode or if a download fails.
+    """
+    if data_dir and data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+
+    resources = required_resources(tokenizer)
+    missing = missing_resources(resources)
+    if not missing:
+        return
+    if offline:
+        raise ServiceError(
+            f"Recursos NLTK ausentes em modo offline: {', '.join(missing)}. "
+            f"Gere-os com 'python -m app.cli.vendor_nltk'."
+        )
+
+    with _ssl_context(verify_ssl):
+        for resource in missing:
             try:
-                nltk.download(resource)
+                if not nltk.download(resource, download_dir=data_dir, quiet=True, raise_on_error=True):
+                    raise ServiceError(f"download de {resource} não concluído")
             except Exception as e:
                 raise ServiceError(f"Erro ao baixar {resource}: {e}")
-
-
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from string import Template
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.token_budget import compact_prompt
+
+DEFAULT_PROMPTS_PATH = Path(__file__).with_name("prompts.json")
+TEMPLATE_NAMES = ("classification", "suggestion", "combined")
+
+class PromptSet:
+    """
+    An immutable, compiled version of the prompts file.
+
+    Templates are compacted and compiled into `string.Template` objects once, and
+    everything derived from the categories (names, definitions, instructions) is
+    rendered when the file is loaded, so building a prompt is a single `substitute`.
+
+    Attributes:
+        categories (Tuple[str, ...]): The category names, in the order of the file.
+        system (str): The system prompt of the suggestion calls.
+        templates (Dict[str, Template]): The compiled user prompts.
+        versions (Dict[str, str]): The version id of the system prompt and of each template.
+        version (str): The version id of the whole prompts file; part of the analysis cache keys.
+    """
+
+    def __init__(self, data: dict):
+        """
+        Args:
+            data (dict): The parsed prompts file.
+
+        Raises:
+            ValueError: If a template, the system prompt or the categories are missing,
+                or if a template has an invalid placeholder.
+        """
+        categories = data.get("categories") or {}
+        if not categories:
+            raise ValueError("O arquivo de prompts deve definir ao menos uma categoria.")
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self.system = compact_prompt(_text(data.get("system"), "system"))
+        self.templates: Dict[str, Template] = {}
+        self.versions: Dict[str, str] = {"system": _version(self.system)}
+        for name in TEMPLATE_NAMES:
+            source = compact_prompt(_text((data.get("templates") or {}).get(name), f"templates.{name}"))
+            template = Template(source)
+            if not template.is_valid():
+                raise ValueError(f"Template '{name}' com marcador inválido.")
+            self.templates[name] = template
+            self.versions[name] = _version(source)
+
+        self._instructions = {
+            name: compact_prompt(_text(category.get("instructions"), f"categories.{name}.instructions"))
+            for name, category in categories.items()
+        }
+        self._canned_replies = {
+            name: compact_prompt(_text(category["canned_reply"], f"categories.{name}.canned_reply"))
+            for name, category in categories.items()
+            if category.get("canned_reply")
+        }
+        self._default_instructions = compact_prompt(_text(data.get("default_instructions", ""), "default_instructions"))
+        quoted = [f"'{name}'" for name in self.categories]
+        double_quoted = [f'"{name}"' for name in self.categories]
+        self._shared = {
+            "category_names": _join_alternatives(quoted),
+            "category_options": _join_alternatives(double_quoted),
+            "category_definitions": "\n".join(
+                f"- {name}: {compact_prompt(_text(category.get('definition'), f'categories.{name}.definition'))}"
+                for name, category in categories.items()
+            ),
+            "category_instructions": "\n".join(
+                f"INSTRUÇÕES ESPECÍFICAS PARA '{name}':\n{instructions}" for name, instructions in self._instructions.items()
+            ),
+        }
+        self.versions["categories"] = _version(json.dumps(categories, sort_keys=True, ensure_ascii=False))
+        self.version = _version("\0".join(f"{name}={value}" for name, value in sorted(self.versions.items())))
+
+    def instructions(self, category: str) -> str:
+        return self._instructions.get(category, self._default_instructions)
+
+    def canned_reply(self, category: str) -> Optional[str]:
+        """
+        Returns the fixed response of a category that needs no generated reply, if it has one.
+        """
+        return self._canned_replies.get(category)
+
+    def render(self, name: str, **values: str) -> str:
+        """
+        Fills a template with the given values and the category placeholders.
+
+        Args:
+            name (str): "classification", "suggestion" or "combined".
+            **values (str): The per-call values, e.g. `email_content` and `category`.
+
+        Returns:
+            str: The prompt.
+        """
+        return self.templates[name].safe_substitute(self._shared, **values)
+
+class PromptRegistry:
+    """
+    Holds the current prompts and reloads them when the file changes.
+
+    The modification time of the file is checked at most every `reload_interval`
+    seconds, on the first call after it. A changed file is parsed and compiled
+    into a new PromptSet that replaces the current one; an invalid file is logged
+    and the previous prompts stay in use, so a bad edit never takes the service down.
+    """
+
+    def __init__(self, path: Optional[str] = None, reload_interval: float = 2.0):
+        """
+        Args:
+            path (Optional[str]): The prompts file. Defaults to the bundled app/core/prompts.json.
+            reload_interval (float): Minimum seconds between checks of the file. 0 disables
+                the reload. Defaults to 2.0.
+
+        Raises:
+            ValueError: If the initial file is invalid.
+        """
+        self.path = Path(path) if path else DEFAULT_PROMPTS_PATH
+        self.reload_interval = reload_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._mtime = os.stat(self.path).st_mtime_ns
+        self._current = self._load()
+        self._checked_at = time.monotonic()
+
+    def current(self) -> PromptSet:
+        """
+        Returns the current prompts, reloading the file first if it changed.
+
+        Returns:
+            PromptSet: The compiled prompts.
+        """
+        if self.reload_interval > 0 and time.monotonic() - self._checked_at >= self.reload_interval:
+            self._reload_if_changed()
+        return self._current
+
+    def _reload_if_changed(self) -> None:
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime == self._mtime:
+                    return
+                self._mtime = mtime
+                self._current = self._load()
+                self.reloads += 1
+                logger.info("Prompts recarregados de %s (versão %s).", self.path, self._current.version)
+            except (OSError, ValueError) as e:
+                logger.error("Erro ao recarregar os prompts de %s: %s. Mantendo a versão %s.", self.path, e, self._current.version)
+
+    def _load(self) -> PromptSet:
+        with open(self.path, encoding="utf-8") as prompts_file:
+            return PromptSet(json.load(prompts_file))
+
+def _text(value, name: str) -> str:
+    """
+    Accepts a string or a list of lines, which keeps long prompts readable in JSON.
+    """
+    if isinstance(value, list) and all(isinstance(line, str) for line in value):
+        return "\n".join(value)
+    if isinstance(value, str):
+        return value
+    raise ValueError(f"Campo '{name}' ausente ou inválido no arquivo de prompts.")
+
+def _version(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+def _join_alternatives(names) -> str:
+    return names[0] if len(names) == 1 else f"{', '.join(names[:-1])} ou {names[-1]}"
+
+def create_prompt_registry() -> PromptRegistry:
+    return PromptRegistry(path=settings.PROMPTS_PATH, reload_interval=settings.PROMPTS_RELOAD_INTERVAL)
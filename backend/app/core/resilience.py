@@ -0,0 +1,423 @@
+import asyncio
+import contextlib
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Optional
+import httpx
+from app.api.decorators.exception import ServiceUnavailableError
+from app.core.config import settings
+from app.core.metrics import UPSTREAM_RESPONSES
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+class CircuitOpenError(ServiceUnavailableError):
+    pass
+
+class UpstreamThrottledError(ServiceUnavailableError):
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: `rate` tokens per second, up to `burst` at once.
+
+    Callers wait for a token instead of being rejected, so bursts are smoothed
+    to the configured rate. A rate of 0 disables the limiter.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """
+        Takes one token, waiting for it if the bucket is empty.
+
+        Returns:
+            float: The time waited, in seconds.
+        """
+        if self.rate <= 0:
+            return 0.0
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait:
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._updated_at = time.monotonic()
+            self._tokens -= 1
+            return wait
+
+class SQLiteTokenBucket:
+    """
+    Token-bucket rate limiter shared by the processes of a host through SQLite.
+
+    Each call reserves a token in a short write transaction, letting the balance
+    go negative, and then sleeps until its reservation matures, so no lock is held
+    while waiting. The reservation runs in a thread, off the event loop. Wall-clock
+    time is used, since the balance is read by several processes.
+    """
+
+    def __init__(self, path: str, rate: float, burst: int, name: str = "upstream"):
+        """
+        Args:
+            path (str): Path of the SQLite database shared by the processes.
+            rate (float): Tokens per second. 0 disables the limiter.
+            burst (int): Maximum number of tokens in the bucket.
+            name (str): The bucket name, so several limiters can share a database. Defaults to "upstream".
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.name = name
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS token_buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    async def acquire(self) -> float:
+        """
+        Takes one token, waiting for it if the bucket is empty.
+
+        Returns:
+            float: The time waited, in seconds.
+        """
+        if self.rate <= 0:
+            return 0.0
+        wait = await asyncio.to_thread(self._reserve)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self) -> float:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._db.execute(
+                    "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                tokens = self.burst if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+                tokens -= 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (self.name, tokens, now),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+class CircuitBreaker:
+    """
+    Fails fast while the upstream is down.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    rejected for `reset_timeout` seconds. Then a single probe call is let through
+    (half-open): its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe already running.
+        """
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.OPEN or (self.state == self.HALF_OPEN and self._probing):
+            raise CircuitOpenError("Serviço de IA indisponível no momento. Tente novamente em instantes.")
+        if self.state == self.HALF_OPEN:
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_cancel(self) -> None:
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+class UpstreamGuard:
+    """
+    Protects the calls to the LLM upstream.
+
+    Every call goes through the circuit breaker, and each of its attempts through a
+    concurrency semaphore and the token-bucket rate limiter. Connection errors and
+    429/5xx responses are retried with jittered exponential backoff, honoring the
+    Retry-After header when the upstream sends one. The breaker counts one outcome
+    per call, once its retries are spent, so a single slow or throttled request
+    cannot open the circuit for everyone; 429 responses are not failures at all,
+    since the upstream is up and its Retry-After is already honored. The counters
+    are exposed by `stats()`.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 10,
+        max_concurrency: int = 32,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        rate_state_path: Optional[str] = None,
+    ):
+        """
+        Initializes the guard.
+
+        The circuit breaker and the concurrency cap belong to the process. The rate
+        limiter can be shared by the workers of a host through `rate_state_path`.
+
+        Args:
+            rate (float): Maximum requests per second. 0 disables the rate limiter. Defaults to 0.0.
+            burst (int): Requests allowed at once above the rate. Defaults to 10.
+            max_concurrency (int): Maximum requests in flight. Defaults to 32.
+            max_retries (int): Retries after the first attempt. Defaults to 3.
+            base_delay (float): Base of the exponential backoff, in seconds. Defaults to 0.5.
+            max_delay (float): Maximum delay between attempts, including Retry-After. Defaults to 20.0.
+            failure_threshold (int): Consecutive failures that open the circuit. Defaults to 5.
+            reset_timeout (float): Seconds the circuit stays open before a probe. Defaults to 30.0.
+            rate_state_path (Optional[str]): SQLite database of a rate limiter shared between
+                processes. Defaults to None (the limiter is local to the process).
+        """
+        self.bucket = (
+            SQLiteTokenBucket(rate_state_path, rate, burst)
+            if rate_state_path and rate > 0
+            else TokenBucket(rate, burst)
+        )
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self.rejected = 0
+        self.rate_limited_seconds = 0.0
+
+    @contextlib.asynccontextmanager
+    async def call(self) -> AsyncIterator[None]:
+        """
+        Runs one logical call, with all its attempts: checks the circuit first and
+        records the outcome of the call in it.
+
+        The call counts as a circuit failure if the block raises, and as a success
+        otherwise. A cancelled call (e.g. the client disconnected) and a call that
+        ends in a 429 count as neither.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.rejected += 1
+            raise
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit):
+            self.breaker.record_cancel()
+            raise
+        except Exception as e:
+            if _status_code(e) == 429:
+                self.breaker.record_cancel()
+            else:
+                self.failures += 1
+                self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+    @contextlib.asynccontextmanager
+    async def attempt(self) -> AsyncIterator[None]:
+        """
+        Runs one attempt of a call: waits for a concurrency slot and a token.
+        """
+        async with self._semaphore:
+            self.rate_limited_seconds += await self.bucket.acquire()
+            self.in_flight += 1
+            self.requests += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Runs a call made of a single attempt, e.g. a streamed completion, which
+        cannot be retried once its first tokens are sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        async with self.call():
+            async with self.attempt():
+                yield
+
+    async def send(self, request: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Sends a request, retrying connection errors and 429/5xx responses.
+
+        Args:
+            request (Callable[[], Awaitable[httpx.Response]]): Sends one attempt.
+
+        Returns:
+            httpx.Response: The first response that is not retryable. Other 4xx
+            responses are returned as is, without retries.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+            UpstreamThrottledError: If the upstream still answers 429/5xx after the last retry.
+            httpx.HTTPError: If the connection still fails after the last retry.
+        """
+        async with self.call():
+            for attempt in range(self.max_retries + 1):
+                last_attempt = attempt == self.max_retries
+                retry_after = None
+                try:
+                    async with self.attempt():
+                        try:
+                            response = await request()
+                        except httpx.TransportError as e:
+                            self.record_status(e.__class__.__name__)
+                            raise
+                        self.record_status(response.status_code)
+                        if response.status_code in RETRYABLE_STATUS_CODES:
+                            if response.status_code in (429, 503):
+                                self.throttled += 1
+                            retry_after = self._retry_after(response)
+                            raise UpstreamThrottledError(f"Serviço de IA respondeu {response.status_code}.", response.status_code)
+                    return response
+                except (httpx.TransportError, UpstreamThrottledError):
+                    if last_attempt:
+                        raise
+                self.retries += 1
+                await asyncio.sleep(self._delay(attempt, retry_after))
+
+    def record_status(self, status) -> None:
+        """
+        Counts an upstream response by status code, or a failed attempt by error class.
+        """
+        UPSTREAM_RESPONSES.inc(status=str(status))
+
+    def _delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def close(self) -> None:
+        """
+        Closes the database of a shared rate limiter, if any.
+        """
+        if isinstance(self.bucket, SQLiteTokenBucket):
+            self.bucket.close()
+
+    def stats(self) -> dict:
+        """
+        Returns the guard counters.
+
+        Returns:
+            dict: The circuit state, the requests in flight, the attempts made, retried
+            and throttled (429/503), the calls failed and rejected by the open circuit,
+            and the total time spent waiting for the rate limiter.
+        """
+        return {
+            "circuit_state": self.breaker.state,
+            "circuit_opened": self.breaker.opened,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "rate_limited_seconds": round(self.rate_limited_seconds, 3),
+        }
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """
+    Returns the upstream status code carried by an error, if any.
+    """
+    if isinstance(error, UpstreamThrottledError):
+        return error.status_code
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
+
+def create_upstream_guard() -> UpstreamGuard:
+    """
+    Creates the guard of the LLM upstream from the `UPSTREAM_*` settings.
+
+    Returns:
+        UpstreamGuard: The configured guard.
+    """
+    return UpstreamGuard(
+        rate=settings.UPSTREAM_RATE_LIMIT,
+        burst=settings.UPSTREAM_RATE_BURST,
+        max_concurrency=settings.UPSTREAM_MAX_CONCURRENCY,
+        max_retries=settings.UPSTREAM_MAX_RETRIES,
+        base_delay=settings.UPSTREAM_RETRY_BASE_DELAY,
+        max_delay=settings.UPSTREAM_RETRY_MAX_DELAY,
+        failure_threshold=settings.UPSTREAM_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.UPSTREAM_CIRCUIT_RESET_SECONDS,
+        rate_state_path=settings.UPSTREAM_RATE_STATE_PATH,
+    )
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller of a key (the leader) starts the call as a task; callers that
+    arrive while it is in flight await the same task and get the same result or
+    exception. Each caller awaits the task through `asyncio.shield`, so a caller
+    that is cancelled (e.g. its client disconnected) leaves the call running for
+    the others. The key is released as soon as the call finishes, so this is not
+    a cache: later callers start a new call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs `call()` unless a call with the same key is already in flight.
+
+        Args:
+            key (str): Identifies identical calls.
+            call (Callable[[], Awaitable[Any]]): Starts the call.
+
+        Returns:
+            Any: The result of the call shared by every caller of the key.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            task.add_done_callback(self._consume_exception)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _consume_exception(self, task: asyncio.Task) -> None:
+        # Marks the exception as retrieved when every caller was cancelled before the
+        # call failed, so asyncio does not log it as never retrieved.
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict:
+        """
+        Returns the coalescing counters.
+
+        Returns:
+            dict: The calls in flight, the calls started (leaders) and the callers
+            that shared an in-flight call instead of starting one.
+        """
+        return {"in_flight": self.in_flight(), "leaders": self.leaders, "coalesced": self.coalesced}
@@ -0,0 +1,305 @@
+import asyncio
+import gc
+import time
+from typing import Optional
+from app.adapters.AnalysisCache import AnalysisCache
+from app.adapters.EmailAnalyzer import EmailAnalyzer
+from app.adapters.EmailCleaner import EmailCleaner
+from app.adapters.InMemoryJobStore import InMemoryJobStore
+from app.adapters.LocalClassifier import LocalClassifier
+from app.adapters.NearDuplicateIndex import NearDuplicateIndex
+from app.adapters.NLPAdapter import NLPAdapter
+from app.adapters.SQLiteJobStore import SQLiteJobStore
+from app.adapters.TextReaderAdapter import TextReaderAdapter
+from app.adapters.WebhookNotifier import WebhookNotifier
+from app.core.config import settings
+from app.core.executor import CpuExecutor
+from app.core.http_client import create_http_client
+from app.core.job_queue import JobQueue
+from app.core.resilience import create_upstream_guard
+from app.core.singleflight import SingleFlight
+from app.core.logger import logger
+from app.core.metrics import register_stats
+from app.core.model_router import create_model_router
+from app.core.prompt_registry import create_prompt_registry
+from app.core.nltk_loader import download_nltk_data
+
+WARMUP_TEXT = "Olá, preciso de uma atualização sobre o chamado 123 em aberto. Obrigado pela atenção!"
+
+# Read-only resources built by `preload_shared_state` in the pre-fork server, inherited by the workers.
+_preloaded: dict = {}
+
+
+def build_app_state(state) -> None:
+    """
+    Builds the application-scoped singletons and stores them in `app.state`.
+
+    Adapters are created once per process instead of once per request, so the
+    stopwords, the stemmer rules and the pooled HTTP client are shared by every
+    request. If the NLP adapter cannot be built (e.g. missing NLTK data), it is
+    left as None and the application is reported as not ready.
+
+    Args:
+        state: The `app.state` of the FastAPI application.
+    """
+    state.ready = False
+    state.http_client = create_http_client()
+    state.analysis_cache = create_analysis_cache()
+    state.near_duplicate_index = create_near_duplicate_index()
+    state.single_flight = SingleFlight() if settings.SINGLE_FLIGHT_ENABLED else None
+    state.executor = CpuExecutor(
+        kind=settings.EXECUTOR_KIND,
+        max_workers=settings.EXECUTOR_MAX_WORKERS,
+        max_queue=settings.EXECUTOR_MAX_QUEUE,
+    )
+
+    state.job_store = (
+        SQLiteJobStore(settings.JOBS_SQLITE_PATH, ttl_seconds=settings.JOBS_TTL_SECONDS, recover="job_store_recovered" not in _preloaded)
+        if settings.JOBS_STORE == "sqlite"
+        else InMemoryJobStore(max_entries=settings.JOBS_MAX_ENTRIES, ttl_seconds=settings.JOBS_TTL_SECONDS)
+    )
+    state.job_queue = JobQueue(concurrency=settings.JOBS_CONCURRENCY, max_size=settings.JOBS_MAX_QUEUE)
+    state.webhook_notifier = WebhookNotifier(
+        state.http_client,
+        timeout=settings.JOBS_WEBHOOK_TIMEOUT,
+        allowed_hosts=settings.JOBS_WEBHOOK_ALLOWED_HOSTS.split(",") if settings.JOBS_WEBHOOK_ALLOWED_HOSTS else None,
+    )
+
+    state.text_reader_adapter = _preloaded.get("text_reader_adapter") or TextReaderAdapter()
+    state.email_cleaner = (_preloaded.get("email_cleaner") or EmailCleaner()) if settings.EMAIL_CLEANER_ENABLED else None
+    state.upstream_guard = create_upstream_guard()
+    state.prompt_registry = create_prompt_registry()
+    state.model_router = create_model_router()
+    state.email_analyzer = create_email_analyzer(
+        http_client=state.http_client,
+        upstream_guard=state.upstream_guard,
+        prompt_registry=state.prompt_registry,
+        model_router=state.model_router,
+    )
+    state.local_classifier = state.email_analyzer.local_classifier
+    register_stats("executor", state.executor.stats)
+    register_stats("upstream", state.upstream_guard.stats)
+    register_stats("jobs", lambda: {"queued": state.job_queue.qsize()})
+    register_stats("prompts", lambda: {"reloads": state.prompt_registry.reloads})
+    if state.analysis_cache is not None:
+        register_stats("cache", state.analysis_cache.stats)
+    if state.near_duplicate_index is not None:
+        register_stats("near_duplicates", state.near_duplicate_index.stats)
+    if state.single_flight is not None:
+        register_stats("single_flight", state.single_flight.stats)
+
+    state.nlp_adapter = _preloaded.get("nlp_adapter") or _build_nlp_adapter()
+
+
+def create_analysis_cache() -> Optional[AnalysisCache]:
+    """
+    Builds the analysis cache of the settings.
+
+    Returns:
+        Optional[AnalysisCache]: The cache, or None if CACHE_ENABLED is off.
+    """
+    if not settings.CACHE_ENABLED:
+        return None
+    return AnalysisCache(
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.CACHE_TTL_SECONDS,
+        sqlite_path=settings.CACHE_SQLITE_PATH,
+        sqlite_max_entries=settings.CACHE_SQLITE_MAX_ENTRIES,
+    )
+
+
+def create_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """
+    Builds the near-duplicate index of the settings.
+
+    Returns:
+        Optional[NearDuplicateIndex]: The index, or None if NEAR_DUPLICATE_ENABLED is off.
+    """
+    if not settings.NEAR_DUPLICATE_ENABLED:
+        return None
+    return NearDuplicateIndex(
+        threshold=settings.NEAR_DUPLICATE_THRESHOLD,
+        num_perm=settings.NEAR_DUPLICATE_PERMUTATIONS,
+        max_entries=settings.NEAR_DUPLICATE_MAX_ENTRIES,
+        ttl_seconds=settings.CACHE_TTL_SECONDS,
+        sqlite_path=settings.NEAR_DUPLICATE_SQLITE_PATH,
+        reuse_reply=settings.NEAR_DUPLICATE_REUSE_REPLY,
+    )
+
+
+def create_nlp_adapter() -> NLPAdapter:
+    """
+    Builds the NLP adapter of the settings.
+
+    Returns:
+        NLPAdapter: The adapter.
+
+    Raises:
+        LookupError: If the NLTK data it needs is missing.
+    """
+    return NLPAdapter(
+        tokenizer=settings.NLP_TOKENIZER,
+        stem_cache_size=settings.NLP_STEM_CACHE_SIZE,
+        language_detection=settings.NLP_LANGUAGE_DETECTION,
+        foreign_text=settings.NLP_FOREIGN_TEXT,
+    )
+
+
+def create_email_analyzer(**kwargs) -> EmailAnalyzer:
+    """
+    Builds the EmailAnalyzer with the local classifier of LOCAL_CLASSIFIER_PATH, if any.
+
+    The classifier preloaded by `preload_shared_state` is reused; otherwise it is
+    loaded here. Since the classifier is part of the analyzer fingerprint, every
+    analyzer built here shares the entries of the analysis cache.
+
+    Args:
+        **kwargs: The other arguments of EmailAnalyzer (http client, upstream guard, ...).
+
+    Returns:
+        EmailAnalyzer: The analyzer.
+    """
+    local_classifier = _preloaded["local_classifier"] if "local_classifier" in _preloaded else _load_local_classifier()
+    return EmailAnalyzer(local_classifier=local_classifier, **kwargs)
+
+
+def _load_local_classifier():
+    if not settings.LOCAL_CLASSIFIER_PATH:
+        return None
+    try:
+        local_classifier = LocalClassifier.load(settings.LOCAL_CLASSIFIER_PATH)
+        logger.info("Classificador local carregado: %s", settings.LOCAL_CLASSIFIER_PATH)
+        return local_classifier
+    except Exception as e:
+        logger.error("Erro ao carregar o classificador local: %s", e)
+        return None
+
+
+def _build_nlp_adapter():
+    try:
+        return create_nlp_adapter()
+    except Exception as e:
+        logger.error("Erro ao carregar o NLPAdapter: %s", e)
+        return None
+
+
+def preload_shared_state(workers: int) -> None:
+    """
+    Prepares the pre-fork server (see gunicorn.conf.py) before it forks the workers.
+
+    The NLTK data, the NLP adapter (stopwords, stemmer rules, normalization table),
+    the text reader, the email cleaner and the local classifier are built once in
+    the master and inherited copy-on-write by every worker, which then skips
+    rebuilding them in `build_app_state`. Nothing holding threads, sockets or
+    database connections is created here; those are built after the fork.
+
+    With more than one worker, the settings left at their process-local defaults
+    are switched to shared backends: the SQLite tier of the analysis cache, the
+    SQLite near-duplicate index, the SQLite job store and the SQLite rate limiter. The upstream concurrency cap and
+    the executor size are divided between the workers. Settings configured
+    explicitly (environment or .env) are kept as they are.
+
+    Args:
+        workers (int): The number of worker processes.
+    """
+    start = time.perf_counter()
+    if workers > 1:
+        _share_between_workers(workers)
+
+    download_nltk_data(
+        data_dir=settings.NLTK_DATA_DIR,
+        offline=settings.NLTK_OFFLINE,
+        tokenizer=settings.NLP_TOKENIZER,
+        verify_ssl=settings.NLTK_VERIFY_SSL,
+    )
+    nlp_adapter = _build_nlp_adapter()
+    if nlp_adapter is not None:
+        nlp_adapter.preprocess(WARMUP_TEXT)
+        _preloaded["nlp_adapter"] = nlp_adapter
+    _preloaded["text_reader_adapter"] = TextReaderAdapter()
+    _preloaded["email_cleaner"] = EmailCleaner()
+    _preloaded["local_classifier"] = _load_local_classifier()
+    if settings.JOBS_STORE == "sqlite":
+        # Jobs interrupted by the previous run are failed once here, not by every worker
+        # that starts later, which would fail the jobs its siblings are running.
+        SQLiteJobStore(settings.JOBS_SQLITE_PATH, ttl_seconds=settings.JOBS_TTL_SECONDS).close()
+        _preloaded["job_store_recovered"] = True
+
+    # Objects created so far are never collected; freezing them keeps the collector
+    # from writing to their pages in the workers, which would undo the copy-on-write sharing.
+    gc.freeze()
+    logger.info("Pré-carregamento para %d workers concluído em %.0f ms.", workers, (time.perf_counter() - start) * 1000)
+
+
+def _share_between_workers(workers: int) -> None:
+    explicit = settings.model_fields_set
+    defaults = {
+        "CACHE_SQLITE_PATH": "analysis_cache.db",
+        "NEAR_DUPLICATE_SQLITE_PATH": "near_duplicates.db",
+        "JOBS_STORE": "sqlite",
+        "UPSTREAM_RATE_STATE_PATH": "upstream_rate.db",
+        "UPSTREAM_MAX_CONCURRENCY": max(1, settings.UPSTREAM_MAX_CONCURRENCY // workers),
+        "EXECUTOR_MAX_WORKERS": 2,
+    }
+    for name, value in defaults.items():
+        if name not in explicit:
+            setattr(settings, name, value)
+
+
+async def warm_up(state) -> None:
+    """
+    Primes the singletons before the application reports itself as ready.
+
+    It runs the NLP pipeline once (loading the stopwords, the stemmer rules and the
+    normalization table), starts the executor workers, and opens a connection to
+    the endpoint of each model route so the first request does not pay for the handshake. Upstream
+    failures are only logged, since the upstream may reject the probe request.
+
+    Args:
+        state: The `app.state` of the FastAPI application.
+    """
+    start = time.perf_counter()
+    if state.nlp_adapter is None:
+        logger.error("Aquecimento interrompido: NLPAdapter indisponível.")
+        return
+
+    try:
+        state.nlp_adapter.preprocess(WARMUP_TEXT)
+        await asyncio.gather(*(
+            state.executor.run(state.nlp_adapter, "preprocess", WARMUP_TEXT)
+            for _ in range(state.executor.max_workers)
+        ))
+    except Exception as e:
+        logger.error("Erro no aquecimento do pipeline NLP: %s", e)
+        return
+
+    if settings.WARMUP_UPSTREAM:
+        for url in state.model_router.urls():
+            try:
+                await state.http_client.head(url, timeout=5.0)
+            except Exception as e:
+                logger.warning("Não foi possível abrir conexão com o upstream %s: %s", url, e)
+
+    state.ready = True
+    logger.info("Aquecimento concluído em %.0f ms.", (time.perf_counter() - start) * 1000)
+
+
+async def close_app_state(state) -> None:
+    """
+    Releases the resources created by `build_app_state`.
+
+    Args:
+        state: The `app.state` of the FastAPI application.
+    """
+    state.ready = False
+    await state.job_queue.stop()
+    state.job_store.close()
+    await state.http_client.aclose()
+    state.upstream_guard.close()
+    state.executor.shutdown()
+    if state.analysis_cache is not None:
+        logger.info("Cache de análises: %s", state.analysis_cache.stats())
+        state.analysis_cache.close()
+    if state.near_duplicate_index is not None:
+        logger.info("Índice de quase-duplicatas: %s", state.near_duplicate_index.stats())
+        state.near_duplicate_index.close()
@@ -0,0 +1,102 @@
+import math
+import re
+import textwrap
+from typing import Optional
+from app.core.config import settings
+
+_BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+# A word, a number or a single symbol: each is at least one token for BPE tokenizers.
+_PIECE_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+TRIM_MARKER = " [...] "
+
+def compact_prompt(template: str) -> str:
+    """
+    Removes the indentation and surrounding whitespace that prompt literals carry.
+
+    Prompts are written indented inside the class body; the indentation is sent
+    to the model as tokens. Lines are dedented and stripped and runs of blank
+    lines collapse into one, while the line structure of the prompt is kept.
+
+    Args:
+        template (str): The prompt as written in the source.
+
+    Returns:
+        str: The compacted prompt.
+    """
+    lines = [line.strip() for line in textwrap.dedent(template).strip().splitlines()]
+    return _BLANK_LINES_PATTERN.sub("\n\n", "\n".join(lines))
+
+class TokenBudget:
+    """
+    Estimates prompt tokens locally and trims emails to a token budget.
+
+    The estimate does not load a tokenizer: it takes the largest of the character
+    count divided by `chars_per_token` and the number of words and symbols, which
+    stays on the safe side for the BPE tokenizers of the chat models. Long emails
+    keep their beginning (greeting, request) and end (closing question, signature)
+    and lose the middle, cut at word boundaries.
+    """
+
+    def __init__(self, max_tokens: int, chars_per_token: float = 3.5, head_ratio: float = 0.7):
+        """
+        Args:
+            max_tokens (int): Token budget of an email inside a prompt. 0 disables trimming.
+            chars_per_token (float): Average characters per token. Defaults to 3.5.
+            head_ratio (float): Share of the budget kept from the beginning of the email. Defaults to 0.7.
+        """
+        if not 0 < head_ratio <= 1:
+            raise ValueError("head_ratio deve estar entre 0 e 1.")
+        self.max_tokens = max_tokens
+        self.chars_per_token = chars_per_token
+        self.head_ratio = head_ratio
+
+    def estimate(self, text: str) -> int:
+        """
+        Estimates the number of tokens of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            int: The estimated number of tokens.
+        """
+        if not text:
+            return 0
+        by_chars = math.ceil(len(text) / self.chars_per_token)
+        return max(by_chars, sum(1 for _ in _PIECE_PATTERN.finditer(text)))
+
+    def trim(self, text: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Trims a text to the token budget, keeping its head and tail.
+
+        Args:
+            text (str): The email content.
+            max_tokens (Optional[int]): Overrides the budget of the instance. Defaults to None.
+
+        Returns:
+            str: The text itself if it fits, or its head and tail joined by `TRIM_MARKER`.
+        """
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        if not budget or (len(text) <= budget * self.chars_per_token and self.estimate(text) <= budget):
+            return text
+
+        chars = int(budget * self.chars_per_token) - len(TRIM_MARKER)
+        head_chars = int(chars * self.head_ratio)
+        tail_chars = chars - head_chars
+        head = text[:head_chars]
+        if head_chars < len(text) and not text[head_chars].isspace() and " " in head:
+            head = head[:head.rfind(" ")]
+        tail = text[len(text) - tail_chars:] if tail_chars > 0 else ""
+        if tail and not text[len(text) - tail_chars - 1].isspace() and " " in tail:
+            tail = tail[tail.find(" ") + 1:]
+        trimmed = head.rstrip() + TRIM_MARKER + tail.lstrip()
+        # The piece count may still exceed the budget for texts of very short words.
+        while self.estimate(trimmed) > budget and len(head) > 1:
+            head = head[:len(head) // 2]
+            tail = tail[len(tail) // 2:]
+            trimmed = head.rstrip() + TRIM_MARKER + tail.lstrip()
+        return trimmed
+
+def create_token_budget() -> TokenBudget:
+    return TokenBudget(max_tokens=settings.PROMPT_EMAIL_MAX_TOKENS)
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 class FileType(str, Enum):
     TXT = "txt"
@@ -13,7 +13,7 @@ class Document:
         self,
         filename: Optional[str] = None,
         size: Optional[int] = None,
-        content: Optional[bytes] = None,
+        content: Optional[Union[bytes, BinaryIO]] = None,
         text: Optional[str] = None,
     ): 
         """
@@ -22,7 +22,10 @@ class Document:
         Args:
             filename (Optional[str]): The name of the file associated with the document. Must have a supported extension (PDF or TXT).
             size (Optional[int]): The size of the file in bytes. Must not exceed MAX_FILE_SIZE (10 MB).
-            content (Optional[bytes]): The binary content of the file.
+            content (Optional[Union[bytes, BinaryIO]]): The binary content of the file, either as bytes or
+                as a binary file that can at least be rewound with seek(0) (e.g. the spooled upload, or
+                a ZIP member), which is read in place by the readers. A file may expose a
+                `content_key` string that identifies its bytes, so they need not be hashed.
             text (Optional[str]): The textual content of the document.
 
         Raises:
@@ -38,6 +41,7 @@ class Document:
         if size is not None and size > MAX_FILE_SIZE:
             raise ValueError("O tamanho do arquivo não pode ser maior que 10 MB.")
         self.filename = filename
+        self.size = size
         self.content = content
         self.text = text
         self.filetype: Optional[FileType] = None
@@ -46,4 +50,18 @@ class Document:
             ext = filename.split(".")[-1].lower()
             if ext not in (FileType.TXT, FileType.PDF):
                 raise ValueError(f"Formato de arquivo não suportado: {ext}")
-            self.filetype = FileType(ext)
\ No newline at end of file
+            self.filetype = FileType(ext)
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state used to pickle the document (e.g. to send it to a worker process).
+
+        File objects cannot be pickled, so a file-backed content is read into bytes here,
+        and only here.
+        """
+        state = self.__dict__.copy()
+        content = state.get("content")
+        if content is not None and not isinstance(content, (bytes, bytearray)):
+            content.seek(0)
+            state["content"] = content.read()
+        return state
@@ -0,0 +1,84 @@
+import time
+import uuid
+from enum import Enum
+from typing import Optional
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job:
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        status: JobStatus = JobStatus.QUEUED,
+        webhook_url: Optional[str] = None,
+        category: Optional[str] = None,
+        details: Optional[str] = None,
+        error: Optional[str] = None,
+        error_type: Optional[str] = None,
+        created_at: Optional[float] = None,
+        updated_at: Optional[float] = None,
+    ):
+        """
+        Initializes a Job instance, the state of an asynchronous analysis.
+
+        Args:
+            id (Optional[str]): The job id. Defaults to a new random id.
+            status (JobStatus): The job status. Defaults to JobStatus.QUEUED.
+            webhook_url (Optional[str]): URL notified with the job once it finishes. Must be HTTP or HTTPS.
+            category (Optional[str]): The category of the email, once the job succeeded.
+            details (Optional[str]): The suggested response, once the job succeeded.
+            error (Optional[str]): The error message, if the job failed.
+            error_type (Optional[str]): The error class name, if the job failed.
+            created_at (Optional[float]): Unix timestamp of the submission. Defaults to now.
+            updated_at (Optional[float]): Unix timestamp of the last status change. Defaults to created_at.
+
+        Raises:
+            ValueError: If the webhook URL is not an HTTP or HTTPS URL.
+        """
+        if webhook_url and not webhook_url.startswith(("http://", "https://")):
+            raise ValueError("A URL de webhook deve começar com http:// ou https://.")
+        self.id = id or uuid.uuid4().hex
+        self.status = JobStatus(status)
+        self.webhook_url = webhook_url
+        self.category = category
+        self.details = details
+        self.error = error
+        self.error_type = error_type
+        self.created_at = created_at or time.time()
+        self.updated_at = updated_at or self.created_at
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def start(self) -> None:
+        self.status = JobStatus.RUNNING
+        self.updated_at = time.time()
+
+    def succeed(self, category: str, details: str) -> None:
+        self.status = JobStatus.SUCCEEDED
+        self.category = category
+        self.details = details
+        self.updated_at = time.time()
+
+    def fail(self, error: Exception) -> None:
+        self.status = JobStatus.FAILED
+        self.error = str(error)
+        self.error_type = error.__class__.__name__
+        self.updated_at = time.time()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "category": self.category,
+            "details": self.details,
+            "error": self.error,
+            "error_type": self.error_type,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
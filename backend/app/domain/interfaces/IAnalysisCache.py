@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class IAnalysisCache(ABC):
+
+    @abstractmethod
+    def make_key(self, processed_text: str, fingerprint: str) -> str:
+        """
+        Builds the cache key for an analysis.
+
+        Args:
+            processed_text (str): The preprocessed email content
+            fingerprint (str): Identifies the prompts and model parameters used by the analyzer
+
+        Returns:
+            str: The cache key
+        """
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[tuple]:
+        """
+        Returns the cached analysis for the given key.
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            Optional[tuple]: The category and details, or None if the key is missing or expired
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: tuple) -> None:
+        """
+        Stores an analysis in the cache.
+
+        Args:
+            key (str): The cache key
+            value (tuple): The category and details
+        """
+        pass
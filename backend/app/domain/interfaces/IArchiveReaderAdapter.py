@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import BinaryIO, List, Tuple, Union
+from app.domain.entities.document import Document
+
+class IArchiveReaderAdapter(ABC):
+
+    @abstractmethod
+    def is_archive(self, filename: str) -> bool:
+        """
+        Checks whether the given file is an archive holding many emails.
+
+        :param filename: The name of the uploaded file.
+        :return: True if the file must be expanded before the analysis.
+        """
+        pass
+
+    @abstractmethod
+    def expand(self, filename: str, content: Union[bytes, BinaryIO]) -> List[Tuple[str, Union[Document, Exception]]]:
+        """
+        Expands an archive into one document per email.
+
+        Entries that cannot become a document (e.g. too large) are returned with the
+        exception instead, so a single bad entry does not fail the whole archive.
+        An archive with too many entries, or too large once uncompressed, fails as a
+        whole, before its entries are read.
+
+        :param filename: The name of the archive.
+        :param content: The raw bytes of the archive, or a seekable binary file.
+        :return: The name of each entry and its document or error.
+        """
+        pass
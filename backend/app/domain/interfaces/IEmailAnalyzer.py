@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
 
 class IEmailAnalyzer(ABC):
 
     @abstractmethod
-    def analyse_email(self, email_content: str) -> tuple:
+    def analyse_email(self, email_content: str, category: Optional[str] = None) -> tuple:
         """
         Analyses the given email content and returns a tuple containing two elements:
         The first element is the category of the email, which can be either "Produtivo" or "Improdutivo".
@@ -11,8 +12,42 @@ class IEmailAnalyzer(ABC):
 
         Args:
             email_content (str): The content of the email to analyze
+            category (Optional[str]): The category, if already known (e.g. from a similar email);
+                the classification is then skipped
 
         Returns:
             tuple: A tuple containing the category and the suggestions for improving the email content
         """
         pass
+
+    async def stream_analysis(self, email_content: str, category: Optional[str] = None) -> AsyncIterator[dict]:
+        """
+        Analyses the given email content, yielding events as soon as they are available.
+
+        The first event is {"event": "category", "data": <category>}, followed by one or more
+        {"event": "token", "data": <piece of the suggestion>} events. Implementations without
+        a streaming upstream may yield the whole suggestion as a single token.
+
+        Args:
+            email_content (str): The content of the email to analyze
+            category (Optional[str]): The category, if already known; the classification is then skipped
+
+        Yields:
+            dict: The analysis events
+        """
+        category, details = await self.analyse_email(email_content, category)
+        yield {"event": "category", "data": category}
+        yield {"event": "token", "data": details}
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Identifies the prompts and model parameters used by the analyzer.
+
+        Results produced with different fingerprints must not be shared, so this value
+        is part of the analysis cache key.
+
+        Returns:
+            str: The fingerprint of the analyzer
+        """
+        return type(self).__name__
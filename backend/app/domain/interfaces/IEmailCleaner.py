@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+class IEmailCleaner(ABC):
+
+    @abstractmethod
+    def clean(self, text: str) -> Tuple[str, int]:
+        """
+        Removes the parts of an email that are not written by its sender: quoted
+        replies, forwarded headers, legal footers and signatures.
+
+        Args:
+            text (str): The raw text of the email.
+
+        Returns:
+            Tuple[str, int]: The cleaned text and the number of bytes (UTF-8) removed.
+        """
+        pass
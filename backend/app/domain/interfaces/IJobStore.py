@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from app.domain.entities.job import Job
+
+class IJobStore(ABC):
+
+    @abstractmethod
+    def save(self, job: Job) -> None:
+        """
+        Creates or updates a job.
+
+        Args:
+            job (Job): The job to be stored
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Returns the job with the given id.
+
+        Args:
+            job_id (str): The job id
+
+        Returns:
+            Optional[Job]: The job, or None if it does not exist or has expired
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Releases the resources held by the store.
+        """
+        pass
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 class INLPAdapter(ABC):
 
@@ -15,6 +16,15 @@ class INLPAdapter(ABC):
         7. Remove stopwords;
         8. Apply stemming to the tokens;
         9. Join the tokens back into a string;
+
+        Implementations may detect texts in other languages and apply the
+        stopwords and stemmer of that language instead.
         """
        
-        pass
\ No newline at end of file
+        pass
+
+    def preprocess_many(self, texts: List[str]) -> List[str]:
+        """
+        Preprocesses many texts, in order, with the same steps as `preprocess`.
+        """
+        return [self.preprocess(text) for text in texts]
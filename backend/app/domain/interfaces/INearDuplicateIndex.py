@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+class INearDuplicateIndex(ABC):
+
+    @abstractmethod
+    def find(self, processed_text: str, fingerprint: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Looks for a previously analysed email similar to the given one.
+
+        Args:
+            processed_text (str): The output of INLPAdapter.preprocess
+            fingerprint (str): Identifies the prompts and model parameters used by the analyzer;
+                only analyses made with the same fingerprint are reused
+
+        Returns:
+            Optional[Tuple[str, Optional[str]]]: The category of the most similar email and its
+            suggested response (None if responses are not reused), or None if no email is
+            similar enough
+        """
+        pass
+
+    @abstractmethod
+    def add(self, processed_text: str, fingerprint: str, value: tuple) -> None:
+        """
+        Indexes an analysed email.
+
+        Args:
+            processed_text (str): The output of INLPAdapter.preprocess
+            fingerprint (str): Identifies the prompts and model parameters used by the analyzer
+            value (tuple): The category and details
+        """
+        pass
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+class ITextClassifier(ABC):
+
+    @abstractmethod
+    def predict(self, processed_text: str) -> Tuple[str, float]:
+        """
+        Classifies a preprocessed email locally.
+
+        Args:
+            processed_text (str): The output of INLPAdapter.preprocess
+
+        Returns:
+            Tuple[str, float]: The most likely category and its calibrated probability
+        """
+        pass
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+
+class IWebhookNotifier(ABC):
+
+    @abstractmethod
+    async def check_url(self, url: str) -> None:
+        """
+        Checks that a webhook URL may be notified, before a job is accepted with it.
+
+        Args:
+            url (str): The webhook URL
+
+        Raises:
+            ValueError: If the URL is not allowed
+        """
+        pass
+
+    @abstractmethod
+    async def notify(self, url: str, payload: dict) -> bool:
+        """
+        Sends a payload to a webhook URL.
+
+        Args:
+            url (str): The webhook URL
+            payload (dict): The JSON payload
+
+        Returns:
+            bool: True if the webhook accepted the payload, False otherwise
+        """
+        pass
@@ -1,13 +1,21 @@
-from typing import Optional
+import hashlib
+from typing import AsyncIterator, Optional
 from app.domain.entities.document import Document
 from app.domain.interfaces.ITextReaderAdapter import ITextReaderAdapter
 from app.domain.interfaces.INLPAdapter import INLPAdapter
+from app.domain.interfaces.IEmailCleaner import IEmailCleaner
 from app.domain.interfaces.IEmailAnalyzer import IEmailAnalyzer
+from app.domain.interfaces.IAnalysisCache import IAnalysisCache
+from app.domain.interfaces.INearDuplicateIndex import INearDuplicateIndex
 from app.api.schemas.responses import AnalysisResponse
+from app.core.executor import CpuExecutor
+from app.core.singleflight import SingleFlight
+from app.core.metrics import CLEANED_BYTES, INPUT_SIZE, stage
+from app.core.config import settings
 
 class AnalysisUseCase:
 
-    def __init__(self, text_reader_adapter: ITextReaderAdapter, nlp_adapter: INLPAdapter, email_analyzer: IEmailAnalyzer):
+    def __init__(self, text_reader_adapter: ITextReaderAdapter, nlp_adapter: INLPAdapter, email_analyzer: IEmailAnalyzer, analysis_cache: Optional[IAnalysisCache] = None, executor: Optional[CpuExecutor] = None, single_flight: Optional[SingleFlight] = None, email_cleaner: Optional[IEmailCleaner] = None, inline_max_chars: Optional[int] = None, near_duplicate_index: Optional[INearDuplicateIndex] = None):
         """
         Initialize the AnalysisUseCase.
 
@@ -15,10 +23,27 @@ class AnalysisUseCase:
             text_reader_adapter (ITextReaderAdapter): The adapter to read text from a document.
             nlp_adapter (INLPAdapter): The adapter to perform NLP analysis on a text.
             email_analyzer (IEmailAnalyzer): The adapter to analyze an email.
+            analysis_cache (Optional[IAnalysisCache]): The cache of previous analyses. Defaults to None.
+            executor (Optional[CpuExecutor]): The pool that runs text extraction and NLP preprocessing
+                off the event loop. If None, they run inline. Defaults to None.
+            single_flight (Optional[SingleFlight]): Coalesces concurrent analyses of the same
+                preprocessed text into a single upstream call. Defaults to None.
+            email_cleaner (Optional[IEmailCleaner]): Removes quoted replies, footers and signatures
+                between the extraction and the NLP preprocessing. Defaults to None.
+            inline_max_chars (Optional[int]): Texts up to this length are cleaned and preprocessed
+                inline instead of in the executor. Defaults to `settings.EXECUTOR_INLINE_MAX_CHARS`.
+            near_duplicate_index (Optional[INearDuplicateIndex]): Finds previously analysed emails
+                similar to a cache miss, whose category is reused. Defaults to None.
         """
         self.text_reader_adapter = text_reader_adapter
         self.nlp_adapter = nlp_adapter
         self.email_analyzer = email_analyzer
+        self.analysis_cache = analysis_cache
+        self.executor = executor
+        self.single_flight = single_flight
+        self.email_cleaner = email_cleaner
+        self.inline_max_chars = settings.EXECUTOR_INLINE_MAX_CHARS if inline_max_chars is None else inline_max_chars
+        self.near_duplicate_index = near_duplicate_index
 
     async def execute(self, file: Optional[bytes] = None, text: Optional[str] = None) -> dict:
         """
@@ -31,17 +56,197 @@ class AnalysisUseCase:
         Returns:
             dict: A dictionary containing the analysis result and details.
         """
-        file_bytes = await file.read() if file else None
-        document = Document(
+        document = await self._build_document(file, text)
+        return await self.analyse_document(document)
+
+    async def stream(self, file: Optional[bytes] = None, text: Optional[str] = None) -> AsyncIterator[dict]:
+        """
+        Perform a streaming analysis on a given file or text.
+
+        The document is read and preprocessed before returning, so invalid inputs fail
+        before the response starts. The returned iterator yields the category event, the
+        suggestion token events and a final {"event": "done"} event.
+
+        Args:
+            file (Optional[bytes]): The file to be analyzed. Defaults to None.
+            text (Optional[str]): The text to be analyzed. Defaults to None.
+
+        Returns:
+            AsyncIterator[dict]: The analysis events.
+        """
+        document = await self._build_document(file, text)
+        processed_text = await self._preprocess(document)
+        return self._stream_events(processed_text)
+
+    async def analyse_document(self, document: Document) -> AnalysisResponse:
+        """
+        Perform an analysis on an already built document.
+
+        Args:
+            document (Document): The document to be analyzed.
+
+        Returns:
+            AnalysisResponse: The category and details of the document.
+        """
+        processed_text = await self._preprocess(document)
+        classification_result, details = await self._analyse(processed_text)
+        return AnalysisResponse(
+            category=classification_result,
+            details=details
+        )
+
+    async def _build_document(self, file, text: Optional[str]) -> Document:
+        """
+        Builds the document of an upload without reading it into memory.
+
+        The spooled file of the upload is handed to the document as is; the readers
+        parse it in place, so large uploads stay on disk instead of being copied to bytes.
+        """
+        return Document(
             filename=file.filename if file else None,
             size=file.size if file else None,
-            content=file_bytes,
+            content=file.file if file else None,
             text=text
         )
-        raw_text = self.text_reader_adapter.extract_text(document)
-        processed_text = self.nlp_adapter.preprocess(raw_text)
-        classification_result, details = await self.email_analyzer.analyse_email(processed_text)
-        return AnalysisResponse(
-            category=classification_result,
-            details=details
-        )
\ No newline at end of file
+
+    async def _preprocess(self, document: Document) -> str:
+        """
+        Extracts, cleans and preprocesses the text of the document.
+
+        Files go through the executor. Raw texts skip the extraction stage, and short
+        texts are cleaned and preprocessed inline, so small requests never queue behind
+        large PDFs. The cleaning runs before the NLP preprocessing, so the quoted history
+        and signatures are neither stemmed nor sent to the LLM. The stages, the input
+        sizes and the bytes removed by the cleaning are recorded in the metrics.
+        """
+        if document.text:
+            raw_text = document.text
+            INPUT_SIZE.observe(len(raw_text), kind="text_chars")
+        else:
+            if document.filetype is not None:
+                INPUT_SIZE.observe(document.size or 0, kind=f"{document.filetype.value}_bytes")
+            with stage("extract"):
+                raw_text = await self._run_cpu(self.text_reader_adapter, "extract_text", document)
+            INPUT_SIZE.observe(len(raw_text), kind="extracted_chars")
+        if self.email_cleaner is not None:
+            inline = len(raw_text) <= self.inline_max_chars
+            with stage("clean"):
+                raw_text, removed = await self._run_cpu(self.email_cleaner, "clean", raw_text, inline=inline)
+            CLEANED_BYTES.inc(removed)
+        inline = len(raw_text) <= self.inline_max_chars
+        with stage("preprocess"):
+            return await self._run_cpu(self.nlp_adapter, "preprocess", raw_text, inline=inline)
+
+    async def _run_cpu(self, adapter, method: str, *args, inline: bool = False):
+        if self.executor is None or inline:
+            return getattr(adapter, method)(*args)
+        return await self.executor.run(adapter, method, *args)
+
+    async def _analyse(self, processed_text: str) -> tuple:
+        """
+        Analyses the preprocessed text, reusing a cached result when available.
+
+        Concurrent analyses of the same text share a single in-flight upstream call,
+        which protects the upstream during a burst of identical emails, before any
+        result is cached.
+
+        Args:
+            processed_text (str): The preprocessed email content.
+
+        Returns:
+            tuple: The category and details of the email.
+        """
+        key = self._analysis_key(processed_text)
+        if self.analysis_cache is not None:
+            with stage("cache"):
+                cached = self.analysis_cache.get(key)
+            if cached is not None:
+                return cached
+
+        with stage("analyse"):
+            if self.single_flight is None:
+                return await self._analyse_uncached(processed_text, key)
+            return await self.single_flight.do(key, lambda: self._analyse_uncached(processed_text, key))
+
+    async def _analyse_uncached(self, processed_text: str, key: str) -> tuple:
+        """
+        Analyses a text missing from the cache, reusing the analysis of a similar email.
+
+        If the near-duplicate index knows a similar email, its category is reused and
+        only the suggested response is generated (or reused too, if the index keeps
+        them). Only analyses made from scratch are indexed, so a reused category
+        does not drift further from the email it was made for.
+        """
+        fingerprint = self.email_analyzer.fingerprint
+        match = self._find_near_duplicate(processed_text, fingerprint)
+        category, details = match or (None, None)
+        if details is not None:
+            result = (category, details)
+        else:
+            result = await self.email_analyzer.analyse_email(processed_text, category)
+            if match is None and self.near_duplicate_index is not None:
+                self.near_duplicate_index.add(processed_text, fingerprint, result)
+        if self.analysis_cache is not None:
+            self.analysis_cache.set(key, result)
+        return result
+
+    def _find_near_duplicate(self, processed_text: str, fingerprint: str) -> Optional[tuple]:
+        if self.near_duplicate_index is None:
+            return None
+        with stage("near_duplicate"):
+            return self.near_duplicate_index.find(processed_text, fingerprint)
+
+    def _analysis_key(self, processed_text: str) -> str:
+        fingerprint = self.email_analyzer.fingerprint
+        if self.analysis_cache is not None:
+            return self.analysis_cache.make_key(processed_text, fingerprint)
+        return hashlib.sha256(f"{fingerprint}\0{processed_text}".encode("utf-8")).hexdigest()
+
+    async def _stream_events(self, processed_text: str) -> AsyncIterator[dict]:
+        """
+        Streams the analysis of the preprocessed text, reusing a cached result, or the
+        analysis of a near-duplicate email, when available.
+
+        The complete result is only cached if the stream finishes; a client that
+        disconnects halfway leaves the cache untouched.
+
+        Args:
+            processed_text (str): The preprocessed email content.
+
+        Yields:
+            dict: The analysis events.
+        """
+        key = None
+        fingerprint = self.email_analyzer.fingerprint
+        if self.analysis_cache is not None:
+            key = self.analysis_cache.make_key(processed_text, fingerprint)
+            cached = self.analysis_cache.get(key)
+            if cached is not None:
+                category, details = cached
+                yield {"event": "category", "data": category}
+                yield {"event": "token", "data": details}
+                yield {"event": "done"}
+                return
+
+        match = self._find_near_duplicate(processed_text, fingerprint)
+        if match is not None and match[1] is not None:
+            yield {"event": "category", "data": match[0]}
+            yield {"event": "token", "data": match[1]}
+            yield {"event": "done"}
+            return
+
+        category = None
+        details = []
+        async for event in self.email_analyzer.stream_analysis(processed_text, match[0] if match else None):
+            if event["event"] == "category":
+                category = event["data"]
+            elif event["event"] == "token":
+                details.append(event["data"])
+            yield event
+
+        if category is not None:
+            if key is not None:
+                self.analysis_cache.set(key, (category, "".join(details)))
+            if match is None and self.near_duplicate_index is not None:
+                self.near_duplicate_index.add(processed_text, fingerprint, (category, "".join(details)))
+        yield {"event": "done"}
@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from app.api.decorators.exception import NotFoundError
+from app.core.job_queue import JobQueue
+from app.core.logger import logger
+from app.domain.entities.document import Document
+from app.domain.entities.job import Job
+from app.domain.interfaces.IJobStore import IJobStore
+from app.domain.interfaces.IWebhookNotifier import IWebhookNotifier
+from app.domain.useCases.analysis import AnalysisUseCase
+
+class AnalysisJobsUseCase:
+
+    def __init__(self, analysis_use_case: AnalysisUseCase, job_store: IJobStore, job_queue: JobQueue, webhook_notifier: Optional[IWebhookNotifier] = None):
+        """
+        Initialize the AnalysisJobsUseCase.
+
+        Args:
+            analysis_use_case (AnalysisUseCase): The use case that analyses each document.
+            job_store (IJobStore): The store of the job states and results.
+            job_queue (JobQueue): The queue whose workers run the analyses.
+            webhook_notifier (Optional[IWebhookNotifier]): The notifier of finished jobs. Defaults to None.
+        """
+        self.analysis_use_case = analysis_use_case
+        self.job_store = job_store
+        self.job_queue = job_queue
+        self.webhook_notifier = webhook_notifier
+
+    async def submit(self, file=None, text: Optional[str] = None, webhook_url: Optional[str] = None) -> Job:
+        """
+        Submits an analysis to be run in the background.
+
+        The input and the webhook URL are validated before the job is accepted. The
+        upload is copied, in a worker thread, to a spooled file owned by the job, since
+        the request's upload is closed as soon as the response is sent. The job is only
+        stored once the queue accepts it, so a rejected job is never left queued.
+
+        Args:
+            file: The file to be analyzed. Defaults to None.
+            text (Optional[str]): The text to be analyzed. Defaults to None.
+            webhook_url (Optional[str]): URL notified with the job once it finishes. Defaults to None.
+
+        Returns:
+            Job: The queued job.
+
+        Raises:
+            ValueError: If the input or the webhook URL is invalid.
+            ServiceUnavailableError: If the queue is full.
+        """
+        job = Job(webhook_url=webhook_url)
+        if webhook_url and self.webhook_notifier is not None:
+            await self.webhook_notifier.check_url(webhook_url)
+        content = tempfile.SpooledTemporaryFile(max_size=1024 * 1024) if file else None
+        try:
+            if file:
+                await run_in_threadpool(self._copy_upload, file.file, content)
+            document = Document(
+                filename=file.filename if file else None,
+                size=file.size if file else None,
+                content=content,
+                text=text
+            )
+            self.job_queue.submit(lambda: self._run(job, document))
+        except Exception:
+            if content is not None:
+                content.close()
+            raise
+        # Nothing is awaited since the submission, so no worker has started the job yet.
+        self.job_store.save(job)
+        return job
+
+    async def get(self, job_id: str) -> Job:
+        """
+        Returns the state of a job.
+
+        Args:
+            job_id (str): The job id.
+
+        Returns:
+            Job: The job, with its result or error once finished.
+
+        Raises:
+            NotFoundError: If the job does not exist or has expired.
+        """
+        job = self.job_store.get(job_id)
+        if job is None:
+            raise NotFoundError(f"Tarefa não encontrada: {job_id}")
+        return job
+
+    @staticmethod
+    def _copy_upload(source, target) -> None:
+        source.seek(0)
+        shutil.copyfileobj(source, target)
+
+    async def _run(self, job: Job, document: Document) -> None:
+        job.start()
+        self.job_store.save(job)
+        try:
+            result = await self.analysis_use_case.analyse_document(document)
+            job.succeed(result.category, result.details)
+        except Exception as e:
+            logger.error("Erro na tarefa %s: %s", job.id, e)
+            job.fail(e)
+        finally:
+            if document.content is not None:
+                document.content.close()
+        self.job_store.save(job)
+
+        if job.webhook_url and self.webhook_notifier is not None:
+            await self.webhook_notifier.notify(job.webhook_url, job.to_dict())
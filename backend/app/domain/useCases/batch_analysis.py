@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Tuple, Union
+from fastapi.concurrency import run_in_threadpool
+from app.domain.entities.document import Document
+from app.domain.interfaces.IArchiveReaderAdapter import IArchiveReaderAdapter
+from app.domain.useCases.analysis import AnalysisUseCase
+from app.api.schemas.responses import BatchAnalysisResponse, BatchItemResult
+
+class BatchAnalysisUseCase:
+
+    def __init__(self, analysis_use_case: AnalysisUseCase, archive_reader_adapter: IArchiveReaderAdapter, max_concurrency: int = 8, max_items: int = 1000):
+        """
+        Initialize the BatchAnalysisUseCase.
+
+        Args:
+            analysis_use_case (AnalysisUseCase): The use case that analyses each document.
+            archive_reader_adapter (IArchiveReaderAdapter): The adapter to expand ZIP and mbox archives.
+            max_concurrency (int): Maximum number of documents analysed at the same time. Defaults to 8.
+            max_items (int): Maximum number of documents accepted in a single batch. Defaults to 1000.
+        """
+        self.analysis_use_case = analysis_use_case
+        self.archive_reader_adapter = archive_reader_adapter
+        self.max_concurrency = max_concurrency
+        self.max_items = max_items
+
+    async def execute(self, files: Optional[List] = None, texts: Optional[List[str]] = None) -> BatchAnalysisResponse:
+        """
+        Perform an analysis on many files and texts.
+
+        ZIP and mbox files are expanded into one item per email. Identical documents are
+        analysed only once and every item gets its own result or error.
+
+        Args:
+            files (Optional[List]): The uploaded files to be analyzed. Defaults to None.
+            texts (Optional[List[str]]): The texts to be analyzed. Defaults to None.
+
+        Returns:
+            BatchAnalysisResponse: The per-item results and errors.
+
+        Raises:
+            ValueError: If the batch is empty or has more items than allowed.
+        """
+        entries = []
+        for text in texts or []:
+            entries.append((None, self._build_document(text=text)))
+        for file in files or []:
+            entries.extend(await self._read_file(file))
+            if len(entries) > self.max_items:
+                break
+
+        if not entries:
+            raise ValueError("O lote deve ter ao menos um arquivo ou texto.")
+        if len(entries) > self.max_items:
+            raise ValueError(f"O lote não pode ter mais que {self.max_items} itens.")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: Dict[str, asyncio.Task] = {}
+        item_tasks = []
+        for source, document in entries:
+            if isinstance(document, Exception):
+                item_tasks.append((source, document))
+                continue
+            try:
+                key = await self._document_key(document)
+            except Exception as e:
+                item_tasks.append((source, e))
+                continue
+            if key not in tasks:
+                tasks[key] = asyncio.ensure_future(self._analyse(document, semaphore))
+            item_tasks.append((source, tasks[key]))
+
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        items = [
+            self._item_result(index, source, outcome)
+            for index, (source, outcome) in enumerate(item_tasks)
+        ]
+        failed = sum(1 for item in items if item.error_type)
+        return BatchAnalysisResponse(
+            total=len(items),
+            succeeded=len(items) - failed,
+            failed=failed,
+            items=items
+        )
+
+    async def _read_file(self, file) -> List[Tuple[str, Union[Document, Exception]]]:
+        """
+        Reads an uploaded file, expanding it if it is an archive.
+
+        Expanding reads the archive, so it runs in the thread pool.
+
+        Args:
+            file: The uploaded file.
+
+        Returns:
+            List[Tuple[str, Union[Document, Exception]]]: The source name of each item and its document or error.
+        """
+        filename = file.filename or ""
+        try:
+            if self.archive_reader_adapter.is_archive(filename):
+                return await run_in_threadpool(self.archive_reader_adapter.expand, filename, file.file)
+        except Exception as e:
+            return [(filename, e)]
+        return [(filename, self._build_document(filename=filename, size=file.size, content=file.file))]
+
+    def _build_document(self, **kwargs) -> Union[Document, Exception]:
+        try:
+            return Document(**kwargs)
+        except Exception as e:
+            return e
+
+    async def _document_key(self, document: Document) -> str:
+        """
+        Returns a key that is equal for documents with the same content.
+
+        Texts and in-memory contents are hashed right away. Contents with a `content_key`
+        (ZIP members) are keyed by it without being read, and other files (the spooled
+        uploads) are hashed in the thread pool.
+
+        Args:
+            document (Document): The document.
+
+        Returns:
+            str: The key of the document.
+        """
+        if document.text:
+            return self._hash(b"text", document.text.encode("utf-8"))
+        content = document.content
+        if content is None or isinstance(content, (bytes, bytearray)):
+            return self._hash(document.filetype.value.encode("utf-8"), content or b"")
+        content_key = getattr(content, "content_key", None)
+        if content_key is not None:
+            return f"{document.filetype.value}\0{content_key}"
+        return await run_in_threadpool(self._hash_file, document.filetype.value.encode("utf-8"), content)
+
+    def _hash(self, kind: bytes, data: bytes) -> str:
+        return hashlib.sha256(kind + b"\0" + data).hexdigest()
+
+    def _hash_file(self, kind: bytes, content) -> str:
+        digest = hashlib.sha256(kind + b"\0")
+        content.seek(0)
+        for chunk in iter(lambda: content.read(1024 * 1024), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    async def _analyse(self, document: Document, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            return await self.analysis_use_case.analyse_document(document)
+
+    def _item_result(self, index: int, source: Optional[str], outcome: Union[asyncio.Task, Exception]) -> BatchItemResult:
+        error = outcome if isinstance(outcome, Exception) else outcome.exception()
+        if error is not None:
+            return BatchItemResult(
+                index=index,
+                source=source,
+                error=str(error),
+                error_type=error.__class__.__name__
+            )
+        result = outcome.result()
+        return BatchItemResult(
+            index=index,
+            source=source,
+            category=result.category,
+            details=result.details
+        )
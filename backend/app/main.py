@@ -1,11 +1,17 @@
 from contextlib import asynccontextmanager
+import time
 from app.core.nltk_loader import download_nltk_data
+from app.core.state import build_app_state, close_app_state, warm_up
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi import APIRouter
 from app.api.controllers.analysis import analysis_router
+from app.api.controllers.health import health_router
+from app.api.controllers.metrics import metrics_router
+from app.api.middlewares.body_size_limit import BodySizeLimitMiddleware
+from app.api.middlewares.metrics import MetricsMiddleware
 from app.core.config import settings
 from app.core.logger import logger
 
@@ -13,13 +19,26 @@ from app.core.logger import logger
 async def lifespan(app: FastAPI):
     logger.info("Iniciando aplicação...")
     logger.debug("Debug mode: %s", settings.DEBUG)
+    start = time.perf_counter()
     try:
-        download_nltk_data()
-        logger.info("NLTK data baixado com sucesso.")
+        download_nltk_data(
+            data_dir=settings.NLTK_DATA_DIR,
+            offline=settings.NLTK_OFFLINE,
+            tokenizer=settings.NLP_TOKENIZER,
+            verify_ssl=settings.NLTK_VERIFY_SSL,
+        )
+        logger.info("NLTK data disponível em %.0f ms.", (time.perf_counter() - start) * 1000)
     except Exception as e:
-        logger.error("Erro ao baixar NLTK data: %s", e)
+        logger.error("Erro ao carregar NLTK data: %s", e)
+        if settings.NLTK_OFFLINE:
+            raise
+    build_app_state(app.state)
+    app.state.job_queue.start()
+    await warm_up(app.state)
+    logger.info("Inicialização concluída em %.0f ms (pronta: %s).", (time.perf_counter() - start) * 1000, app.state.ready)
     yield
     logger.info("Finalizando aplicação...")
+    await close_app_state(app.state)
 
 app = FastAPI(
     title="Classificator Emails API",
@@ -33,8 +52,17 @@ app = FastAPI(
 if not settings.DEBUG:
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
     
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=settings.MAX_REQUEST_BODY_SIZE,
+    path_limits={"/batch": settings.MAX_BATCH_BODY_SIZE},
+)
+
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 origins = settings.CORS_ORIGINS.split(",") if "," in settings.CORS_ORIGINS else [settings.CORS_ORIGINS]
 
 app.add_middleware(
@@ -48,5 +76,9 @@ app.add_middleware(
 api_router = APIRouter(prefix="/api")
 
 api_router.include_router(analysis_router)
+api_router.include_router(health_router)
+
+app.include_router(api_router)
 
-app.include_router(api_router)
\ No newline at end of file
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
@@ -0,0 +1,171 @@
+"""
+Shared helpers of the benchmarks: the mock corpus, background servers, latency
+percentiles, memory readings and the JSON reports compared between commits.
+
+Every benchmark accepts --output; without it, the report is written to
+benchmarks/results/<name>-<commit>-<timestamp>.json.
+"""
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import uvicorn
+
+BACKEND = Path(__file__).resolve().parents[1]
+ROOT = BACKEND.parent
+RESULTS_DIR = BACKEND / "benchmarks" / "results"
+
+
+def mock_files() -> List[Tuple[str, bytes]]:
+    """
+    Returns the files of the mocks directory as (filename, content) pairs.
+
+    Files without a TXT or PDF extension (e.g. mensagem_copiar_produtiva) are
+    plain text and get a ".txt" suffix.
+    """
+    files = []
+    for path in sorted((ROOT / "mocks").iterdir()):
+        filename = path.name if path.suffix in (".txt", ".pdf") else path.name + ".txt"
+        files.append((filename, path.read_bytes()))
+    return files
+
+
+def request_texts() -> List[str]:
+    """
+    Returns the title and body of each entry of requests.jsonl, if the file exists.
+    """
+    path = ROOT / "requests.jsonl"
+    if not path.exists():
+        return []
+    texts = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            record = json.loads(line)
+            texts.append(f"{record.get('title', '')}\n{record.get('body', '')}")
+    return texts
+
+
+@contextlib.contextmanager
+def run_app_in_thread(app, host: str = "127.0.0.1", port: int = 8900):
+    """
+    Runs an ASGI application with uvicorn in a background thread for the duration of the block.
+
+    Yields:
+        str: The base URL of the running server.
+    """
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def percentiles(latencies_ms: Iterable[float]) -> Dict[str, Optional[float]]:
+    """
+    Summarizes latencies with the nearest-rank percentiles.
+
+    Returns:
+        Dict[str, Optional[float]]: count, mean, p50, p95, p99 and max, in milliseconds.
+    """
+    ordered = sorted(latencies_ms)
+    if not ordered:
+        return {"count": 0, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+
+    def rank(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))], 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": rank(0.50),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def rss_mb(pid: Optional[int] = None) -> Dict[str, Optional[float]]:
+    """
+    Reads the current and peak resident memory of a process.
+
+    Uses /proc on Linux. Elsewhere only the peak of the current process is known.
+
+    Args:
+        pid (Optional[int]): The process id. Defaults to the current process.
+
+    Returns:
+        Dict[str, Optional[float]]: "rss_mb" and "peak_rss_mb".
+    """
+    status = Path(f"/proc/{pid or 'self'}/status")
+    if status.exists():
+        fields = {}
+        for line in status.read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                fields[key] = int(value.split()[0]) / 1024
+        return {"rss_mb": round(fields.get("VmRSS", 0), 1), "peak_rss_mb": round(fields.get("VmHWM", 0), 1)}
+    if pid is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+        return {"rss_mb": None, "peak_rss_mb": round(peak_mb, 1)}
+    return {"rss_mb": None, "peak_rss_mb": None}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_report(name: str, parameters: dict, results: dict, output: Optional[str] = None) -> Path:
+    """
+    Writes a benchmark report as JSON.
+
+    The report records the commit, the environment and the parameters next to the
+    results, so reports of different commits can be compared field by field.
+
+    Args:
+        name (str): The benchmark name.
+        parameters (dict): The parameters of the run.
+        results (dict): The measurements.
+        output (Optional[str]): The report path. Defaults to benchmarks/results/<name>-<commit>-<timestamp>.json.
+
+    Returns:
+        Path: The path of the written report.
+    """
+    now = datetime.now(timezone.utc)
+    commit = git_commit()
+    report = {
+        "benchmark": name,
+        "commit": commit,
+        "timestamp": now.isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "parameters": parameters,
+        "results": results,
+    }
+    path = Path(output) if output else RESULTS_DIR / f"{name}-{commit}-{now.strftime('%Y%m%dT%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"relatório salvo em {path}")
+    return path
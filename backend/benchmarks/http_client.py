@@ -0,0 +1,75 @@
+"""
+Compares a new HTTPX client per call against the shared pooled client.
+
+Usage:
+    python -m benchmarks.http_client --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("API_TOKEN", "benchmark")
+
+import httpx
+from app.core.http_client import create_http_client
+from benchmarks.harness import percentiles, write_report
+from benchmarks.stub_llm import run_stub_server
+
+PAYLOAD = {
+    "model": "stub",
+    "messages": [{"role": "system", "content": "Classifique o email."}],
+    "max_tokens": 5,
+}
+
+
+async def _per_call(url: str) -> None:
+    async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
+        response = await client.post(url, json=PAYLOAD)
+    response.raise_for_status()
+
+
+def _pooled(client: httpx.AsyncClient):
+    async def call(url: str) -> None:
+        response = await client.post(url, json=PAYLOAD)
+        response.raise_for_status()
+    return call
+
+
+async def _run(call, url: str, total: int, concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+async def main(total: int, concurrency: int, latency_ms: float) -> dict:
+    with run_stub_server(latency_ms=latency_ms) as url:
+        per_call = await _run(_per_call, url, total, concurrency)
+        client = create_http_client()
+        try:
+            pooled = await _run(_pooled(client), url, total, concurrency)
+        finally:
+            await client.aclose()
+    results = {"per_call": percentiles(per_call), "pooled": percentiles(pooled)}
+    for name, summary in results.items():
+        print(f"{name:<10} p50={summary['p50']:7.2f}ms  p99={summary['p99']:7.2f}ms")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--output", help="Caminho do relatório JSON")
+    args = parser.parse_args()
+    results = asyncio.run(main(args.requests, args.concurrency, args.latency_ms))
+    write_report("http_client", vars(args), results, args.output)
@@ -0,0 +1,206 @@
+"""
+End-to-end load test of the backend at a target request rate.
+
+The texts of requests.jsonl (and, with --files, the mock TXT/PDF files) are
+replayed against POST /api/analysis on an open-loop schedule: request i is sent
+at i / rps seconds whatever the latency of the previous ones, so a slow server
+shows up as growing latency instead of a lower request rate.
+
+By default the backend is started as a uvicorn subprocess pointed at the local
+stub LLM (see benchmarks/stub_llm.py), and its memory is read from /proc. Use
+--url to target a server that is already running instead.
+
+Usage:
+    python -m benchmarks.load_test --rps 50 --duration 20
+    python -m benchmarks.load_test --rps 20 --files --stub-fault-rate 0.1 --stub-retry-after 1
+    python -m benchmarks.load_test --url http://localhost:8000 --rps 10
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+import httpx
+from benchmarks.harness import BACKEND, mock_files, percentiles, request_texts, rss_mb, run_app_in_thread, write_report
+from benchmarks.stub_llm import create_stub_app, parse_model_options
+
+
+def build_workload(use_files: bool) -> List[dict]:
+    """
+    Builds the request bodies replayed by the load test.
+
+    Args:
+        use_files (bool): Whether the mock files are uploaded in addition to the texts.
+
+    Returns:
+        List[dict]: The keyword arguments of each `httpx.AsyncClient.post` call.
+    """
+    texts = request_texts() or [content.decode("utf-8", "ignore") for name, content in mock_files() if name.endswith(".txt")]
+    workload = [{"data": {"text": text}} for text in texts]
+    if use_files:
+        workload += [{"files": {"file": (name, content)}} for name, content in mock_files()]
+    return workload
+
+
+def _with_suffix(body: dict, index: int) -> dict:
+    if "data" not in body:
+        return body
+    # Letters only: numbers are dropped by the NLP preprocessing and would not change the cache key.
+    suffix = "".join(chr(ord("a") + int(digit)) for digit in str(index))
+    return {"data": {"text": f"{body['data']['text']}\nprotocolo {suffix}"}}
+
+
+async def _send(client: httpx.AsyncClient, url: str, body: dict, results: list) -> None:
+    start = time.perf_counter()
+    try:
+        response = await client.post(url, **body)
+        status = str(response.status_code)
+    except httpx.HTTPError as e:
+        status = e.__class__.__name__
+    results.append(((time.perf_counter() - start) * 1000, status))
+
+
+async def run_load(base_url: str, workload: List[dict], rps: float, total: int, timeout: float, unique: bool = True) -> Tuple[list, float]:
+    """
+    Sends `total` requests at `rps` requests per second, cycling through the workload.
+
+    With `unique`, each text request gets a distinct suffix, so the result cache
+    and the request coalescing do not hide the upstream latency.
+
+    Returns:
+        Tuple[list, float]: The (latency in ms, status) of each request and the elapsed seconds.
+    """
+    url = f"{base_url}/api/analysis"
+    results: list = []
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        tasks = []
+        for index in range(total):
+            delay = start + index / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            body = workload[index % len(workload)]
+            if unique:
+                body = _with_suffix(body, index)
+            tasks.append(asyncio.create_task(_send(client, url, body, results)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+@contextlib.contextmanager
+def run_backend(port: int, env: dict, workers: int):
+    """
+    Starts the backend as a uvicorn subprocess and waits for /api/health/ready.
+
+    Yields:
+        Tuple[str, subprocess.Popen]: The base URL and the server process.
+    """
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning", "--workers", str(workers)]
+    process = subprocess.Popen(command, cwd=BACKEND, env={**os.environ, **env})
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError("O servidor encerrou durante a inicialização.")
+            with contextlib.suppress(httpx.HTTPError):
+                if httpx.get(f"{base_url}/api/health/ready", timeout=1).status_code == 200:
+                    break
+            if time.monotonic() > deadline:
+                raise RuntimeError("O servidor não ficou pronto em 60 s.")
+            time.sleep(0.2)
+        yield base_url, process
+    finally:
+        process.terminate()
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            process.wait(timeout=10)
+        if process.poll() is None:
+            process.kill()
+
+
+def summarize(results: list, elapsed: float, memory: Optional[dict], stub_counters: Optional[dict]) -> dict:
+    statuses = Counter(status for _, status in results)
+    ok = [latency for latency, status in results if status == "200"]
+    return {
+        "requests": len(results),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else None,
+        "success_rate": round(len(ok) / len(results), 4) if results else None,
+        "statuses": dict(statuses),
+        "latency_ms": percentiles(latency for latency, _ in results),
+        "latency_ok_ms": percentiles(ok),
+        "server_memory": memory,
+        "stub": stub_counters,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Servidor já em execução; sem ele o backend é iniciado localmente")
+    parser.add_argument("--rps", type=float, default=20.0, help="Taxa alvo de requisições por segundo")
+    parser.add_argument("--duration", type=float, default=15.0, help="Duração em segundos")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--files", action="store_true", help="Também envia os arquivos de mocks/")
+    parser.add_argument("--repeat", action="store_true", help="Repete os textos sem sufixo (exercita cache e coalescência)")
+    parser.add_argument("--near-duplicates", action="store_true", help="Ativa o índice de quase-duplicatas (os textos com sufixo passam a reaproveitar a categoria)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn do backend local")
+    parser.add_argument("--port", type=int, default=8950)
+    parser.add_argument("--stub-port", type=int, default=8951)
+    parser.add_argument("--stub-latency-ms", type=float, default=200.0)
+    parser.add_argument("--stub-fault-rate", type=float, default=0.0)
+    parser.add_argument("--stub-fault-status", type=int, default=503)
+    parser.add_argument("--stub-retry-after", type=float, default=None)
+    parser.add_argument("--stub-model-latency", action="append", metavar="MODEL=MS", help="Latência do stub para um modelo específico")
+    parser.add_argument("--stub-model-reply", action="append", metavar="MODEL=TEXTO", help="Resposta do stub para um modelo específico")
+    parser.add_argument("--output", help="Caminho do relatório JSON")
+    args = parser.parse_args(argv)
+
+    workload = build_workload(args.files)
+    unique = not args.repeat
+    total = max(1, int(args.rps * args.duration))
+    parameters = {**vars(args), "workload_size": len(workload), "total_requests": total}
+
+    if args.url:
+        results, elapsed = asyncio.run(run_load(args.url, workload, args.rps, total, args.timeout, unique))
+        summary = summarize(results, elapsed, None, None)
+    else:
+        stub = create_stub_app(
+            latency_ms=args.stub_latency_ms,
+            fault_rate=args.stub_fault_rate,
+            fault_status=args.stub_fault_status,
+            retry_after=args.stub_retry_after,
+            seed=0,
+            model_latency_ms={model: float(ms) for model, ms in parse_model_options(args.stub_model_latency).items()},
+            model_reply=parse_model_options(args.stub_model_reply),
+        )
+        with run_app_in_thread(stub, port=args.stub_port) as stub_url:
+            env = {
+                "API_URL": f"{stub_url}/v1/chat/completions",
+                "API_TOKEN": os.environ.get("API_TOKEN", "benchmark"),
+                "DEBUG": "true",
+                "NEAR_DUPLICATE_ENABLED": str(args.near_duplicates).lower(),
+            }
+            with run_backend(args.port, env, args.workers) as (base_url, process):
+                results, elapsed = asyncio.run(run_load(base_url, workload, args.rps, total, args.timeout, unique))
+                memory = rss_mb(process.pid) if args.workers == 1 else None
+            summary = summarize(results, elapsed, memory, dict(stub.state.counters))
+
+    latency = summary["latency_ms"]
+    print(f"{summary['requests']} requisições em {summary['elapsed_s']} s "
+          f"({summary['throughput_rps']} req/s), status {summary['statuses']}")
+    print(f"latência p50={latency['p50']} ms  p95={latency['p95']} ms  p99={latency['p99']} ms")
+    if summary["server_memory"]:
+        print(f"memória do servidor: {summary['server_memory']}")
+    write_report("load_test", parameters, summary, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Checks NLPAdapter.preprocess against the original implementation and measures
+its throughput in docs/sec. The same check runs under pytest, in
+tests/test_nlp_equivalence.py.
+
+The original implementation only knows Portuguese, so the adapters are compared
+with the language detection off; English texts would otherwise take the
+English pipeline.
+
+The corpus is built from the mock emails, the bodies of requests.jsonl (if
+present) and randomly generated texts that stress accents, Unicode whitespace,
+URLs, numbers and the contractions handled by the tokenizer.
+
+Usage:
+    python -m benchmarks.nlp_preprocess --docs 2000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+os.environ.setdefault("API_TOKEN", "benchmark")
+
+from nltk.corpus import stopwords
+from nltk.stem import RSLPStemmer
+from nltk.tokenize import word_tokenize
+from app.adapters.NLPAdapter import NLPAdapter
+from app.adapters.TextReaderAdapter import TextReaderAdapter
+from app.domain.entities.document import Document
+from benchmarks.harness import mock_files, request_texts, write_report
+
+
+class ReferenceNLP:
+    """
+    The original NLPAdapter.preprocess, kept verbatim as the equivalence oracle.
+    """
+
+    _url_pattern = re.compile(r'http\S+|www\S+|https\S+')
+    _symbol_pattern = re.compile(r'[^a-z0-9áàâãéèêíïóôõöúçñ\s]')
+    _number_pattern = re.compile(r'\b\d+\b')
+    _space_pattern = re.compile(r'\s+')
+
+    def __init__(self):
+        self.stop_words = set(stopwords.words('portuguese'))
+        self.stemmer = RSLPStemmer()
+
+    def _remove_accents(self, text: str) -> str:
+        return ''.join(
+            c for c in unicodedata.normalize('NFD', text)
+            if unicodedata.category(c) != 'Mn'
+        )
+
+    def preprocess(self, text: str) -> str:
+        text = text.lower()
+        text = self._url_pattern.sub(' ', text)
+        text = self._symbol_pattern.sub(' ', text)
+        text = self._remove_accents(text)
+        text = self._number_pattern.sub(' ', text)
+        text = self._space_pattern.sub(' ', text).strip()
+        tokens = word_tokenize(text, language='portuguese')
+        return " ".join(
+            self.stemmer.stem(word)
+            for word in tokens
+            if word not in self.stop_words and len(word) > 2
+        )
+
+
+def load_corpus() -> list:
+    reader = TextReaderAdapter(max_chars=0)
+    texts = [
+        reader.extract_text(Document(filename=filename, size=len(content), content=content))
+        for filename, content in mock_files()
+    ]
+    return texts + request_texts()
+
+
+def random_texts(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    words = ["solicitação", "atualização", "Você", "não", "é", "obrigado", "cannot", "gonna", "wanna",
+             "gotta", "lemme", "gimme", "123", "abc123", "2024", "ÀÉÎÕÜ", "naïve", "coöperar", "ñandu",
+             "İstanbul", "https://exemplo.com/a?b=1", "www.site.com.br", "e-mail", "R$ 10,50", "é.", "São"]
+    separators = [" ", "  ", "\n", "\t", " ", " ", "　", ", ", ". ", "!", "?", "—", "́"]
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 60)):
+            parts.append(rng.choice(words) if rng.random() < 0.8 else chr(rng.randint(32, 0x2FFF)))
+            parts.append(rng.choice(separators))
+        texts.append("".join(parts))
+    return texts
+
+
+def throughput(preprocess, texts: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            preprocess(text)
+    return len(texts) * repeat / (time.perf_counter() - start)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=2000, help="Number of random texts in the equivalence check")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Caminho do relatório JSON")
+    args = parser.parse_args(argv)
+
+    reference = ReferenceNLP()
+    engines = {
+        "punkt": NLPAdapter(tokenizer="punkt", language_detection=False),
+        "regex": NLPAdapter(tokenizer="regex", language_detection=False),
+    }
+    corpus = load_corpus()
+    check = corpus + random_texts(args.docs)
+
+    mismatches = 0
+    for text in check:
+        expected = reference.preprocess(text)
+        for name, engine in engines.items():
+            if engine.preprocess(text) != expected:
+                mismatches += 1
+                print(f"[{name}] divergência: {text[:80]!r}")
+    print(f"equivalência: {len(check)} textos, {mismatches} divergências")
+
+    results = {"equivalence": {"texts": len(check), "mismatches": mismatches}, "docs_per_s": {}}
+    results["docs_per_s"]["reference"] = round(throughput(reference.preprocess, corpus, args.repeat), 1)
+    for name, engine in engines.items():
+        results["docs_per_s"][name] = round(throughput(engine.preprocess, corpus, args.repeat), 1)
+    for name, rate in results["docs_per_s"].items():
+        print(f"{name:<12} {rate:10.1f} docs/s")
+
+    write_report("nlp_preprocess", {**vars(args), "corpus_size": len(corpus)}, results, args.output)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
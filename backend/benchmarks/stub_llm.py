@@ -0,0 +1,140 @@
+"""
+Local stub of an OpenAI-compatible chat-completions server.
+
+It answers every request with a fixed completion after a configurable delay,
+so the backend can be benchmarked without calling the real upstream. Faults can
+be injected to exercise the retry, rate limiting and circuit breaker paths: a
+fraction of the requests fails with a given status (and Retry-After header),
+or the first N requests fail. The latency and the reply can be set per model,
+to exercise the model routes (e.g. a fast classification model).
+
+Usage:
+    python -m benchmarks.stub_llm --port 8900 --latency-ms 50
+    python -m benchmarks.stub_llm --fault-rate 0.3 --fault-status 429 --retry-after 1
+    python -m benchmarks.stub_llm --model-latency meta-llama/Llama-3.1-8B-Instruct=10 --model-reply meta-llama/Llama-3.1-8B-Instruct=Improdutivo
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+from typing import Dict, List, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from benchmarks.harness import run_app_in_thread
+
+
+def create_stub_app(
+    latency_ms: float = 50.0,
+    reply: str = "Produtivo",
+    fault_rate: float = 0.0,
+    fault_status: int = 503,
+    retry_after: Optional[float] = None,
+    fail_first: int = 0,
+    seed: Optional[int] = None,
+    model_latency_ms: Optional[Dict[str, float]] = None,
+    model_reply: Optional[Dict[str, str]] = None,
+) -> FastAPI:
+    """
+    Creates the stub FastAPI application.
+
+    Args:
+        latency_ms (float): Delay applied to every completion, in milliseconds.
+        reply (str): The content returned in every completion.
+        fault_rate (float): Fraction of the requests answered with `fault_status`.
+        fault_status (int): Status code of the injected faults.
+        retry_after (Optional[float]): Retry-After header of the injected faults, in seconds.
+        fail_first (int): Number of initial requests that always fail.
+        seed (Optional[int]): Seed of the fault sampling.
+        model_latency_ms (Optional[Dict[str, float]]): Delay of the completions of specific models.
+        model_reply (Optional[Dict[str, str]]): Content returned to specific models.
+
+    Returns:
+        FastAPI: The stub application. `app.state.counters` counts the requests and
+        faults, and the requests of each model.
+    """
+    app = FastAPI()
+    app.state.counters = {"requests": 0, "faults": 0, "models": {}}
+    model_latency_ms = model_latency_ms or {}
+    model_reply = model_reply or {}
+    rng = random.Random(seed)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        model = payload.get("model", "")
+        app.state.counters["requests"] += 1
+        app.state.counters["models"][model] = app.state.counters["models"].get(model, 0) + 1
+        delay_ms = model_latency_ms.get(model, latency_ms)
+        await asyncio.sleep(delay_ms / 1000)
+        if app.state.counters["requests"] <= fail_first or rng.random() < fault_rate:
+            app.state.counters["faults"] += 1
+            headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else {}
+            return JSONResponse({"error": "injected fault"}, status_code=fault_status, headers=headers)
+        content = model_reply.get(model, reply)
+        if payload.get("stream"):
+            return StreamingResponse(_stream(content, delay_ms), media_type="text/event-stream")
+        if payload.get("response_format", {}).get("type") == "json_object":
+            content = json.dumps({"categoria": content, "resposta": "Recebemos sua solicitação."})
+        return {
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    return app
+
+
+async def _stream(content: str, latency_ms: float):
+    for word in content.split(" "):
+        chunk = {"choices": [{"index": 0, "delta": {"content": word + " "}}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(latency_ms / 1000)
+    yield "data: [DONE]\n\n"
+
+
+def parse_model_options(values: Optional[List[str]]) -> Dict[str, str]:
+    """
+    Parses repeated MODEL=VALUE command line options.
+    """
+    options = {}
+    for value in values or []:
+        model, _, option = value.rpartition("=")
+        options[model] = option
+    return options
+
+
+@contextlib.contextmanager
+def run_stub_server(host: str = "127.0.0.1", port: int = 8900, **app_options):
+    """
+    Runs the stub server in a background thread for the duration of the block.
+
+    Yields:
+        str: The chat-completions URL of the running stub.
+    """
+    with run_app_in_thread(create_stub_app(**app_options), host=host, port=port) as base_url:
+        yield f"{base_url}/v1/chat/completions"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--fault-rate", type=float, default=0.0)
+    parser.add_argument("--fault-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--fail-first", type=int, default=0)
+    parser.add_argument("--model-latency", action="append", metavar="MODEL=MS", help="Latência de um modelo específico")
+    parser.add_argument("--model-reply", action="append", metavar="MODEL=TEXTO", help="Resposta de um modelo específico")
+    args = parser.parse_args()
+    app = create_stub_app(
+        latency_ms=args.latency_ms,
+        fault_rate=args.fault_rate,
+        fault_status=args.fault_status,
+        retry_after=args.retry_after,
+        fail_first=args.fail_first,
+        model_latency_ms={model: float(ms) for model, ms in parse_model_options(args.model_latency).items()},
+        model_reply=parse_model_options(args.model_reply),
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,80 @@
+"""
+Measures TextReaderAdapter.extract_text over the mock corpus and over a large
+synthetic PDF (the mock PDFs repeated page by page), with and without the
+character budget.
+
+Usage:
+    python -m benchmarks.text_reader --repeat 20 --pages 200
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault("API_TOKEN", "benchmark")
+
+from PyPDF2 import PdfReader, PdfWriter
+from app.adapters.TextReaderAdapter import TextReaderAdapter
+from app.domain.entities.document import Document
+from benchmarks.harness import mock_files, percentiles, write_report
+
+
+def synthetic_pdf(pages: int) -> bytes:
+    """
+    Builds a PDF with `pages` pages by repeating the pages of the mock PDFs.
+    """
+    sources = [PdfReader(io.BytesIO(content)) for name, content in mock_files() if name.endswith(".pdf")]
+    writer = PdfWriter()
+    for index in range(pages):
+        source = sources[index % len(sources)]
+        writer.add_page(source.pages[index % len(source.pages)])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def measure(adapter: TextReaderAdapter, files: list, repeat: int) -> dict:
+    latencies = []
+    total_bytes = 0
+    for _ in range(repeat):
+        for filename, content in files:
+            start = time.perf_counter()
+            adapter.extract_text(Document(filename=filename, size=len(content), content=io.BytesIO(content)))
+            latencies.append((time.perf_counter() - start) * 1000)
+            total_bytes += len(content)
+    elapsed = sum(latencies) / 1000
+    return {
+        "docs_per_s": round(len(latencies) / elapsed, 2),
+        "mb_per_s": round(total_bytes / (1024 * 1024) / elapsed, 2),
+        "latency_ms": percentiles(latencies),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Repetições do corpus de mocks")
+    parser.add_argument("--pages", type=int, default=200, help="Páginas do PDF sintético")
+    parser.add_argument("--budget", type=int, default=20000, help="Orçamento de caracteres comparado com o ilimitado")
+    parser.add_argument("--output", help="Caminho do relatório JSON")
+    args = parser.parse_args(argv)
+
+    corpus = mock_files()
+    large = [("grande.pdf", synthetic_pdf(args.pages))]
+    results = {}
+    for label, max_chars in (("unlimited", 0), ("budget", args.budget)):
+        adapter = TextReaderAdapter(max_chars=max_chars)
+        results[label] = {
+            "mocks": measure(adapter, corpus, args.repeat),
+            "large_pdf": measure(adapter, large, 1),
+        }
+        mocks, large_pdf = results[label]["mocks"], results[label]["large_pdf"]
+        print(f"{label:<10} mocks {mocks['docs_per_s']:8.1f} docs/s   "
+              f"PDF de {args.pages} páginas {large_pdf['latency_ms']['p50']:9.1f} ms")
+
+    write_report("text_reader", {**vars(args), "large_pdf_bytes": len(large[0][1])}, results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration of the production serving mode.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The application is imported and the read-only resources (NLTK data, NLP adapter,
+text reader, local classifier) are built once in the master process, then the
+workers are forked and share them copy-on-write. Each worker runs its own event
+loop through the uvicorn worker class. With more than one worker, the analysis
+cache, the job store and the upstream rate limiter move to SQLite databases
+shared by the workers (see `app.core.state.preload_shared_state`).
+
+Environment variables:
+    BIND: Address to listen on. Defaults to "0.0.0.0:8000".
+    WEB_CONCURRENCY: Number of workers. Defaults to the number of CPUs available to the process.
+    WORKER_TIMEOUT: Seconds a silent worker is given before it is restarted. Defaults to 120.
+"""
+import os
+
+
+def _cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", _cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = int(os.environ.get("WORKER_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    # Runs in the master after the application is imported and before the first fork.
+    from app.core.state import preload_shared_state
+
+    preload_shared_state(workers=server.cfg.workers)
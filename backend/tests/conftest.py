@@ -0,0 +1,4 @@
+import os
+
+# The settings require an API token; the tests never call the upstream.
+os.environ.setdefault("API_TOKEN", "test")
@@ -0,0 +1,38 @@
+from app.adapters.AnalysisCache import AnalysisCache
+
+
+def _disk_count(cache):
+    (count,) = cache._db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()
+    return count
+
+
+def test_disk_tier_is_trimmed_periodically_to_its_cap(tmp_path):
+    cache = AnalysisCache(max_entries=10, sqlite_path=str(tmp_path / "cache.db"), sqlite_max_entries=50)
+    try:
+        for i in range(54):
+            cache.set(f"chave-{i}", ("Produtivo", f"detalhes {i}"))
+        assert _disk_count(cache) == 54
+
+        cache.set("chave-54", ("Produtivo", "detalhes 54"))
+        assert _disk_count(cache) == 50
+        assert cache.evictions >= 5
+        assert cache.get("chave-54") == ("Produtivo", "detalhes 54")
+        assert cache.get("chave-0") is None
+    finally:
+        cache.close()
+
+
+def test_disk_tier_is_trimmed_when_opened_with_a_smaller_cap(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = AnalysisCache(sqlite_path=path, sqlite_max_entries=100)
+    for i in range(30):
+        cache.set(f"chave-{i}", ("Improdutivo", "detalhes"))
+    cache.close()
+
+    cache = AnalysisCache(sqlite_path=path, sqlite_max_entries=20)
+    try:
+        assert _disk_count(cache) == 20
+        assert cache.get("chave-29") == ("Improdutivo", "detalhes")
+        assert cache.get("chave-0") is None
+    finally:
+        cache.close()
@@ -0,0 +1,20 @@
+import asyncio
+import pytest
+from app.adapters.InMemoryJobStore import InMemoryJobStore
+from app.api.decorators.exception import ServiceUnavailableError
+from app.core.job_queue import JobQueue
+from app.domain.useCases.analysis_jobs import AnalysisJobsUseCase
+
+
+def test_rejected_job_is_not_stored():
+    async def scenario():
+        store = InMemoryJobStore()
+        use_case = AnalysisJobsUseCase(analysis_use_case=None, job_store=store, job_queue=JobQueue(max_size=1))
+        accepted = await use_case.submit(text="Preciso do boleto.")
+        with pytest.raises(ServiceUnavailableError):
+            await use_case.submit(text="Preciso da nota fiscal.")
+        return store, accepted
+
+    store, accepted = asyncio.run(scenario())
+    assert store.get(accepted.id) is accepted
+    assert len(store._jobs) == 1
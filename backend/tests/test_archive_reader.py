@@ -0,0 +1,42 @@
+import io
+import pickle
+import zipfile
+import pytest
+from app.adapters.ArchiveReaderAdapter import ArchiveReaderAdapter
+from app.adapters.TextReaderAdapter import TextReaderAdapter
+
+
+def _zip(members) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members:
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def test_members_are_read_on_demand():
+    archive = _zip([("a.txt", "Preciso do boleto."), ("b.txt", "Feliz natal!"), ("imagem.png", b"\x89PNG")])
+    entries = ArchiveReaderAdapter().expand("emails.zip", archive)
+    assert [name for name, _ in entries] == ["a.txt", "b.txt"]
+    reader = TextReaderAdapter(max_chars=0)
+    assert [reader.extract_text(document) for _, document in entries] == ["Preciso do boleto.", "Feliz natal!"]
+    assert reader.extract_text(entries[0][1]) == "Preciso do boleto."
+
+
+def test_too_many_members_fail_before_reading():
+    archive = _zip([(f"{i}.txt", "x") for i in range(5)])
+    with pytest.raises(ValueError, match="mais que 3 itens"):
+        ArchiveReaderAdapter(max_items=3).expand("emails.zip", archive)
+
+
+def test_total_uncompressed_size_is_capped():
+    archive = _zip([(f"{i}.txt", b"0" * 1024 * 1024) for i in range(3)])
+    with pytest.raises(ValueError, match="descompactado"):
+        ArchiveReaderAdapter(max_total_size=2 * 1024 * 1024).expand("emails.zip", archive)
+
+
+def test_member_document_is_read_into_bytes_when_pickled():
+    archive = _zip([("a.txt", "Preciso do boleto.")])
+    document = ArchiveReaderAdapter().expand("emails.zip", archive)[0][1]
+    assert pickle.loads(pickle.dumps(document)).content == b"Preciso do boleto."
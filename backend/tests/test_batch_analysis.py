@@ -0,0 +1,56 @@
+import asyncio
+import io
+import zipfile
+import pytest
+from types import SimpleNamespace
+from app.adapters.ArchiveReaderAdapter import ArchiveReaderAdapter
+from app.adapters.TextReaderAdapter import TextReaderAdapter
+from app.domain.useCases.batch_analysis import BatchAnalysisUseCase
+
+
+class _ReadingAnalysis:
+    def __init__(self):
+        self.reader = TextReaderAdapter(max_chars=0)
+        self.calls = 0
+
+    async def analyse_document(self, document):
+        self.calls += 1
+        text = document.text or self.reader.extract_text(document)
+        return SimpleNamespace(category="Produtivo", details=text)
+
+
+def _upload(filename, members, corrupt=None) -> SimpleNamespace:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for name, content in members:
+            archive.writestr(name, content)
+    data = buffer.getvalue()
+    if corrupt is not None:
+        data = data.replace(corrupt, corrupt.upper(), 1)
+    return SimpleNamespace(filename=filename, size=len(data), file=io.BytesIO(data))
+
+
+def test_corrupt_zip_member_fails_only_its_item():
+    upload = _upload("emails.zip", [("a.txt", "preciso do boleto"), ("b.txt", "feliz natal")], corrupt=b"feliz natal")
+    use_case = BatchAnalysisUseCase(_ReadingAnalysis(), ArchiveReaderAdapter())
+    response = asyncio.run(use_case.execute(files=[upload]))
+    assert (response.total, response.succeeded, response.failed) == (2, 1, 1)
+    assert response.items[0].details == "preciso do boleto"
+    assert response.items[1].error_type == "BadZipFile"
+
+
+@pytest.mark.filterwarnings("ignore:Duplicate name")
+def test_identical_zip_members_are_analysed_once():
+    upload = _upload("emails.zip", [("a.txt", "preciso do boleto"), ("a.txt", "preciso do boleto"), ("b.txt", "preciso do boleto")])
+    analysis = _ReadingAnalysis()
+    response = asyncio.run(BatchAnalysisUseCase(analysis, ArchiveReaderAdapter()).execute(files=[upload]))
+    assert response.succeeded == 3
+    assert analysis.calls == 2
+
+
+def test_identical_uploads_and_texts_are_analysed_once():
+    uploads = [SimpleNamespace(filename=f"{name}.txt", size=17, file=io.BytesIO(b"preciso do boleto")) for name in "ab"]
+    analysis = _ReadingAnalysis()
+    response = asyncio.run(BatchAnalysisUseCase(analysis, ArchiveReaderAdapter()).execute(files=uploads, texts=["oi", "oi"]))
+    assert response.succeeded == 4
+    assert analysis.calls == 2
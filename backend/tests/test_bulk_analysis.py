@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import json
+import pytest
+from app.adapters.EmailAnalyzer import EmailAnalyzer
+from app.adapters.LocalClassifier import LocalClassifier
+from app.cli.bulk_analysis import iter_records, run
+from app.core.config import settings
+from app.core.state import create_nlp_adapter
+
+IMPRODUTIVOS = ["Feliz natal a todos da equipe!", "Obrigado pelos parabéns, um abraço.", "Boas festas e feliz ano novo!", "Agradeço a mensagem de aniversário."]
+PRODUTIVOS = ["Preciso da segunda via do boleto.", "Qual o status do chamado 123?", "O sistema está fora do ar, podem verificar?", "Solicito a atualização do contrato."]
+
+
+def test_malformed_jsonl_lines_are_reported(tmp_path):
+    path = tmp_path / "emails.jsonl"
+    path.write_text('{"id": "a", "text": "Preciso do boleto."}\n{"id": "b", "text": \n[1, 2]\n\n{"title": "Oi", "body": "Feliz natal"}\n', encoding="utf-8")
+    records = list(iter_records(path, "jsonl"))
+    assert [record_id for record_id, _ in records] == ["a", "linha-2", "linha-3", "linha-5"]
+    assert records[0][1] == "Preciso do boleto."
+    assert isinstance(records[1][1], ValueError) and isinstance(records[2][1], ValueError)
+    assert records[3][1] == "Oi\n\nFeliz natal"
+
+
+def test_mbox_only_splits_from_lines_after_blank_line(tmp_path):
+    path = tmp_path / "inbox.mbox"
+    path.write_bytes(
+        b"From a@x.com Mon Jan  1 00:00:00 2024\nSubject: Boleto\n\nPreciso do boleto.\nFrom the finance team we heard nothing.\n\n"
+        b"From b@x.com Mon Jan  1 00:00:00 2024\nSubject: Natal\n\nFeliz natal!\n"
+    )
+    records = list(iter_records(path, "mbox"))
+    assert len(records) == 2
+    assert "From the finance team" in records[0][1]
+    assert records[1][1] == "Natal\n\nFeliz natal!"
+
+
+def test_bulk_run_uses_the_local_classifier(tmp_path, monkeypatch):
+    try:
+        nlp_adapter = create_nlp_adapter()
+    except LookupError as e:
+        pytest.skip(f"Dados do NLTK ausentes: {e}")
+    texts = (IMPRODUTIVOS + PRODUTIVOS) * 5
+    categories = (["Improdutivo"] * 4 + ["Produtivo"] * 4) * 5
+    classifier = LocalClassifier.train([nlp_adapter.preprocess(text) for text in texts], categories, labels=["Improdutivo", "Produtivo"], n_features=2 ** 12)
+    classifier.save(str(tmp_path / "classifier.npz"))
+    monkeypatch.setattr(settings, "LOCAL_CLASSIFIER_PATH", str(tmp_path / "classifier.npz"))
+    monkeypatch.setattr(settings, "LOCAL_CLASSIFIER_THRESHOLD", 0.5)
+
+    async def no_upstream(self, email_content):
+        raise AssertionError("chamada ao upstream")
+    monkeypatch.setattr(EmailAnalyzer, "_classify_email_content", no_upstream)
+
+    source = tmp_path / "emails.jsonl"
+    source.write_text(json.dumps({"id": "natal", "text": IMPRODUTIVOS[0]}) + "\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+    args = argparse.Namespace(input=str(source), output=str(output), format=None, workers=1, concurrency=1, limit=0)
+    assert asyncio.run(run(args)) == 0
+    record = json.loads(output.read_text(encoding="utf-8"))
+    assert record["id"] == "natal" and record["category"] == "Improdutivo"
@@ -0,0 +1,42 @@
+import codecs
+from app.core.charset import decode_text
+
+TEXT = "Olá, segue a cotação do mês."
+
+
+def test_utf8_bom_is_dropped():
+    assert decode_text(codecs.BOM_UTF8 + TEXT.encode("utf-8")) == TEXT
+
+
+def test_utf16_boms_are_dropped():
+    assert decode_text(codecs.BOM_UTF16_LE + TEXT.encode("utf-16-le")) == TEXT
+    assert decode_text(codecs.BOM_UTF16_BE + TEXT.encode("utf-16-be")) == TEXT
+
+
+def test_utf16_le_without_bom():
+    assert decode_text(TEXT.encode("utf-16-le")) == TEXT
+
+
+def test_utf16_be_without_bom():
+    assert decode_text(TEXT.encode("utf-16-be")) == TEXT
+
+
+def test_utf8_and_ascii():
+    assert decode_text(TEXT.encode("utf-8")) == TEXT
+    assert decode_text(b"Preciso do boleto.") == "Preciso do boleto."
+
+
+def test_cp1252_curly_quotes_and_euro_sign():
+    text = "“Fatura” de €120 – vencida"
+    assert decode_text(text.encode("cp1252")) == text
+
+
+def test_bytes_undefined_in_cp1252_fall_back_to_iso_8859_1():
+    content = "Cotação".encode("iso-8859-1") + b"\x81"
+    assert decode_text(content) == "Cotação\x81"
+
+
+def test_partial_content_drops_a_character_cut_at_the_end():
+    content = TEXT.encode("utf-8")[:3]
+    assert decode_text(content, partial=True) == "Ol"
+    assert decode_text(TEXT.encode("utf-16-le")[:5], partial=True) == "Ol"
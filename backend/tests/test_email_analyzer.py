@@ -0,0 +1,48 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.adapters.EmailAnalyzer import EmailAnalyzer
+from app.core.config import settings
+
+
+def _completion(content) -> dict:
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+def _analyzer(combined_content) -> tuple:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        if "response_format" in payload:
+            calls.append("combined")
+            return httpx.Response(200, json=_completion(combined_content))
+        if payload["max_tokens"] == settings.CLASSIFY_MAX_TOKENS:
+            calls.append("classify")
+            return httpx.Response(200, json=_completion("Produtivo"))
+        calls.append("suggest")
+        return httpx.Response(200, json=_completion("Vamos verificar o boleto."))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return EmailAnalyzer(http_client=client), calls
+
+
+@pytest.fixture
+def combined_mode(monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_MODE", "combined")
+
+
+@pytest.mark.parametrize("content", [None, 42, "não é json", "```json\n[1, 2]\n```", '{"categoria": "Outra", "resposta": "Ok"}'])
+def test_unusable_combined_response_falls_back_to_two_calls(combined_mode, content):
+    analyzer, calls = _analyzer(content)
+    result = asyncio.run(analyzer.analyse_email("preciso da segunda via do boleto"))
+    assert result == ("Produtivo", "Vamos verificar o boleto.")
+    assert calls == ["combined", "classify", "suggest"]
+
+
+def test_fenced_combined_response_is_parsed(combined_mode):
+    analyzer, calls = _analyzer('```json\n{"categoria": "Produtivo", "resposta": " Enviaremos o boleto. "}\n```')
+    result = asyncio.run(analyzer.analyse_email("preciso da segunda via do boleto"))
+    assert result == ("Produtivo", "Enviaremos o boleto.")
+    assert calls == ["combined"]
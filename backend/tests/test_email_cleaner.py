@@ -0,0 +1,47 @@
+import pytest
+from app.adapters.EmailCleaner import EmailCleaner
+
+
+@pytest.fixture
+def cleaner():
+    return EmailCleaner()
+
+
+@pytest.mark.parametrize("text", [
+    "Obrigado!\nGostaria de saber o status do meu chamado 123.\nAguardo retorno.",
+    "Grato\nPor favor reenviem a fatura",
+    "Bom dia\n\nBest\nPreciso do boleto atualizado\nurgente",
+    "Oi, segue o pedido:\n--\nitem 1",
+    "Olá, preciso do boleto.\nObrigado,\nMas também preciso da nota fiscal.",
+    "Atenciosamente,\nPreciso do boleto atualizado",
+])
+def test_request_after_closing_or_delimiter_is_kept(cleaner, text):
+    assert cleaner.clean(text) == (text, 0)
+
+
+def test_signature_after_closing_is_removed(cleaner):
+    text = (
+        "Olá, preciso do boleto atualizado.\n\nAtenciosamente,\n"
+        "Maria Souza\nGerente de Projetos\n(11) 98765-4321\nmaria@empresa.com"
+    )
+    cleaned, removed = cleaner.clean(text)
+    assert cleaned == "Olá, preciso do boleto atualizado.\n\nAtenciosamente,"
+    assert removed == len(text.encode("utf-8")) - len(cleaned.encode("utf-8"))
+
+
+def test_ambiguous_closing_with_comma_opens_signature(cleaner):
+    assert cleaner.clean("Olá, preciso do boleto.\n\nObrigado,\nJoão")[0] == "Olá, preciso do boleto.\n\nObrigado,"
+
+
+def test_standard_delimiter_at_the_end_removes_signature(cleaner):
+    assert cleaner.clean("Olá, preciso do boleto.\n-- \nJoão Silva\nACME Ltda.")[0] == "Olá, preciso do boleto."
+
+
+def test_standard_delimiter_before_long_text_is_kept(cleaner):
+    text = "Olá, segue o pedido.\n-- \n" + "\n".join(f"Item {i}" for i in range(10))
+    assert cleaner.clean(text) == (text, 0)
+
+
+def test_quoted_reply_is_removed(cleaner):
+    text = "Preciso do boleto.\n\nEm seg., 1 de jan. de 2024 às 10:00, Fulano <f@x.com> escreveu:\n> antigo"
+    assert cleaner.clean(text)[0] == "Preciso do boleto."
@@ -0,0 +1,31 @@
+import asyncio
+import pytest
+from app.adapters.EmailCleaner import EmailCleaner
+from app.adapters.TextReaderAdapter import TextReaderAdapter
+from app.core.executor import CpuExecutor
+from app.domain.entities.document import Document
+
+
+@pytest.fixture(scope="module")
+def process_executor():
+    executor = CpuExecutor(kind="process", max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+def _run(executor, adapter, method, *args):
+    return asyncio.run(executor.run(adapter, method, *args))
+
+
+def test_process_worker_uses_adapter_configuration(process_executor):
+    adapter = TextReaderAdapter(max_chars=12)
+    content = "Preciso do boleto atualizado do mês passado.".encode("utf-8")
+    document = Document(filename="email.txt", size=len(content), content=content)
+    assert _run(process_executor, adapter, "extract_text", document) == adapter.extract_text(document) == "Preciso do b"
+
+
+def test_process_worker_keeps_one_instance_per_configuration(process_executor):
+    text = "Olá, preciso do boleto.\n\nAtenciosamente,\nMaria Souza\nGerente de Projetos"
+    for max_lines in (1, 6):
+        adapter = EmailCleaner(signature_max_lines=max_lines)
+        assert _run(process_executor, adapter, "clean", text) == adapter.clean(text)
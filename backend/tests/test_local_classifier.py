@@ -0,0 +1,94 @@
+import asyncio
+import httpx
+import numpy as np
+import pytest
+from app.adapters.EmailAnalyzer import EmailAnalyzer
+from app.adapters.LocalClassifier import LocalClassifier, _fit_platt
+from app.core.config import settings
+
+LABELS = ["Improdutivo", "Produtivo"]
+IMPRODUTIVOS = ["feliz natal equip", "obrig parab abrac", "boa fest feliz ano nov", "agradec mensag aniversari"]
+PRODUTIVOS = ["precis segund via bolet", "qual status chamad", "sistem fora ar verific", "solicit atualiz contrat"]
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    texts = (IMPRODUTIVOS + PRODUTIVOS) * 5
+    categories = ([LABELS[0]] * 4 + [LABELS[1]] * 4) * 5
+    return LocalClassifier.train(texts, categories, labels=LABELS, n_features=2 ** 12)
+
+
+def test_trained_classifier_predicts_its_corpus(classifier):
+    for text in IMPRODUTIVOS:
+        assert classifier.predict(text)[0] == "Improdutivo"
+    for text in PRODUTIVOS:
+        assert classifier.predict(text)[0] == "Produtivo"
+    for text in IMPRODUTIVOS + PRODUTIVOS + ["texto sem nenhuma palavra conhecida"]:
+        assert 0.5 <= classifier.predict(text)[1] <= 1.0
+
+
+def test_save_and_load_round_trip(classifier, tmp_path):
+    path = str(tmp_path / "classifier.npz")
+    classifier.save(path)
+    loaded = LocalClassifier.load(path)
+    assert loaded.labels == tuple(LABELS)
+    assert loaded.version == classifier.version
+    for text in IMPRODUTIVOS + PRODUTIVOS:
+        assert loaded.predict(text) == classifier.predict(text)
+
+
+def test_version_changes_with_the_weights(classifier):
+    retrained = LocalClassifier.train(IMPRODUTIVOS + PRODUTIVOS, [LABELS[0]] * 4 + [LABELS[1]] * 4, labels=LABELS, n_features=2 ** 12, epochs=10)
+    assert retrained.version != classifier.version
+
+
+def test_platt_fit_calibrates_the_scores():
+    scores = np.array([-3.0, -2.0, -1.0, -0.5, 0.5, 1.0, 2.0, 3.0])
+    y = np.array([0, 0, 0, 1, 0, 1, 1, 1], dtype=float)
+    a, b = _fit_platt(scores, y)
+    assert a > 0
+    probabilities = 1 / (1 + np.exp(-(a * scores + b)))
+    assert np.all(np.diff(probabilities) > 0)
+    assert probabilities[0] < 0.2 and probabilities[-1] > 0.8
+
+
+def test_unknown_categories_are_rejected():
+    with pytest.raises(ValueError, match="Categorias desconhecidas"):
+        LocalClassifier.train(["a", "b"], ["Produtivo", "Spam"], labels=LABELS)
+
+
+class _FixedClassifier:
+    version = "fixo"
+
+    def __init__(self, category, probability):
+        self.prediction = (category, probability)
+
+    def predict(self, processed_text):
+        return self.prediction
+
+
+def _analyzer(local_classifier) -> tuple:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Produtivo"}}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return EmailAnalyzer(http_client=client, local_classifier=local_classifier), calls
+
+
+def test_confident_local_prediction_skips_the_classification_call(monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_MODE", "two_calls")
+    analyzer, calls = _analyzer(_FixedClassifier("Improdutivo", settings.LOCAL_CLASSIFIER_THRESHOLD))
+    category, _ = asyncio.run(analyzer.analyse_email("feliz natal equip"))
+    assert category == "Improdutivo"
+    assert calls == []
+
+
+def test_prediction_below_threshold_escalates_to_the_llm(monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_MODE", "two_calls")
+    analyzer, calls = _analyzer(_FixedClassifier("Improdutivo", settings.LOCAL_CLASSIFIER_THRESHOLD - 0.01))
+    category, details = asyncio.run(analyzer.analyse_email("feliz natal equip"))
+    assert category == "Produtivo"
+    assert len(calls) == 2
@@ -0,0 +1,45 @@
+from app.adapters.NearDuplicateIndex import NearDuplicateIndex
+
+TEMPLATE = "prezad solicit segund via bolet referent contrat numer {} venc proxim mes favor envi email cadastr"
+
+
+def test_templated_email_reuses_category():
+    index = NearDuplicateIndex()
+    index.add(TEMPLATE.format(123), "v1", ("Produtivo", "Resposta"))
+    assert index.find(TEMPLATE.format(456), "v1") == ("Produtivo", None)
+    assert index.find(TEMPLATE.format(456), "v2") is None
+
+
+def test_short_emails_are_skipped_once_per_lookup():
+    index = NearDuplicateIndex()
+    assert index.find("feliz natal", "v1") is None
+    index.add("feliz natal", "v1", ("Improdutivo", None))
+    assert index.stats()["skipped"] == 1
+    assert index.stats()["size"] == 0
+
+
+def test_indexes_sharing_a_database_see_each_other_entries(tmp_path):
+    path = str(tmp_path / "near_duplicates.db")
+    first, second = NearDuplicateIndex(sqlite_path=path), NearDuplicateIndex(sqlite_path=path)
+    try:
+        first.add(TEMPLATE.format(1), "v1", ("Produtivo", None))
+        assert second.find(TEMPLATE.format(2), "v1") == ("Produtivo", None)
+        second.add("prezad agradec mensag feliz natal tod equip cont sempr", "v1", ("Improdutivo", None))
+        assert first.find("prezad agradec mensag feliz natal tod equip cont sempr", "v1") == ("Improdutivo", None)
+        assert first.stats()["size"] == second.stats()["size"] == 2
+    finally:
+        first.close()
+        second.close()
+
+
+def test_multiple_workers_share_the_index_database():
+    from app.core import state
+    from app.core.config import settings
+    saved, fields_set = settings.model_dump(), set(settings.model_fields_set)
+    try:
+        state._share_between_workers(2)
+        assert settings.NEAR_DUPLICATE_SQLITE_PATH == "near_duplicates.db"
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+        settings.__pydantic_fields_set__ = fields_set
@@ -0,0 +1,35 @@
+import pytest
+from app.adapters.NLPAdapter import NLPAdapter
+from benchmarks.nlp_preprocess import ReferenceNLP, load_corpus, random_texts
+
+
+@pytest.fixture(scope="module")
+def reference():
+    try:
+        return ReferenceNLP()
+    except LookupError as e:
+        pytest.skip(f"Dados do NLTK ausentes: {e}")
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return load_corpus() + random_texts(2000)
+
+
+@pytest.mark.parametrize("tokenizer", ["regex", "punkt"])
+def test_preprocess_matches_original_implementation(reference, corpus, tokenizer):
+    try:
+        adapter = NLPAdapter(tokenizer=tokenizer, language_detection=False)
+        adapter.preprocess("Olá, mundo.")
+    except LookupError as e:
+        pytest.skip(f"Dados do NLTK ausentes: {e}")
+    mismatches = [text for text in corpus if adapter.preprocess(text) != reference.preprocess(text)]
+    assert mismatches == []
+
+
+def test_language_detection_keeps_portuguese_mocks_unchanged(reference):
+    adapter = NLPAdapter()
+    portuguese = [text for text in load_corpus() if adapter.detect_language(adapter._normalize(text)) == "pt"]
+    assert portuguese
+    for text in portuguese:
+        assert adapter.preprocess(text) == reference.preprocess(text)
@@ -0,0 +1,36 @@
+import asyncio
+import pytest
+from app.adapters.NLPAdapter import NLPAdapter
+from app.core.executor import CpuExecutor
+
+ENGLISH = "Hello, I would like to know the status of my ticket. It has been open for two weeks and nobody has answered me yet."
+PORTUGUESE = "Olá, preciso de uma atualização sobre o chamado em aberto. Obrigado pela atenção!"
+
+
+def _adapter(**kwargs) -> NLPAdapter:
+    try:
+        return NLPAdapter(**kwargs)
+    except LookupError as e:
+        pytest.skip(f"Dados do NLTK ausentes: {e}")
+
+
+def test_english_text_skips_portuguese_pipeline():
+    adapter = _adapter(foreign_text="raw")
+    assert adapter.detect_language(adapter._normalize(ENGLISH)) == "en"
+    assert adapter.detect_language(adapter._normalize(PORTUGUESE)) == "pt"
+    assert adapter.preprocess(ENGLISH).startswith("hello i would like to know the status")
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"foreign_text": "raw"},
+    {"foreign_text": "stem"},
+    {"language_detection": False},
+])
+def test_process_pool_matches_inline(kwargs):
+    adapter = _adapter(**kwargs)
+    executor = CpuExecutor(kind="process", max_workers=1)
+    try:
+        for text in (ENGLISH, PORTUGUESE):
+            assert asyncio.run(executor.run(adapter, "preprocess", text)) == adapter.preprocess(text)
+    finally:
+        executor.shutdown()
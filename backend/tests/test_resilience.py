@@ -0,0 +1,49 @@
+import asyncio
+import httpx
+import pytest
+from app.core.resilience import CircuitBreaker, UpstreamGuard, UpstreamThrottledError
+
+
+def _responder(*status_codes):
+    codes = iter(status_codes)
+
+    async def request():
+        return httpx.Response(next(codes))
+    return request
+
+
+def _send(guard, request):
+    return asyncio.run(guard.send(request))
+
+
+def test_retried_attempts_count_as_one_failure():
+    guard = UpstreamGuard(max_retries=3, base_delay=0, failure_threshold=2)
+    with pytest.raises(UpstreamThrottledError):
+        _send(guard, _responder(500, 502, 503, 504))
+    assert guard.breaker.failures == 1
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+    assert guard.requests == 4
+
+
+def test_call_that_recovers_after_retries_is_a_success():
+    guard = UpstreamGuard(max_retries=3, base_delay=0, failure_threshold=1)
+    assert _send(guard, _responder(503, 503, 200)).status_code == 200
+    assert guard.breaker.failures == 0
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_rate_limited_calls_do_not_open_the_circuit():
+    guard = UpstreamGuard(max_retries=1, base_delay=0, failure_threshold=1)
+    for _ in range(3):
+        with pytest.raises(UpstreamThrottledError):
+            _send(guard, _responder(429, 429))
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+    assert guard.failures == 0
+
+
+def test_failed_calls_open_the_circuit():
+    guard = UpstreamGuard(max_retries=1, base_delay=0, failure_threshold=2)
+    for _ in range(2):
+        with pytest.raises(UpstreamThrottledError):
+            _send(guard, _responder(500, 500))
+    assert guard.breaker.state == CircuitBreaker.OPEN
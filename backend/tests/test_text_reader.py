@@ -0,0 +1,36 @@
+import io
+from app.adapters.TextReaderAdapter import TextReaderAdapter
+from app.domain.entities.document import Document
+
+
+class _CountingFile(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _txt(content) -> Document:
+    return Document(filename="email.txt", size=len(content.getvalue() if isinstance(content, io.BytesIO) else content), content=content)
+
+
+def test_txt_reads_only_the_bytes_of_the_character_budget():
+    content = _CountingFile(("Preciso do boleto. " * 100_000).encode("utf-8"))
+    text = TextReaderAdapter(max_chars=100).extract_text(_txt(content))
+    assert text == ("Preciso do boleto. " * 10)[:100]
+    assert content.bytes_read == 404
+
+
+def test_txt_cut_inside_a_character_keeps_utf8():
+    content = ("ã" * 300).encode("utf-8")
+    assert TextReaderAdapter(max_chars=100).extract_text(_txt(content)) == "ã" * 100
+    assert TextReaderAdapter(max_chars=101).extract_text(_txt(content)) == "ã" * 101
+
+
+def test_txt_without_budget_is_read_in_full():
+    content = ("Olá " * 1000).encode("cp1252")
+    assert TextReaderAdapter(max_chars=0).extract_text(_txt(content)) == ("Olá " * 1000).strip()
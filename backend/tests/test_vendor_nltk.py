@@ -0,0 +1,25 @@
+import nltk
+import pytest
+from app.api.decorators.exception import ServiceError
+from app.cli.vendor_nltk import main, vendor
+from app.core.nltk_loader import NLTK_RESOURCE_FILES
+
+
+def test_vendor_copies_the_runtime_files_and_restores_the_data_path(tmp_path):
+    data_path = list(nltk.data.path)
+    try:
+        total = vendor(str(tmp_path / "nltk_data"), tokenizer="regex", offline=True)
+    except ServiceError as e:
+        pytest.skip(f"Dados do NLTK ausentes: {e}")
+    assert total > 0
+    for name in NLTK_RESOURCE_FILES["stopwords"]:
+        assert (tmp_path / "nltk_data" / "corpora" / "stopwords" / name).is_file()
+    assert nltk.data.path == data_path
+
+
+def test_downloads_verify_certificates_unless_opted_out(monkeypatch):
+    calls = []
+    monkeypatch.setattr("app.cli.vendor_nltk.vendor", lambda output, **kwargs: calls.append(kwargs["verify_ssl"]) or 0)
+    main(["--output", "x"])
+    main(["--output", "x", "--no-verify-ssl"])
+    assert calls == [True, False]
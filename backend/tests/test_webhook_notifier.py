@@ -0,0 +1,31 @@
+import asyncio
+import pytest
+from app.adapters.WebhookNotifier import WebhookNotifier
+
+
+def _check(url: str, allowed_hosts=None) -> None:
+    asyncio.run(WebhookNotifier(http_client=None, allowed_hosts=allowed_hosts).check_url(url))
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1:8000/hook",
+    "http://localhost/hook",
+    "http://10.0.0.5/hook",
+    "http://169.254.169.254/latest/meta-data",
+    "http://[::1]/hook",
+    "ftp://example.com/hook",
+])
+def test_internal_or_invalid_urls_are_refused(url):
+    with pytest.raises(ValueError):
+        _check(url)
+
+
+def test_public_address_is_accepted():
+    _check("https://8.8.8.8/hook")
+
+
+def test_allowlist_restricts_hosts():
+    _check("http://hooks.internal/ok", allowed_hosts=["hooks.internal"])
+    _check("https://a.example.com/ok", allowed_hosts=[".example.com"])
+    with pytest.raises(ValueError):
+        _check("https://8.8.8.8/hook", allowed_hosts=["hooks.internal"])